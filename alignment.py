@@ -0,0 +1,78 @@
+# alignment.py
+"""Put series of different frequencies on one PeriodIndex.
+
+Monthly IPPI/RMPI and quarterly BCPI are aligned here, in one groupby over
+all series, instead of by ad-hoc merges on each page:
+
+    align({"IPPI": ippi, "RMPI": rmpi, "Residential": bcpi}, freq="Q")
+
+gives one quarterly column per series, monthly ones averaged over complete
+quarters. Cross-index work (RMPI against BCPI, say) then starts from the
+same frame everywhere.
+"""
+import pandas as pd
+
+from scraper import instrumentation as instr
+
+AGGREGATIONS = ("mean", "last", "first", "sum")
+
+
+def align(series: dict[str, pd.Series], freq: str = "Q", agg: str = "mean",
+          interpolate: bool = False, partial: bool = False) -> pd.DataFrame:
+    """Wide frame on a ``freq`` PeriodIndex with one column per entry of ``series``.
+
+    Each series needs a DatetimeIndex or PeriodIndex. Observations are
+    bucketed into ``freq`` periods and combined with ``agg``. A bucket
+    with fewer observations than the series usually has per bucket (a
+    quarter with two of its three months, say) is dropped unless
+    ``partial``. Periods a series has no value for are NaN, or filled by
+    linear interpolation between its observations when ``interpolate``
+    (which also turns a quarterly series into a monthly one).
+
+    A coarser period lands on its first finer period, as StatCan dates a
+    quarter by its first day: aligned monthly, 2020Q1 is 2020-01, whether
+    the series has a PeriodIndex or a DatetimeIndex of REF_DATEs.
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"agg must be one of {AGGREGATIONS}")
+    columns = list(series)
+    if not columns:
+        return pd.DataFrame(index=pd.PeriodIndex([], freq=freq))
+
+    with instr.span("merge", freq=freq):
+        frames = []
+        for label, values in series.items():
+            index = values.index
+            if isinstance(index, pd.PeriodIndex):
+                periods = index.asfreq(freq, how="start")
+            else:
+                periods = pd.DatetimeIndex(index).to_period(freq)
+            frames.append(pd.DataFrame({
+                "series": label,
+                "period": periods,
+                "value": values.to_numpy(dtype="float64"),
+            }))
+        long = pd.concat(frames, ignore_index=True).dropna(subset=["period", "value"])
+        if long.empty:
+            return pd.DataFrame(index=pd.PeriodIndex([], freq=freq), columns=columns, dtype="float64")
+
+        grouped = long.groupby(["series", "period"], sort=False)["value"].agg([agg, "count"])
+        if not partial:
+            expected = grouped["count"].groupby(level="series").transform("median")
+            grouped = grouped[grouped["count"] >= expected]
+        wide = grouped[agg].unstack("series").reindex(columns=columns)
+
+        full = pd.period_range(wide.index.min(), wide.index.max(), freq=freq)
+        wide = wide.reindex(full).astype("float64")
+        if interpolate:
+            wide = wide.interpolate(limit_area="inside")
+    wide.index.name = "period"
+    wide.columns.name = None
+    return wide
+
+
+def to_timestamps(wide: pd.DataFrame) -> pd.DataFrame:
+    """``wide`` with its PeriodIndex turned into period start dates (for charts and date filters)."""
+    if isinstance(wide.index, pd.PeriodIndex):
+        return wide.set_axis(wide.index.to_timestamp(), axis=0)
+    return wide
@@ -0,0 +1,251 @@
+# analytics.py
+"""Vectorized analytics over wide frames (one column per series, date index).
+
+Everything here is pure NumPy/pandas with no Streamlit or I/O, so results
+can be computed once per data version and cached by ``data_layer``.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from scraper import instrumentation as instr
+
+CORRELATION_WINDOWS = range(3, 13)
+# Tariff milestones marked on the trends charts.
+TARIFF_PHASES = {
+    "Tariff Start": pd.Timestamp("2025-01-01"),
+    "Lobbying": pd.Timestamp("2025-03-01"),
+}
+PRE_TARIFF = "Pre-tariff"
+
+
+def rolling_correlations(x, y, windows=CORRELATION_WINDOWS) -> np.ndarray:
+    """Rolling Pearson correlation of ``x`` and ``y`` for every window at once.
+
+    Returns a ``(len(windows), len(x))`` array; row ``i`` matches
+    ``pd.Series(x).rolling(windows[i]).corr(pd.Series(y))``. Window sums come
+    from prefix sums, so the cost is one pass over the data whatever the
+    number of windows. Windows containing a NaN give NaN.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    windows = np.asarray(list(windows))
+    n = len(x)
+    out = np.full((len(windows), n), np.nan)
+    if n == 0:
+        return out
+
+    missing = np.isnan(x) | np.isnan(y)
+    # Centre first: the prefix sums then stay small and the
+    # w*Sxx - Sx^2 differences do not lose precision.
+    present = ~missing
+    xc = np.where(missing, 0.0, x - (x[present].mean() if present.any() else 0.0))
+    yc = np.where(missing, 0.0, y - (y[present].mean() if present.any() else 0.0))
+
+    def prefix(a):
+        return np.concatenate(([0.0], np.cumsum(a)))
+
+    sx, sy, sxx, syy, sxy = (prefix(a) for a in (xc, yc, xc * xc, yc * yc, xc * yc))
+    sn = prefix(missing.astype("float64"))
+
+    end = np.arange(1, n + 1)
+    start = end[None, :] - windows[:, None]              # (windows, n)
+    valid = start >= 0
+    start = np.clip(start, 0, None)
+
+    def window_sum(s):
+        return s[end][None, :] - s[start]
+
+    w = windows[:, None].astype("float64")
+    wx, wy = window_sum(sx), window_sum(sy)
+    cov = w * window_sum(sxy) - wx * wy
+    var_x = w * window_sum(sxx) - wx * wx
+    var_y = w * window_sum(syy) - wy * wy
+
+    # Constant windows give a zero (or rounding-noise) variance; pandas reports NaN there.
+    eps = 1e-12 * w * w * max(float(np.abs(xc).max() ** 2), float(np.abs(yc).max() ** 2), 1.0)
+    ok = valid & (window_sum(sn) == 0) & (var_x > eps) & (var_y > eps)
+    out[ok] = np.clip(cov[ok] / np.sqrt(var_x[ok] * var_y[ok]), -1.0, 1.0)
+    return out
+
+
+def correlation_table(wide: pd.DataFrame, windows=CORRELATION_WINDOWS) -> dict[tuple[str, str], pd.DataFrame]:
+    """Rolling correlations for every pair of columns, keyed by (a, b) and (b, a).
+
+    Each value is a frame indexed like ``wide`` with one column per window.
+    """
+    windows = list(windows)
+    table = {}
+    for a, b in combinations(wide.columns, 2):
+        frame = pd.DataFrame(rolling_correlations(wide[a], wide[b], windows).T,
+                             index=wide.index, columns=windows)
+        table[(a, b)] = table[(b, a)] = frame
+    return table
+
+
+def cross_correlations(wide: pd.DataFrame, max_lag: int = 12) -> pd.DataFrame:
+    """Pearson correlation of every ordered column pair at every lag in [-max_lag, max_lag].
+
+    Row ``(a, b)``, column ``k`` is the correlation of ``a`` at ``t`` with
+    ``b`` at ``t + k`` over the periods both exist, so a peak at a positive
+    ``k`` means ``b`` follows ``a`` by ``k`` periods, and an overlap where
+    either series is constant (or shorter than 3 periods) gives NaN. NaNs
+    stay in place rather than being dropped, so a gap never shifts the
+    lags after it. The lagged sums over each overlap (counts, sums, sums of
+    squares and cross-products) come from FFTs of each column and its
+    presence mask, so the cost grows with n log n per pair rather than n
+    per lag.
+    """
+    values = wide.to_numpy(dtype="float64")
+    columns = list(wide.columns)
+    n, k = values.shape
+    max_lag = max(0, min(max_lag, n - 3))
+    lags = np.arange(-max_lag, max_lag + 1)
+    pairs = [(a, b) for a in columns for b in columns if a != b]
+    index = pd.MultiIndex.from_tuples(pairs, names=["series_a", "series_b"])
+    if n < 3 or k < 2:
+        return pd.DataFrame(np.nan, index=index, columns=pd.Index(lags, name="lag"))
+
+    # Centre first so the sums stay small; missing values contribute nothing.
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    means = np.where(present, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    x = np.where(present, values - means, 0.0)
+    mask = present.astype("float64")
+
+    nfft = 1 << int(np.ceil(np.log2(2 * n)))
+    xf, mf, sqf = (np.fft.rfft(a, nfft, axis=0) for a in (x, mask, x * x))
+
+    def lagged(fa, fb):
+        # [j, a, b] = sum_t fa_a(t) fb_b(t + j), negative j wrapped to the end.
+        return np.fft.irfft(fa.conj()[:, :, None] * fb[:, None, :], nfft, axis=0)[lags % nfft]
+
+    m = np.rint(lagged(mf, mf))                                  # (lags, columns, columns)
+    sa, sb = lagged(xf, mf), lagged(mf, xf)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var_a = lagged(sqf, mf) - sa * sa / m
+        var_b = lagged(mf, sqf) - sb * sb / m
+        cov = lagged(xf, xf) - sa * sb / m
+
+    # As in rolling_correlations: a constant overlap has a zero (or rounding-noise)
+    # variance, and its correlation is NaN rather than noise clipped to +-1.
+    scale = np.abs(x).max(axis=0) ** 2
+    eps = 1e-12 * m * np.maximum(np.maximum.outer(scale, scale), 1.0)[None, :, :]
+    ok = (m >= 3) & (var_a > eps) & (var_b > eps)
+    r = np.full(cov.shape, np.nan)
+    r[ok] = np.clip(cov[ok] / np.sqrt(var_a[ok] * var_b[ok]), -1.0, 1.0)
+
+    a_idx, b_idx = np.nonzero(~np.eye(k, dtype=bool))
+    return pd.DataFrame(r[:, a_idx, b_idx].T, index=index, columns=pd.Index(lags, name="lag"))
+
+
+def lead_lag_summary(xcorr: pd.DataFrame) -> pd.DataFrame:
+    """Per pair, the lag with the strongest correlation (by absolute value) and its value."""
+    values = xcorr.to_numpy()
+    filled = np.where(np.isnan(values), -np.inf, np.abs(values))
+    best = filled.argmax(axis=1)
+    rows = np.arange(len(values))
+    return pd.DataFrame({
+        "best_lag": xcorr.columns.to_numpy()[best],
+        "correlation": values[rows, best],
+        "same_period": xcorr[0].to_numpy() if 0 in xcorr.columns else np.nan,
+    }, index=xcorr.index)
+
+
+def rolling_lag(x: pd.Series, y: pd.Series, window: int, max_lag: int = 12) -> pd.DataFrame:
+    """Best lag of ``y`` behind ``x`` over each trailing window of ``window`` periods.
+
+    For every lag, the rolling correlation of ``x(t)`` with ``y(t + lag)``
+    comes from ``rolling_correlations``. Row ``t`` keeps the lag with the
+    largest absolute correlation over the window of ``x`` ending at ``t``.
+    """
+    xv = x.to_numpy(dtype="float64")
+    yv = y.to_numpy(dtype="float64")
+    lags = np.arange(-max_lag, max_lag + 1)
+    corr = np.full((len(lags), len(xv)), np.nan)
+    for i, lag in enumerate(lags):
+        shifted = np.full_like(yv, np.nan)
+        if lag >= 0:
+            shifted[:len(yv) - lag] = yv[lag:]
+        else:
+            shifted[-lag:] = yv[:lag]
+        corr[i] = rolling_correlations(xv, shifted, [window])[0]
+    filled = np.where(np.isnan(corr), -np.inf, np.abs(corr))
+    best = filled.argmax(axis=0)
+    cols = np.arange(len(xv))
+    found = np.isfinite(filled[best, cols])
+    return pd.DataFrame({
+        "best_lag": np.where(found, lags[best], np.nan),
+        "correlation": np.where(found, corr[best, cols], np.nan),
+    }, index=x.index)
+
+
+def period_changes(wide: pd.DataFrame, periods_per_year: int = 12) -> dict[str, pd.DataFrame]:
+    """Percent change on the previous period and on the same period a year earlier."""
+    values = wide.to_numpy(dtype="float64")
+
+    def pct(lag):
+        out = np.full_like(values, np.nan)
+        if lag < len(values):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[lag:] = (values[lag:] / values[:-lag] - 1.0) * 100.0
+        return pd.DataFrame(out, index=wide.index, columns=wide.columns)
+
+    return {"period": pct(1), "yoy": pct(periods_per_year)}
+
+
+def phase_labels(index: pd.DatetimeIndex, phases: dict[str, pd.Timestamp] = TARIFF_PHASES) -> np.ndarray:
+    """Name of the tariff phase each date falls in (``PRE_TARIFF`` before the first)."""
+    names = [PRE_TARIFF] + list(phases)
+    bounds = np.array(list(phases.values()), dtype="datetime64[ns]")
+    return np.asarray(names, dtype=object)[np.searchsorted(bounds, index.to_numpy(), side="right")]
+
+
+def tariff_phase_stats(wide: pd.DataFrame, phases: dict[str, pd.Timestamp] = TARIFF_PHASES,
+                       baseline_periods: int | None = 12) -> pd.DataFrame:
+    """Per-series level and change statistics for each tariff phase.
+
+    The pre-tariff phase is limited to the last ``baseline_periods``
+    observations before the first milestone (all of them if ``None``).
+    Columns: observations, mean, std, first, last, change_pct (last vs
+    first) and vs_baseline_pct (phase mean vs the pre-tariff mean).
+    """
+    labels = phase_labels(wide.index, phases)
+    if baseline_periods is not None:
+        pre = np.flatnonzero(labels == PRE_TARIFF)
+        labels[pre[:-baseline_periods] if len(pre) > baseline_periods else []] = None
+    keep = pd.notna(labels)
+    order = [PRE_TARIFF] + list(phases)
+    grouped = wide[keep].groupby(pd.Categorical(labels[keep], categories=order), observed=False)
+
+    stats = pd.concat({
+        "observations": grouped.count(),
+        "mean": grouped.mean(),
+        "std": grouped.std(),
+        "first": grouped.first(),
+        "last": grouped.last(),
+    }, axis=1)
+    stats = stats.stack(level=1, future_stack=True).swaplevel().sort_index()
+    stats.index.names = ["series", "phase"]
+    stats["change_pct"] = (stats["last"] / stats["first"] - 1.0) * 100.0
+    baseline = stats.xs(PRE_TARIFF, level="phase")["mean"]
+    stats["vs_baseline_pct"] = (stats["mean"] / baseline.reindex(stats.index.get_level_values("series")).to_numpy()
+                                - 1.0) * 100.0
+    return stats
+
+
+def analyze(wide: pd.DataFrame, periods_per_year: int = 12, windows=CORRELATION_WINDOWS) -> dict:
+    """Every analytic for ``wide`` in one go: correlations, changes and tariff phases.
+
+    The pre-tariff baseline of the phase statistics is the last year, i.e.
+    ``periods_per_year`` observations.
+    """
+    with instr.span("analyze"):
+        wide = wide.sort_index()
+        return {
+            "wide": wide,
+            "correlations": correlation_table(wide, windows),
+            "changes": period_changes(wide, periods_per_year),
+            "phases": tariff_phase_stats(wide, baseline_periods=periods_per_year),
+        }
@@ -1,12 +1,10 @@
-import pandas as pd
 import streamlit as st
+from log_config import configure_logging
 # import streamlit_authenticator as stauth
 # import yaml
 # from yaml.loader import SafeLoader
 
-# Version Check
-print(pd.__version__)
-assert hasattr(pd, 'DataFrame'), "pandas.DataFrame is missing!"
+configure_logging()
 
 # Page Setup
 st.set_page_config(page_title='Tariff Impact on Construction', layout='wide')
@@ -86,21 +84,22 @@ st.markdown("""
     - The tariff implementation (January 2025)
     - The subsequent lobbying period (March 2025)
 
-    The retrieved data is stored in CSV files, available for download on the **Data** page.
+    The retrieved data is stored locally and available for download as CSV files on the **Data** page.
 
     ### Navigation
     Use the sidebar to switch between pages:
     - **Data**
     - **Trends (IPPI vs RMPI)**
     - **Trends (BCPI)**
+    - **Lead/Lag**: how many months (or quarters) a move in one index takes to show up in another
 
     ### How to Use the App
     1. **Select Date Range**: Choose a date range between January 2020 and the current date for start and end dates.(the most recent data from Statcan is retrieved)
-    2. **Fetch Data**: Click "Fetch IPPI" and "Fetch RMPI" to retrieve the data.
+    2. **Data**: IPPI and RMPI are read from the local series store, which the ingestion job (`python -m scraper.ingest`) keeps up to date.
     3. **Generate Graph**: Click "Generate Comparison Graph" to visualize the data.
     4. **Select Date Range**: Choose a date range between January 2020 and the current date for start and end dates.(the most recent data from Statcan is retrieved)
-    5. **Fetch Data**: Click "Fetch residnetial BCPI" and "Fetch non-residnetial BCPI" to retrieve the data.
-    6. **Generate Graph**: Click "Generate residential BCPI Graph" or "Generate non-residential BCPI Graph"  to visualize the data.
+    5. **Data**: Residential and non-residential BCPI are read from the same local store.
+    6. **Generate Graph**: Click "Generate Residential BCPI Graph" or "Generate Non-Residential BCPI Graph" (one button per BCPI series in `series.yaml`) to visualize the data.
     7. **View and Download retrieved Data**: Use the Data tab to view the retrieved data and download as csv files.
     """)
 
@@ -0,0 +1,127 @@
+"""Synthetic StatCan table ZIPs with the real column layout.
+
+Each fixture holds the requested target vectors plus ``n_filler`` filler
+vectors, so the same table can be enlarged to any size while the target
+series stay identical. Rows are written in blocks, so building a large
+fixture does not itself need much memory. The target vectors are also
+written as WDS JSON responses under ``<out_dir>/wds/`` for the mock server.
+"""
+import json
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scraper.table_cache import table_code
+
+COLUMNS = ["REF_DATE", "GEO", "DGUID", "Product", "UOM", "UOM_ID", "SCALAR_FACTOR",
+           "SCALAR_ID", "VECTOR", "COORDINATE", "VALUE", "STATUS", "SYMBOL", "TERMINATED", "DECIMALS"]
+
+# The tables the dashboard reads, with their target vectors and frequency.
+TABLES = {
+    "1810026501": (["v1230995999"], "MS"),
+    "1810026801": (["v1230998193"], "MS"),
+    "1810028901": (["v1617908010", "v1617908154"], "QS"),
+}
+
+
+def make_table_zip(out_dir: Path | str, pid: str, vectors: list[str], n_filler: int = 1000,
+                   periods: int = 120, freq: str = "MS", start: str = "2015-01-01",
+                   seed: int = 0) -> Path:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    code = table_code(pid)
+    path = out_dir / f"{code}-eng.zip"
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=periods, freq=freq).strftime("%Y-%m")
+    all_vectors = list(vectors) + [f"v{900000000 + i}" for i in range(n_filler)]
+    block = max(1, 50_000 // periods)
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        with z.open(f"{code}.csv", "w") as f:
+            f.write((",".join(f'"{c}"' for c in COLUMNS) + "\n").encode())
+            for i in range(0, len(all_vectors), block):
+                chunk = all_vectors[i:i + block]
+                n = len(chunk) * periods
+                walk = 100 + np.cumsum(rng.normal(0, 1, size=(len(chunk), periods)), axis=1)
+                df = pd.DataFrame({
+                    "REF_DATE": np.tile(dates, len(chunk)),
+                    "GEO": "Canada",
+                    "DGUID": "2016A000011124",
+                    "Product": np.repeat([f"Product {i + j}" for j in range(len(chunk))], periods),
+                    "UOM": "Index, 202001=100",
+                    "UOM_ID": "347",
+                    "SCALAR_FACTOR": "units",
+                    "SCALAR_ID": "0",
+                    "VECTOR": np.repeat(chunk, periods),
+                    "COORDINATE": np.repeat([f"1.{i + j + 1}" for j in range(len(chunk))], periods),
+                    "VALUE": np.round(walk.ravel(), 1),
+                    "STATUS": "",
+                    "SYMBOL": "",
+                    "TERMINATED": "",
+                    "DECIMALS": np.full(n, 1),
+                })
+                f.write(df.to_csv(index=False, header=False).encode())
+        z.writestr(f"{code}_MetaData.csv", '"Cube Title","Product Id"\n"Synthetic fixture","' + code + '"\n')
+    return path
+
+
+def make_wds_fixtures(zip_path: Path | str, vectors: list[str], out_dir: Path | str) -> list[Path]:
+    """Write WDS-shaped ``<out_dir>/<vectorId>.json`` responses for ``vectors`` of a fixture table.
+
+    Each point is stamped as released at 08:30 on the 20th of the month after
+    its reference period, roughly when StatCan publishes monthly indexes.
+    """
+    from scraper.streaming import filter_table_zip
+
+    zip_path, out_dir = Path(zip_path), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    df = filter_table_zip(zip_path, vectors)
+    paths = []
+    for vector, group in df.groupby("VECTOR"):
+        vid = int(vector.lstrip("v"))
+        points = [{
+            "vectorId": vid,
+            "refPer": ref.strftime("%Y-%m-%d"),
+            "refPer2": "",
+            "value": value,
+            "decimals": 1,
+            "statusCode": 0,
+            "symbolCode": 0,
+            "releaseTime": (ref + pd.DateOffset(months=1, days=19)).strftime("%Y-%m-%dT08:30"),
+        } for ref, value in zip(group["REF_DATE"], group["VALUE"])]
+        item = {"status": "SUCCESS", "object": {
+            "responseStatusCode": 0,
+            "productId": int(zip_path.name.split("-")[0]),
+            "vectorId": vid,
+            "vectorDataPoint": points,
+        }}
+        path = out_dir / f"{vid}.json"
+        path.write_text(json.dumps(item))
+        paths.append(path)
+    return paths
+
+
+def make_dashboard_fixtures(out_dir: Path | str, n_filler: int = 1000, periods: int = 120) -> list[Path]:
+    paths = []
+    for pid, (vectors, freq) in TABLES.items():
+        n_periods = periods if freq == "MS" else max(1, periods // 3)
+        zip_path = make_table_zip(out_dir, pid, vectors, n_filler=n_filler, periods=n_periods,
+                                  freq=freq, seed=int(pid))
+        paths.append(zip_path)
+        paths.extend(make_wds_fixtures(zip_path, vectors, Path(out_dir) / "wds"))
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write synthetic StatCan table ZIPs and WDS responses.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--filler", type=int, default=1000, help="filler vectors per table")
+    parser.add_argument("--periods", type=int, default=120, help="monthly periods per vector")
+    args = parser.parse_args()
+    for p in make_dashboard_fixtures(args.out_dir, args.filler, args.periods):
+        print(f"{p} ({p.stat().st_size} bytes)")
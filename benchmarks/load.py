@@ -0,0 +1,363 @@
+"""Concurrent-session load test of the trends pages against a local mock StatCan.
+
+Serves recorded or synthetic table ZIPs from ``MockStatCanServer`` with
+configurable latency and failure injection, fills the series store with
+one ingestion run, then drives ``--sessions`` simulated analysts through
+the load → merge → chart flow of ``pages/IPPI_RMPI_trends.py`` and
+``pages/bcpi_trends.py``. Sessions run as threads of one process, as
+Streamlit runs them, and share the process-wide ``data_layer`` cache.
+Each session reruns its page ``--reruns`` times with a random date range
+picked from ``--ranges`` choices.
+
+    python -m benchmarks.load                                  # 20 sessions, synthetic tables
+    python -m benchmarks.load --sessions 100 --latency 0.2 --failure-rate 0.05
+    python -m benchmarks.load --direct                         # every session fetches through the trackers
+    python -m benchmarks.load --fixtures path/to/zips --save-baseline
+    python -m benchmarks.load --check                          # exit 1 on failed runs or a regression
+
+Reports per-page latency percentiles, throughput, peak RSS and the
+upstream requests made by ingestion and by the sessions. ``--direct``
+skips the store and has every session download, parse, merge and chart
+its series itself, each into its own table cache, the way the pages
+worked before ``data_layer``. Like
+``benchmarks/suite.py``, each run uses a fresh interpreter and fresh cache
+and store directories, and baselines are machine specific.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import make_dashboard_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "load_baseline.json"
+PAGES = ("ippi_rmpi", "bcpi")
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _dates(ranges: int, seed: int) -> list[tuple]:
+    """``ranges`` start/end pairs like the ones analysts pick on the trends pages."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    starts = pd.date_range("2020-01-01", "2023-12-01", freq="MS")
+    return [(starts[i], pd.Timestamp.today().normalize()) for i in rng.choice(len(starts), ranges, replace=False)]
+
+
+def store_flows() -> dict:
+    """The page flows over ``data_layer``, step for step as the pages run them."""
+    from data_layer import load_aligned, load_analytics, load_chart, load_series
+    from scraper.registry import load_registry, series_in_group
+
+    def ippi_rmpi(start, end):
+        series = series_in_group("ippi_rmpi")
+        labels = [s.label for s in series]
+        results = load_series(series, start, end)
+        if any(results[s.key].empty for s in series):
+            raise RuntimeError("missing IPPI/RMPI data")
+        analytics = load_analytics(series, start, end)
+        load_chart(series, f"{' vs '.join(labels)} Over Time", start, end, tariff_marks=True)
+        analytics["correlations"][(labels[0], labels[1])][6].dropna()
+        analytics["changes"]["yoy"].dropna(how="all")
+
+    def bcpi(start, end):
+        series = series_in_group("bcpi")
+        results = load_series(series, start, end)
+        if any(results[s.key].empty for s in series):
+            raise RuntimeError("missing BCPI data")
+        load_aligned(series, "Q", start, end).dropna()
+        for s in series:
+            load_chart([s], s.description or f"BCPI: {s.label}", start, end)
+        quarterly = load_aligned(list(load_registry()), "Q", start, end).dropna()
+        quarterly.pct_change().corr()
+
+    return {"ippi_rmpi": ippi_rmpi, "bcpi": bcpi}
+
+
+def direct_flows() -> dict:
+    """The page flows with every session fetching, merging and charting its own series.
+
+    Each session (one thread) downloads and converts the tables into a table
+    cache and store of its own, as every session did before the shared
+    store, so upstream traffic and parse cost grow with the sessions.
+    """
+    import threading
+
+    from alignment import align, to_timestamps
+    from analytics import analyze
+    from charts import line_chart_options
+    from scraper.backends import TableBackend
+    from scraper.batch import fetch_trackers
+    from scraper.dashboard import series_values
+    from scraper.registry import series_in_group
+    from scraper.table_cache import TableCache
+    from scraper.table_store import TableStore
+
+    sessions_dir = Path(tempfile.mkdtemp(prefix="sessions-", dir=os.environ.get("LOAD_WORK_DIR")))
+    local = threading.local()
+
+    def backend():
+        if not hasattr(local, "backend"):
+            root = Path(tempfile.mkdtemp(dir=sessions_dir))
+            local.backend = TableBackend(TableStore(root / "store", cache=TableCache(root / "cache")))
+        return local.backend
+
+    def fetch(series, start, end):
+        trackers = {s.key: s.tracker(backend()) for s in series}
+        results = fetch_trackers(trackers, start=start, end=end)
+        if any(results[s.key].empty for s in series):
+            raise RuntimeError(f"missing data for {', '.join(s.key for s in series)}")
+        return series_values(results, series)
+
+    def ippi_rmpi(start, end):
+        series = series_in_group("ippi_rmpi")
+        wide = align(fetch(series, start, end), "M").dropna()
+        analytics = analyze(to_timestamps(wide))
+        line_chart_options(wide, "IPPI vs RMPI Over Time", {s.label: s.color for s in series}, True)
+        analytics["correlations"][(series[0].label, series[1].label)][6].dropna()
+
+    def bcpi(start, end):
+        series = series_in_group("bcpi")
+        merged = align(fetch(series, start, end), "Q").dropna()
+        for s in series:
+            line_chart_options(merged[[s.label]], s.description or f"BCPI: {s.label}")
+
+    return {"ippi_rmpi": ippi_rmpi, "bcpi": bcpi}
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_sessions(sessions: int, reruns: int, ranges: int, direct: bool, seed: int) -> dict:
+    """Drive the simulated sessions; call in a fresh interpreter set up by ``run_load``."""
+    import logging
+    import random
+    import threading
+    import time
+
+    import numpy as np
+    import streamlit.config
+    import streamlit.logger
+
+    # st.cache_* warn on every call outside a running server. Streamlit resets
+    # its loggers to ``logger.level`` when it first parses its config, so set
+    # the option (which parses it) before the level.
+    streamlit.config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+    logging.getLogger().setLevel(logging.ERROR)
+
+    flows = direct_flows() if direct else store_flows()
+    dates = _dates(ranges, seed)
+    rss_before = _peak_rss_mb()
+    timings = {page: [] for page in PAGES}
+    errors = {page: 0 for page in PAGES}
+    lock = threading.Lock()
+    gate = threading.Barrier(sessions)
+
+    def session(i: int):
+        rng = random.Random(seed + i)
+        page = PAGES[i % len(PAGES)]
+        gate.wait()  # every analyst opens the app at once
+        for _ in range(reruns):
+            start, end = rng.choice(dates)
+            t0 = time.perf_counter()
+            try:
+                flows[page](start, end)
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    timings[page].append(elapsed)
+            except Exception as e:
+                logging.error(f"Session {i} on {page} failed: {e}")
+                with lock:
+                    errors[page] += 1
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    pages = {}
+    for page in PAGES:
+        runs = np.array(timings[page])
+        pages[page] = {
+            "runs": len(runs),
+            "errors": errors[page],
+            **{f"p{q}_ms": round(float(np.percentile(runs, q)) * 1000, 1) if len(runs) else None
+               for q in PERCENTILES},
+            "max_ms": round(float(runs.max()) * 1000, 1) if len(runs) else None,
+        }
+    runs = sum(p["runs"] for p in pages.values())
+    return {
+        "pages": pages,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(runs / wall, 2) if wall else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+    }
+
+
+def _upstream(server, since: dict) -> dict:
+    """Requests the mock saw since the ``since`` snapshot, by method, plus injected failures."""
+    counts = {}
+    for (method, _), n in server.requests.items():
+        counts[method] = counts.get(method, 0) + n
+    out = {m: n - since.get(m, 0) for m, n in counts.items() if n - since.get(m, 0)}
+    out["failed"] = server.failures - since.get("failed", 0)
+    return out
+
+
+def run_load(fixtures: Path, args) -> dict:
+    """Serve ``fixtures``, ingest them once, then run the sessions in a fresh interpreter."""
+    from scraper.mock_statcan import MockStatCanServer
+
+    with tempfile.TemporaryDirectory(prefix="load-") as work, \
+            MockStatCanServer(fixtures, latency=args.latency, jitter=args.jitter,
+                              failure_rate=args.failure_rate, seed=args.seed) as server:
+        # The scraper modules read these at import time.
+        env = dict(os.environ,
+                   STATCAN_BASE_URL=server.base_url,
+                   STATCAN_WDS_URL=server.wds_url,
+                   TABLE_CACHE_DIR=str(Path(work) / "cache"),
+                   TABLE_STORE_DIR=str(Path(work) / "store"),
+                   SERIES_STORE_DIR=str(Path(work) / "series"),
+                   SNAPSHOT_STORE_DIR=str(Path(work) / "snapshots"),
+                   LOAD_WORK_DIR=work,
+                   LOG_DIR=str(Path(work) / "logs"))
+
+        result = {}
+        if not args.direct:
+            ingest = subprocess.run([sys.executable, "-m", "scraper.ingest", "--once"],
+                                    capture_output=True, text=True, cwd=ROOT, env=env)
+            result["ingest_ok"] = ingest.returncode == 0
+            result["upstream_ingest"] = _upstream(server, {})
+        before = {**_upstream(server, {}), "failed": server.failures}
+
+        probe = [sys.executable, "-m", "benchmarks.load", "--probe",
+                 "--sessions", str(args.sessions), "--reruns", str(args.reruns),
+                 "--ranges", str(args.ranges), "--seed", str(args.seed)]
+        out = subprocess.run(probe + (["--direct"] if args.direct else []),
+                             capture_output=True, text=True, cwd=ROOT, env=env)
+        if out.returncode != 0:
+            raise RuntimeError(f"Load probe failed for {fixtures}:\n{out.stderr}")
+        result.update(json.loads(out.stdout.strip().splitlines()[-1]))
+        result["upstream_sessions"] = _upstream(server, before)
+    return result
+
+
+def check(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, as readable lines."""
+    regressions = []
+    for fixture_set, r in results.items():
+        b = baseline.get(fixture_set)
+        for page, p in r["pages"].items():
+            if p["errors"]:
+                regressions.append(f"{fixture_set}/{page}: {p['errors']} failed page run(s)")
+            bp = (b or {}).get("pages", {}).get(page)
+            # Absolute slack keeps millisecond-scale pages from flapping on noise.
+            if bp and p["p95_ms"] is not None and bp["p95_ms"] is not None \
+                    and p["p95_ms"] > bp["p95_ms"] * (1 + time_tolerance) + 5:
+                regressions.append(f"{fixture_set}/{page}: p95 {p['p95_ms']:.1f} ms "
+                                   f"vs baseline {bp['p95_ms']:.1f} ms")
+        if b and r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + memory_tolerance) + 10:
+            regressions.append(f"{fixture_set}: peak RSS {r['peak_rss_mb']:.0f} MB "
+                               f"vs baseline {b['peak_rss_mb']:.0f} MB")
+        if b and r["upstream_sessions"].get("GET", 0) > b["upstream_sessions"].get("GET", 0):
+            regressions.append(f"{fixture_set}: sessions made {r['upstream_sessions'].get('GET', 0)} "
+                               f"upstream GETs vs baseline {b['upstream_sessions'].get('GET', 0)}")
+    return regressions
+
+
+def _report(name: str, r: dict) -> None:
+    print(f"\n{name}: {sum(p['runs'] for p in r['pages'].values())} page runs in {r['wall_s']:.2f}s "
+          f"({r['throughput_rps']} runs/s), peak RSS {r['peak_rss_mb']:.0f} MB (+{r['rss_growth_mb']:.0f} MB)")
+    print(f"  {'page':<10} {'runs':>6} {'errors':>7} " + " ".join(f"{f'p{q} ms':>9}" for q in PERCENTILES)
+          + f" {'max ms':>9}")
+    for page, p in r["pages"].items():
+        cells = " ".join(f"{p[f'p{q}_ms']:>9.1f}" if p[f"p{q}_ms"] is not None else f"{'-':>9}"
+                         for q in PERCENTILES)
+        print(f"  {page:<10} {p['runs']:>6} {p['errors']:>7} {cells} "
+              f"{p['max_ms'] if p['max_ms'] is not None else '-':>9}")
+    if "upstream_ingest" in r:
+        print(f"  upstream during ingestion: {r['upstream_ingest']}"
+              + ("" if r["ingest_ok"] else " (ingestion reported errors)"))
+    print(f"  upstream during sessions:  {r['upstream_sessions']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=5, help="page runs per session")
+    parser.add_argument("--ranges", type=int, default=4, help="distinct date ranges sessions pick from")
+    parser.add_argument("--direct", action="store_true", help="sessions fetch through the trackers, not the store")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the mock adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of upstream requests failing with 503")
+    parser.add_argument("--fixtures", type=Path, nargs="*", default=None,
+                        help="directories of recorded table ZIPs (default: synthetic tables)")
+    parser.add_argument("--filler", type=int, default=5000, help="filler vectors per synthetic table")
+    parser.add_argument("--periods", type=int, default=120, help="monthly periods per synthetic vector")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, default=None, help="also write the results to this file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--check", action="store_true", help="fail on errors or a regression against the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed p95 slowdown (0.5 = +50%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed peak-RSS growth")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(run_sessions(args.sessions, args.reruns, args.ranges, args.direct, args.seed)))
+        return 0
+
+    mode = "direct" if args.direct else "store"
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.fixtures:
+            sets = {f"{mode}-recorded-{path.name}": path for path in args.fixtures}
+        else:
+            path = Path(tmp) / f"filler-{args.filler}"
+            make_dashboard_fixtures(path, args.filler, args.periods)
+            sets = {f"{mode}-filler-{args.filler}": path}
+        for name, path in sets.items():
+            results[name] = run_load(path, args)
+
+    print(f"{args.sessions} sessions x {args.reruns} reruns, {args.ranges} date ranges, upstream latency "
+          f"{args.latency * 1000:.0f} ms (+{args.jitter * 1000:.0f} ms jitter), failure rate {args.failure_rate:.0%}")
+    for name, r in results.items():
+        _report(name, r)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    if args.check:
+        # Baselines are machine specific, so none is committed: without one only
+        # failed page runs count.
+        if not BASELINE_PATH.exists():
+            print(f"No baseline at {BASELINE_PATH}; checking failed page runs only "
+                  f"(run with --save-baseline to compare timings)")
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        regressions = check(results, baseline, args.time_tolerance, args.memory_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s)" + (f" against {BASELINE_PATH.name}" if baseline else ""))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Import-time budget for the Streamlit entry point and every page.
+
+Runs the module-level imports of ``app.py`` and each ``pages/*.py`` in a
+fresh interpreter that has already imported Streamlit (as the server has),
+and reports the median time over ``--repeat`` runs plus which of the heavy
+modules got loaded. A page fails when it is over its time budget or loads
+a module it should only import on first use.
+
+    python -m benchmarks.startup            # report
+    python -m benchmarks.startup --check    # exit 1 when a page is over budget
+    python -m benchmarks.startup --scale 2  # double every time budget (slow machines)
+
+Time budgets are milliseconds on a developer laptop; the deferred-module
+rules hold on any machine.
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["app.py", *sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))]
+
+# Modules no page may import before it needs them: chart rendering, the
+# analytics stack and the fetch pipeline.
+DEFERRED = ["streamlit_echarts", "alignment", "analytics", "charts", "scraper.dashboard",
+            "scraper.batch", "scraper.series_store", "pyarrow.parquet", "requests"]
+# The landing page renders text only.
+DEFERRED_BY_PAGE = {"app.py": ["pandas", "numpy", "data_layer"]}
+WATCHED = sorted({*DEFERRED, "pandas", "numpy", "pyarrow", "data_layer", "scraper.registry"})
+DEFAULT_BUDGET_MS = 1000
+BUDGETS_MS = {"app.py": 100, "pages/diagnostics.py": 1000}
+
+
+def page_imports(page: str) -> str:
+    """The module-level import statements of ``page`` as source."""
+    tree = ast.parse((ROOT / page).read_text())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def probe(page: str) -> dict:
+    """Time the imports of ``page``; call in a fresh interpreter."""
+    import time
+
+    import streamlit  # noqa: F401  (already loaded in a running server)
+
+    code = compile(page_imports(page), page, "exec")
+    before = set(sys.modules)
+    t0 = time.perf_counter()
+    exec(code, {"__name__": "__page__"})
+    elapsed = time.perf_counter() - t0
+    loaded = set(sys.modules) - before
+    return {"ms": round(elapsed * 1000, 1), "loaded": [m for m in WATCHED if m in loaded]}
+
+
+def measure(page: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--probe", page],
+                             capture_output=True, text=True, cwd=ROOT)
+        if out.returncode != 0:
+            raise RuntimeError(f"Import probe failed for {page}:\n{out.stderr}")
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {"ms": statistics.median(r["ms"] for r in runs), "loaded": runs[-1]["loaded"]}
+
+
+def violations(page: str, result: dict, scale: float) -> list[str]:
+    found = []
+    budget = BUDGETS_MS.get(page, DEFAULT_BUDGET_MS) * scale
+    if result["ms"] > budget:
+        found.append(f"{page}: imports take {result['ms']:.0f} ms, budget {budget:.0f} ms")
+    for module in DEFERRED + DEFERRED_BY_PAGE.get(page, []):
+        if module in result["loaded"]:
+            found.append(f"{page}: imports {module} at start-up")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every time budget")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a page is over budget")
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(args.probe)))
+        return 0
+
+    found = []
+    print(f"{'page':<28} {'median ms':>10} {'budget ms':>10}  loaded")
+    for page in PAGES:
+        result = measure(page, args.repeat)
+        budget = BUDGETS_MS.get(page, DEFAULT_BUDGET_MS) * args.scale
+        print(f"{page:<28} {result['ms']:>10.1f} {budget:>10.0f}  {', '.join(result['loaded']) or '-'}")
+        found += violations(page, result, args.scale)
+
+    for line in found:
+        print(f"OVER BUDGET {line}")
+    if args.check:
+        print(f"{len(found)} violation(s)")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
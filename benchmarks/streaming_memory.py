@@ -0,0 +1,116 @@
+"""Peak-memory benchmark: eager ``read_csv`` vs the streaming ZIP filter.
+
+Every measurement runs in a fresh interpreter. Once the imports are done
+the process's peak RSS is reset (``/proc/self/clear_refs``), so the peak
+reported is that of the fetch alone; where the reset is not allowed, a
+thread samples the current RSS instead. The peak of Arrow's memory pool,
+which the streaming path allocates from, is reported alongside.
+
+    python -m benchmarks.streaming_memory --filler 500 2000 8000
+
+Linux only (both measurements read ``/proc/self``). Exits non-zero if the
+streaming peak grows by more than ``--tolerance-mb`` between the smallest
+and the largest table.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import make_table_zip
+
+PID = "1810026501"
+VECTOR = "v1230995999"
+
+_PROBE = r"""
+import io, json, os, re, sys, threading, zipfile
+import pandas as pd
+import pyarrow as pa
+from scraper.streaming import filter_table_zip
+
+PAGE_MB = os.sysconf("SC_PAGE_SIZE") / 2**20
+
+def rss_mb():
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * PAGE_MB
+
+def hwm_mb():
+    with open("/proc/self/status") as fh:
+        return int(re.search(r"VmHWM:\s+(\d+)", fh.read()).group(1)) / 1024
+
+try:
+    with open("/proc/self/clear_refs", "w") as fh:
+        fh.write("5")  # reset VmHWM to the current RSS
+    sampler = None
+except OSError:
+    samples, done = [], threading.Event()
+    def sample():
+        while not done.wait(0.001):
+            samples.append(rss_mb())
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+mode, path, vector = sys.argv[1:4]
+base = rss_mb()
+pool_base = pa.default_memory_pool().bytes_allocated()
+if mode == "eager":
+    with open(path, "rb") as fh:
+        content = fh.read()
+    with zipfile.ZipFile(io.BytesIO(content)) as z:
+        name = next(n for n in z.namelist() if n.endswith(".csv") and "MetaData" not in n)
+        with z.open(name) as f:
+            df = pd.read_csv(f, dtype=str)
+    rows = int((df["VECTOR"].str.lower() == vector).sum())
+else:
+    rows = len(filter_table_zip(path, [vector]))
+if sampler is None:
+    peak = hwm_mb()
+else:
+    done.set()
+    sampler.join()
+    peak = max(samples + [rss_mb()])
+print(json.dumps({"rows": rows, "peak_mb": peak - base,
+                  "arrow_mb": (pa.default_memory_pool().max_memory() - pool_base) / 2**20}))
+"""
+
+
+def measure(mode: str, zip_path: Path) -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE, mode, str(zip_path), VECTOR],
+                         capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parent.parent)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filler", type=int, nargs="+", default=[500, 2000, 8000],
+                        help="filler vectors per table size")
+    parser.add_argument("--periods", type=int, default=240)
+    parser.add_argument("--tolerance-mb", type=float, default=48.0)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_filler in args.filler:
+            zip_path = make_table_zip(Path(tmp) / str(n_filler), PID, [VECTOR],
+                                      n_filler=n_filler, periods=args.periods)
+            rows = (n_filler + 1) * args.periods
+            eager, streaming = measure("eager", zip_path), measure("streaming", zip_path)
+            assert eager["rows"] == streaming["rows"] == args.periods
+            results.append((rows, zip_path.stat().st_size, eager, streaming))
+
+    print(f"{'table rows':>12} {'zip MB':>8} {'eager MB':>10} {'streaming MB':>13} {'arrow MB':>9} {'ratio':>7}")
+    for rows, size, eager, streaming in results:
+        ratio = eager["peak_mb"] / streaming["peak_mb"] if streaming["peak_mb"] > 0 else float("inf")
+        print(f"{rows:>12,} {size / 2**20:>8.1f} {eager['peak_mb']:>10.1f} {streaming['peak_mb']:>13.1f} "
+              f"{streaming['arrow_mb']:>9.1f} {ratio:>6.1f}x")
+
+    growth = results[-1][3]["peak_mb"] - results[0][3]["peak_mb"]
+    print(f"Streaming peak growth across sizes: {growth:.1f} MB (tolerance {args.tolerance_mb} MB)")
+    return 0 if growth <= args.tolerance_mb else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Per-stage benchmark: download, parse, filter, merge and chart building.
+
+Runs every hot-path stage against a local mock StatCan server serving
+recorded or synthetic table ZIPs and reports, per stage, the median wall
+time over ``--repeat`` runs plus the peak traced memory and net allocated
+blocks of one extra run under ``tracemalloc`` (Python and NumPy
+allocations; Arrow's own memory pool is not traced).
+
+    python -m benchmarks.suite                          # synthetic tables, 500 and 5000 filler vectors
+    python -m benchmarks.suite --fixtures path/to/zips  # recorded <code>-eng.zip files (+ wds/)
+    python -m benchmarks.suite --save-baseline          # write benchmarks/baselines.json
+    python -m benchmarks.suite --check                  # exit 1 on a regression against it
+
+Each fixture set runs in a fresh interpreter with its own cache and store
+directories, so runs do not warm each other up. Baselines are machine
+specific and not committed: save one with ``--save-baseline`` on the
+machine that runs ``--check``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import make_dashboard_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+IPPI = ("1810026501", "v1230995999")
+RMPI = ("1810026801", "v1230998193")
+BCPI = ("1810028901", ["v1617908010", "v1617908154"])
+
+
+def run_stages(work: Path, repeat: int) -> dict[str, dict]:
+    """Run every stage; call in a fresh interpreter set up by ``run_fixture_set``."""
+    import contextlib
+    import io
+    import statistics
+    import time
+    import tracemalloc
+
+    from alignment import align, to_timestamps
+    from analytics import analyze
+    from charts import line_chart_options
+    from scraper.bcpi_scraper import BCPITracker, load_statcan_table
+    from scraper.statcan_scraper import IndexTracker, grab_table_csv
+    from scraper.table_cache import get_table_cache
+    from scraper.table_store import convert_table_zip, get_table_store
+
+    cache = get_table_cache()
+    for pid in (IPPI[0], RMPI[0], BCPI[0]):
+        cache.get(pid)
+        get_table_store().ensure(pid)
+
+    ippi = IndexTracker(*IPPI).fetch_data()
+    rmpi = IndexTracker(*RMPI).fetch_data()
+    monthly = {"IPPI": ippi["VALUE"], "RMPI": rmpi["VALUE"]}
+    wide = align(monthly, "M").dropna()
+
+    stages = {
+        "download": lambda: (cache.invalidate(IPPI[0]), cache.get(IPPI[0]))[1],
+        "revalidate": lambda: cache.get(IPPI[0], force=True),
+        "grab_table_csv": lambda: grab_table_csv(IPPI[0]),
+        "load_statcan_table": lambda: load_statcan_table(BCPI[0]),
+        "convert_parquet": lambda: convert_table_zip(cache.get(IPPI[0]), work / "bench.parquet"),
+        "index_fetch_table": lambda: IndexTracker(*IPPI).fetch_data(),
+        "index_fetch_streaming": lambda: IndexTracker(*IPPI, streaming=True).fetch_data(),
+        "bcpi_fetch_table": lambda: BCPITracker(*BCPI).fetch_data(),
+        "merge_correlation": lambda: analyze(to_timestamps(align(monthly, "M").dropna())),
+        "chart_options": lambda: line_chart_options(wide, "IPPI vs RMPI", tariff_marks=True),
+    }
+
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, stage in stages.items():
+            stage()  # warm-up
+            times = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                stage()
+                times.append(time.perf_counter() - t0)
+
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            kept = stage()
+            peak = tracemalloc.get_traced_memory()[1] - base
+            blocks = sum(d.count_diff for d in tracemalloc.take_snapshot().compare_to(before, "filename"))
+            tracemalloc.stop()
+            del kept
+
+            results[name] = {
+                "median_s": round(statistics.median(times), 5),
+                "min_s": round(min(times), 5),
+                "peak_mb": round(peak / 2**20, 3),
+                "net_blocks": blocks,
+            }
+    return results
+
+
+def run_fixture_set(fixtures: Path, repeat: int) -> dict[str, dict]:
+    """Serve ``fixtures`` from a mock StatCan and benchmark them in a fresh interpreter."""
+    from scraper.mock_statcan import MockStatCanServer
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as work, MockStatCanServer(fixtures) as server:
+        # The scraper modules read these at import time.
+        env = dict(os.environ,
+                   STATCAN_BASE_URL=server.base_url,
+                   STATCAN_WDS_URL=server.wds_url,
+                   TABLE_CACHE_DIR=str(Path(work) / "cache"),
+                   TABLE_STORE_DIR=str(Path(work) / "store"),
+                   SERIES_STORE_DIR=str(Path(work) / "series"))
+        out = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--probe", work,
+                              "--repeat", str(repeat)],
+                             capture_output=True, text=True, cwd=ROOT, env=env)
+    if out.returncode != 0:
+        raise RuntimeError(f"Benchmark probe failed for {fixtures}:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, as readable lines."""
+    regressions = []
+    for fixture_set, stages in results.items():
+        for stage, r in stages.items():
+            b = baseline.get(fixture_set, {}).get(stage)
+            if b is None:
+                continue
+            # Absolute slack keeps millisecond-scale stages from flapping on noise.
+            if r["median_s"] > b["median_s"] * (1 + time_tolerance) + 0.005:
+                regressions.append(f"{fixture_set}/{stage}: {r['median_s'] * 1000:.1f} ms "
+                                   f"vs baseline {b['median_s'] * 1000:.1f} ms")
+            if r["peak_mb"] > b["peak_mb"] * (1 + memory_tolerance) + 1.0:
+                regressions.append(f"{fixture_set}/{stage}: peak {r['peak_mb']:.1f} MB "
+                                   f"vs baseline {b['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, nargs="*", default=None,
+                        help="directories of recorded table ZIPs (default: synthetic tables)")
+    parser.add_argument("--filler", type=int, nargs="+", default=[500, 5000],
+                        help="filler vectors per synthetic table size")
+    parser.add_argument("--periods", type=int, default=120, help="monthly periods per synthetic vector")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None, help="also write the results to this file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--check", action="store_true", help="fail on a regression against the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed slowdown (0.5 = +50%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed peak-memory growth")
+    parser.add_argument("--probe", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(run_stages(args.probe, args.repeat)))
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.fixtures:
+            sets = {f"recorded-{path.name}": path for path in args.fixtures}
+        else:
+            sets = {}
+            for n_filler in args.filler:
+                path = Path(tmp) / f"filler-{n_filler}"
+                make_dashboard_fixtures(path, n_filler, args.periods)
+                sets[f"filler-{n_filler}"] = path
+        for name, path in sets.items():
+            results[name] = run_fixture_set(path, args.repeat)
+
+    print(f"{'fixtures':<16} {'stage':<24} {'median ms':>10} {'min ms':>9} {'peak MB':>9} {'blocks':>9}")
+    for name, stages in results.items():
+        for stage, r in stages.items():
+            print(f"{name:<16} {stage:<24} {r['median_s'] * 1000:>10.1f} {r['min_s'] * 1000:>9.1f} "
+                  f"{r['peak_mb']:>9.1f} {r['net_blocks']:>9,}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    if args.check:
+        # Baselines are machine specific, so none is committed: without one
+        # there is nothing to compare against yet.
+        if not BASELINE_PATH.exists():
+            print(f"No baseline at {BASELINE_PATH}; nothing to check "
+                  f"(run with --save-baseline to compare timings)")
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        regressions = check(results, baseline, args.time_tolerance, args.memory_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s)" + (f" against {BASELINE_PATH.name}" if baseline else ""))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
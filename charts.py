@@ -0,0 +1,154 @@
+# charts.py
+"""ECharts option payloads for the trends pages and the report.
+
+Builders take a wide frame on a PeriodIndex (one column per series) and
+return a plain dict ready for ``st_echarts`` or ``json.dumps``. Long
+histories are reduced server-side with LTTB (largest-triangle-three-buckets)
+so a chart never ships more than ``max_points`` x-values to the browser,
+while the tariff milestones stay on the axis.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics import TARIFF_PHASES
+
+MAX_POINTS = int(os.environ.get("CHART_MAX_POINTS", 600))
+X_FORMATS = {"M": "%b %Y", "Q": "%Y-Q%q"}
+TEXT_COLOR = "#000000"
+
+
+def lttb(y, threshold: int) -> np.ndarray:
+    """Indices of the ``threshold`` points of ``y`` that best keep its shape.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previous
+    pick and the average of the next bucket.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype="float64")
+    edges = np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    picked = np.empty(threshold, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def downsample(wide: pd.DataFrame, max_points: int = MAX_POINTS, keep: list[int] = ()) -> pd.DataFrame:
+    """Rows of ``wide`` reduced to about ``max_points`` with LTTB.
+
+    Each column gets an equal share of the budget and the union of the
+    picked rows is kept, plus the row positions in ``keep``.
+    """
+    if len(wide) <= max_points or wide.shape[1] == 0:
+        return wide
+    share = max(3, max_points // wide.shape[1])
+    rows = set(keep)
+    for column in wide.columns:
+        rows.update(lttb(wide[column].to_numpy(), share).tolist())
+    return wide.iloc[sorted(rows)]
+
+
+def _mark_positions(index: pd.PeriodIndex) -> dict[str, int]:
+    marks = {}
+    for name, date in TARIFF_PHASES.items():
+        position = index.searchsorted(pd.Period(date, freq=index.freq))
+        if position < len(index) and index[position] == pd.Period(date, freq=index.freq):
+            marks[name] = int(position)
+    return marks
+
+
+def line_chart_options(wide: pd.DataFrame, title: str, colors: dict[str, str | None] | None = None,
+                       tariff_marks: bool = False, max_points: int = MAX_POINTS) -> dict:
+    """ECharts line-chart options for every column of ``wide`` (PeriodIndex)."""
+    colors = colors or {}
+    marks = _mark_positions(wide.index) if tariff_marks else {}
+    points = downsample(wide, max_points, keep=list(marks.values()))
+    x_format = X_FORMATS.get(wide.index.freqstr[0], "%Y-%m")
+    x_data = points.index.strftime(x_format).tolist()
+
+    series = []
+    for i, label in enumerate(points.columns):
+        entry = {
+            "name": label,
+            "type": "line",
+            "data": points[label].round(4).tolist(),
+            "smooth": True,
+        }
+        if colors.get(label):
+            entry["itemStyle"] = {"color": colors[label]}
+        if i == 0 and marks:
+            entry["markLine"] = {
+                "data": [{"xAxis": wide.index[pos].strftime(x_format), "label": {"formatter": name}}
+                         for name, pos in marks.items()],
+                "lineStyle": {"type": "dashed", "color": "#FF0000"},
+                "label": {"color": TEXT_COLOR, "fontWeight": "bold"}
+            }
+        series.append(entry)
+
+    return {
+        "backgroundColor": "#FFFFFFFF",
+        "title": {"text": title, "textStyle": {"color": TEXT_COLOR}},
+        "tooltip": {"trigger": "axis"},
+        "legend": {"data": list(points.columns), "textStyle": {"color": TEXT_COLOR}},
+        "xAxis": {
+            "type": "category",
+            "data": x_data,
+            "axisLabel": {"rotate": 45, "color": TEXT_COLOR},
+            "axisPointer": {"type": "shadow"}
+        },
+        "yAxis": {"type": "value", "axisLabel": {"color": TEXT_COLOR}},
+        "series": series,
+        "dataZoom": [{"type": "inside"}, {"type": "slider"}]
+    }
+
+
+def heatmap_options(xcorr: pd.DataFrame, title: str, x_name: str = "lag") -> dict:
+    """ECharts heatmap of a pair-by-lag correlation frame (rows ``(a, b)``, columns lags)."""
+    rows = [f"{a} → {b}" for a, b in xcorr.index]
+    values = xcorr.to_numpy()
+    cells = [[j, i, None if np.isnan(values[i, j]) else round(float(values[i, j]), 3)]
+             for i in range(values.shape[0]) for j in range(values.shape[1])]
+    return {
+        "backgroundColor": "#FFFFFFFF",
+        "title": {"text": title, "textStyle": {"color": TEXT_COLOR}},
+        "tooltip": {"position": "top"},
+        "grid": {"left": 160, "right": 40, "bottom": 90},
+        "xAxis": {
+            "type": "category",
+            "name": x_name,
+            "data": [str(c) for c in xcorr.columns],
+            "splitArea": {"show": True},
+            "axisLabel": {"color": TEXT_COLOR},
+        },
+        "yAxis": {
+            "type": "category",
+            "data": rows,
+            "splitArea": {"show": True},
+            "axisLabel": {"color": TEXT_COLOR},
+        },
+        "visualMap": {
+            "min": -1,
+            "max": 1,
+            "calculable": True,
+            "orient": "horizontal",
+            "left": "center",
+            "bottom": 10,
+            "inRange": {"color": ["#2166AC", "#F7F7F7", "#B2182B"]},
+        },
+        "series": [{"name": "correlation", "type": "heatmap", "data": cells,
+                    "emphasis": {"itemStyle": {"borderColor": "#333", "borderWidth": 1}}}],
+    }
@@ -0,0 +1,247 @@
+# data_layer.py
+"""Process-wide cached access to the local series store for the Streamlit pages.
+
+Every session in the server process shares one cache, so twenty analysts
+opening the same page cost one store read, not twenty. Entries are keyed on
+the store ``VERSION`` token: when the ingestion job publishes new data the
+next rerun misses and reloads, and the TTL bounds how long an entry can
+outlive its version if the store is replaced underneath the app.
+
+The store, alignment, analytics and chart modules are imported on first
+use rather than with this module, so a page only pays for what it renders.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from scraper.registry import Series, common_freq, load_registry
+
+CACHE_TTL = int(os.environ.get("DATA_CACHE_TTL", 3600))
+MAX_ENTRIES = 64
+
+
+@st.cache_resource
+def get_store():
+    """The series store shared by every session."""
+    from scraper.series_store import SeriesStore
+
+    return SeriesStore()
+
+
+@st.cache_resource
+def get_snapshots():
+    """The snapshot store (every value each ingestion run saw) shared by every session."""
+    from scraper.snapshot_store import SnapshotStore
+
+    return SnapshotStore()
+
+
+@st.cache_resource
+def get_catalog():
+    """The vector catalogs built by ``python -m scraper.ingest --catalog``, indexed once per process."""
+    from scraper.catalog import VectorCatalog
+
+    return VectorCatalog()
+
+
+def search_vectors(query: str, limit: int = 50) -> pd.DataFrame:
+    """Vectors of the catalogued tables whose dimension members match ``query``."""
+    return get_catalog().search(query, limit=limit)
+
+
+def data_version() -> str | None:
+    """Current store version; a single small file read, cheap to call on each rerun."""
+    return get_store().version()
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner="Loading series...")
+def _trackers(keys: tuple[str, ...], version: str | None) -> dict:
+    # ``version`` is only part of the cache key. The trackers are shared, not
+    # copied, between sessions: callers must not modify their frames.
+    from scraper.dashboard import series_trackers
+
+    by_key = {s.key: s for s in load_registry()}
+    return series_trackers([by_key[k] for k in keys], store=get_store())
+
+
+def _views(keys: tuple[str, ...], start: pd.Timestamp | None, end: pd.Timestamp | None,
+           version: str | None) -> dict[str, pd.DataFrame]:
+    return {key: tracker.view(start, end) for key, tracker in _trackers(keys, version).items()}
+
+
+def load_series(series: list[Series] | None = None, start: pd.Timestamp | None = None,
+                end: pd.Timestamp | None = None) -> dict[str, pd.DataFrame]:
+    """Registry series over [start, end] keyed by series key, shared across sessions.
+
+    The full histories are read once per data version; a date range is a
+    binary-search slice of them, so changing the date inputs costs no I/O.
+    The frames are read-only views.
+    """
+    series = list(series) if series is not None else list(load_registry())
+    return _views(tuple(s.key for s in series), start, end, data_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _align(keys: tuple[str, ...], freq: str, interpolate: bool, version: str | None) -> pd.DataFrame:
+    from alignment import align
+    from scraper.dashboard import series_values
+
+    by_key = {s.key: s for s in load_registry()}
+    series = [by_key[k] for k in keys]
+    return align(series_values(_views(keys, None, None, version), series), freq, interpolate=interpolate)
+
+
+def load_aligned(series: list[Series], freq: str | None = None, start: pd.Timestamp | None = None,
+                 end: pd.Timestamp | None = None, interpolate: bool = False) -> pd.DataFrame:
+    """Cached ``alignment.align`` of ``series`` (by label) on a ``freq`` PeriodIndex.
+
+    ``freq`` defaults to the common frequency of ``series``. The full history
+    is aligned once per data version; ``start``/``end`` slice the result
+    without copying it.
+    """
+    freq = freq or common_freq(series)
+    wide = _align(tuple(s.key for s in series), freq, interpolate, data_version())
+    # Periods overlapping [start, end], found by binary search on the sorted index.
+    lo = 0 if start is None else wide.index.searchsorted(pd.Period(start, freq=freq), "left")
+    hi = len(wide) if end is None else wide.index.searchsorted(pd.Period(end, freq=freq), "right")
+    return wide.iloc[lo:hi]
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner="Computing analytics...")
+def _analyze(keys: tuple[str, ...], version: str | None) -> dict:
+    # Shared like ``_trackers``: callers must not modify the frames.
+    from alignment import align, to_timestamps
+    from analytics import analyze
+    from scraper.dashboard import series_values
+
+    by_key = {s.key: s for s in load_registry()}
+    series = [by_key[k] for k in keys]
+    freq = common_freq(series)
+    wide = to_timestamps(align(series_values(_views(keys, None, None, version), series), freq)).dropna()
+    return analyze(wide, 4 if freq == "Q" else 12)
+
+
+def load_analytics(series: list[Series], start: pd.Timestamp | None = None,
+                   end: pd.Timestamp | None = None) -> dict:
+    """``analytics.analyze`` of ``series`` over [start, end], shared across sessions.
+
+    The full history is analyzed once per data version and the frames are
+    sliced to the periods overlapping [start, end], so year-over-year
+    changes and rolling correlations at the start of the range use the
+    periods before it, and the tariff-phase baseline does not move with
+    the dates. Rolling correlations for every window and pair are computed
+    together, so changing the window on a page is a dictionary lookup.
+    """
+    full = _analyze(tuple(s.key for s in series), data_version())
+    freq = common_freq(series)
+    index = full["wide"].index
+    lo = 0 if start is None else index.searchsorted(pd.Period(start, freq=freq).start_time, "left")
+    hi = len(index) if end is None else index.searchsorted(pd.Period(end, freq=freq).start_time, "right")
+
+    def window(frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.iloc[lo:hi]
+
+    return {
+        "wide": window(full["wide"]),
+        "correlations": {pair: window(frame) for pair, frame in full["correlations"].items()},
+        "changes": {kind: window(frame) for kind, frame in full["changes"].items()},
+        "phases": full["phases"],
+    }
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _chart(keys: tuple[str, ...], start: pd.Timestamp | None, end: pd.Timestamp | None, title: str,
+           tariff_marks: bool, max_points: int, version: str | None) -> dict:
+    from charts import line_chart_options
+
+    by_key = {s.key: s for s in load_registry()}
+    series = [by_key[k] for k in keys]
+    wide = load_aligned(series, start=start, end=end).dropna()
+    return line_chart_options(wide, title, {s.label: s.color for s in series}, tariff_marks, max_points)
+
+
+def load_chart(series: list[Series], title: str, start: pd.Timestamp | None = None,
+               end: pd.Timestamp | None = None, tariff_marks: bool = False,
+               max_points: int | None = None) -> dict:
+    """Cached ECharts options for ``series`` over [start, end].
+
+    Downsampled to ``max_points`` x-values (default ``charts.MAX_POINTS``).
+    """
+    if max_points is None:
+        from charts import MAX_POINTS
+
+        max_points = MAX_POINTS
+    return _chart(tuple(s.key for s in series), start, end, title, tariff_marks, max_points, data_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _revisions(vector: str, version: str | None) -> pd.DataFrame:
+    return get_snapshots().revisions(vector)
+
+
+def load_revisions(series: Series) -> pd.DataFrame:
+    """Cached revised periods of ``series``: first and latest published value."""
+    return _revisions(series.vector, data_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner="Computing lead/lag correlations...")
+def _lead_lag(keys: tuple[str, ...], max_lag: int, version: str | None) -> dict:
+    from alignment import align
+    from analytics import cross_correlations, lead_lag_summary, period_changes
+    from charts import heatmap_options
+    from scraper.dashboard import series_values
+
+    by_key = {s.key: s for s in load_registry()}
+    series = [by_key[k] for k in keys]
+    freq = common_freq(series)
+    wide = align(series_values(_views(keys, None, None, version), series), freq)
+    changes = period_changes(wide, 4 if freq == "Q" else 12)["period"]
+    xcorr = cross_correlations(changes, max_lag)
+    # (b, a) at lag k is (a, b) at -k: chart each unordered pair once.
+    order = {s.label: i for i, s in enumerate(series)}
+    forward = xcorr[[order[a] < order[b] for a, b in xcorr.index]]
+    unit = "quarters" if freq == "Q" else "months"
+    return {
+        "freq": freq,
+        "changes": changes,
+        "xcorr": xcorr,
+        "summary": lead_lag_summary(xcorr),
+        "heatmap": heatmap_options(forward, f"Correlation of period changes by lag ({unit})", f"lag ({unit})"),
+    }
+
+
+def load_lead_lag(series: list[Series], max_lag: int = 12) -> dict:
+    """Cached lead/lag cross-correlations of the period changes of ``series``.
+
+    Keys: ``freq``, ``changes`` (aligned percent changes), ``xcorr`` (every
+    ordered pair by lag), ``summary`` (best lag per pair) and ``heatmap``
+    (ECharts options). Computed once per series set, lag range and data
+    version.
+    """
+    return _lead_lag(tuple(s.key for s in series), max_lag, data_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def _rolling_lag(keys: tuple[str, ...], a: str, b: str, window: int, max_lag: int,
+                 version: str | None) -> pd.DataFrame:
+    from analytics import rolling_lag
+
+    changes = _lead_lag(keys, max_lag, version)["changes"]
+    return rolling_lag(changes[a], changes[b], window, max_lag)
+
+
+def load_rolling_lag(series: list[Series], a: str, b: str, window: int, max_lag: int = 12) -> pd.DataFrame:
+    """Cached best lag of ``b`` behind ``a`` (labels of ``series``) over each trailing window."""
+    return _rolling_lag(tuple(s.key for s in series), a, b, window, max_lag, data_version())
+
+
+def invalidate() -> None:
+    """Drop every cached series, analytic and chart, e.g. after replacing the store by hand."""
+    _trackers.clear()
+    _align.clear()
+    _analyze.clear()
+    _chart.clear()
+    _revisions.clear()
+    _lead_lag.clear()
+    _rolling_lag.clear()
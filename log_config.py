@@ -0,0 +1,29 @@
+# log_config.py
+"""Logging setup shared by the app, the ingestion job and the report CLI.
+
+Library modules only call ``logging.<level>(...)``; each entry point calls
+``configure_logging()`` once at start-up. Streamlit re-executes page
+scripts on every rerun but imports this module once per process, so repeat
+calls are no-ops and no handler is ever added twice.
+"""
+import logging
+import os
+from pathlib import Path
+
+LOG_DIR = Path(os.environ.get("LOG_DIR", Path(__file__).resolve().parent / "logs"))
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+_configured: Path | None = None
+
+
+def configure_logging(filename: Path | str = "app.log", level: str = LOG_LEVEL) -> Path:
+    """Send log records at ``level`` and above to ``filename`` (relative to ``LOG_DIR``)."""
+    global _configured
+    if _configured is not None:
+        return _configured
+    path = LOG_DIR / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(filename=path, level=level, format=LOG_FORMAT, force=True)
+    _configured = path
+    return path
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-from scraper.bcpi_scraper import BCPITracker
-from streamlit_echarts import st_echarts
+from log_config import configure_logging
+from data_layer import data_version, load_aligned, load_chart, load_series
+from scraper.registry import load_registry, series_in_group
+
+configure_logging()
 
 # Page Setup
 st.set_page_config(page_title="BCPI Trends", layout="wide")
 st.title("BCPI Trends for Residential and Non-Residential buildings in Canada, Divison: Metal fabrications")
-st.markdown("Select date range. Fetch Data to Generate Graphs.")
+st.markdown("Select date range to Generate Graphs.")
 
 # Date input
 min_date = pd.Timestamp("2020-01-01")
@@ -16,121 +19,45 @@ end_date = st.date_input("End Date", min_value=min_date, max_value=max_date, val
 start_date = pd.to_datetime(start_date)
 end_date = pd.to_datetime(end_date)
 
-# Initialize session state for data
-if 'df_res' not in st.session_state:
-    st.session_state['df_res'] = pd.DataFrame()
-if 'df_nonres' not in st.session_state:
-    st.session_state['df_nonres'] = pd.DataFrame()
-
-# Tracker instances
-res_bcpi = BCPITracker(pid="1810028901", target_vectors=["v1617908010"])
-nonres_bcpi = BCPITracker(pid="1810028901", target_vectors=["v1617908154"])
-
-# Fetch Buttons
-col1, col2 = st.columns(2)
-with col1:
-    if st.button("Fetch Residential BCPI"):
-        try:
-            df_res = res_bcpi.fetch_data(start_quarter=start_date.to_period("Q").strftime("%YQ%q"),
-                                         end_quarter=end_date.to_period("Q").strftime("%YQ%q"))
-            if df_res.empty:
-                st.error("No Residential BCPI data fetched. Check date range.")
-            else:
-                st.session_state['df_res'] = df_res
-                st.success(f"Fetched Residential BCPI with {len(df_res)} rows")
-                st.dataframe(df_res)
-        except Exception as e:
-            st.error(f"Failed to fetch Residential BCPI: {e}")
+# Series registered for this page (series.yaml, group "bcpi")
+series = series_in_group("bcpi")
 
-with col2:
-    if st.button("Fetch Non-Residential BCPI"):
-        try:
-            df_nonres = nonres_bcpi.fetch_data(start_quarter=start_date.to_period("Q").strftime("%YQ%q"),
-                                               end_quarter=end_date.to_period("Q").strftime("%YQ%q"))
-            if df_nonres.empty:
-                st.error("No Non-Residential BCPI data fetched. Check date range.")
-            else:
-                st.session_state['df_nonres'] = df_nonres
-                st.success(f"Fetched Non-Residential BCPI with {len(df_nonres)} rows")
-                st.dataframe(df_nonres)
-        except Exception as e:
-            st.error(f"Failed to fetch Non-Residential BCPI: {e}")
-
-# Load data from session state
-df_res = st.session_state['df_res']
-df_nonres = st.session_state['df_nonres']
+# Load data from the local series store (filled by `python -m scraper.ingest`)
+results = load_series(series, start_date, end_date)
+store_version = data_version()
+st.caption(f"Data version: {store_version}" if store_version else "The local series store is empty.")
 
 # Validate
-if df_res.empty or df_nonres.empty:
-    st.warning("Both Residential and Non-Residential BCPI data must be available.")
+missing = [s.label for s in series if results[s.key].empty]
+if not series or missing:
+    st.warning(f"Data must be available for every BCPI series (missing: {', '.join(missing) or 'none'}). "
+               "Run `python -m scraper.ingest --once` to fill the local store.")
     st.stop()
 
-# Prepare data
-df_res = df_res[["REF_DATE", "VALUE"]].rename(columns={"VALUE": "Residential"})
-df_res["REF_DATE"] = pd.to_datetime(df_res["REF_DATE"])
-df_nonres = df_nonres[["REF_DATE", "VALUE"]].rename(columns={"VALUE": "Non-Residential"})
-df_nonres["REF_DATE"] = pd.to_datetime(df_nonres["REF_DATE"])
-
-# Merge datasets
-merged = pd.merge(df_res, df_nonres, on="REF_DATE", how="inner")
-merged = merged[(merged["REF_DATE"] >= start_date) & (merged["REF_DATE"] <= end_date)].dropna()
+# BCPI series on a common quarterly index
+merged = load_aligned(series, "Q", start_date, end_date).dropna()
 
 if merged.empty:
     st.error("No overlapping BCPI data in selected date range.")
     st.stop()
 
-# Generate Residential BCPI Chart
-if st.button("Generate Residential BCPI Graph"):
-    x_data_res = merged["REF_DATE"].dt.strftime("%Y-Q%q").tolist()
-    options_res = {
-        "backgroundColor": "#FFFFFFFF",
-        "title": {"text": "BCPI: Residential Buildings", "textStyle": {"color": "#000000"}},
-        "tooltip": {"trigger": "axis"},
-        "legend": {"data": ["Residential"], "textStyle": {"color": "#000000"}},
-        "xAxis": {
-            "type": "category",
-            "data": x_data_res,
-            "axisLabel": {"rotate": 45, "color": "#000000"},
-            "axisPointer": {"type": "shadow"}
-        },
-        "yAxis": {"type": "value", "axisLabel": {"color": "#000000"}},
-        "series": [
-            {
-                "name": "Residential",
-                "type": "line",
-                "data": merged['Residential'].tolist(),
-                "smooth": True,
-                "itemStyle": {"color": "#23558E"}
-            }
-        ],
-        "dataZoom": [{"type": "inside"}, {"type": "slider"}]
-    }
-    st_echarts(options=options_res, height="450px")
-
-# Generate Non-Residential BCPI Chart
-if st.button("Generate Non-Residential BCPI Graph"):
-    x_data_nonres = merged["REF_DATE"].dt.strftime("%Y-Q%q").tolist()
-    options_nonres = {
-        "backgroundColor": "#FFFFFFFF",
-        "title": {"text": "BCPI: Non-Residential Buildings", "textStyle": {"color": "#000000"}},
-        "tooltip": {"trigger": "axis"},
-        "legend": {"data": ["Non-Residential"], "textStyle": {"color": "#000000"}},
-        "xAxis": {
-            "type": "category",
-            "data": x_data_nonres,
-            "axisLabel": {"rotate": 45, "color": "#000000"},
-            "axisPointer": {"type": "shadow"}
-        },
-        "yAxis": {"type": "value", "axisLabel": {"color": "#000000"}},
-        "series": [
-            {
-                "name": "Non-Residential",
-                "type": "line",
-                "data": merged['Non-Residential'].tolist(),
-                "smooth": True,
-                "itemStyle": {"color": "#174F17"}
-            }
-        ],
-        "dataZoom": [{"type": "inside"}, {"type": "slider"}]
-    }
-    st_echarts(options=options_nonres, height="450px")
+# Generate one chart per registered BCPI series
+for s in series:
+    if st.button(f"Generate {s.label} BCPI Graph"):
+        options = load_chart([s], s.description or f"BCPI: {s.label}", start_date, end_date)
+        from streamlit_echarts import st_echarts
+        st_echarts(options=options, height="450px")
+
+# Cross-index comparison: every registered series averaged to quarters
+st.markdown("---")
+st.header("BCPI vs IPPI and RMPI (quarterly)")
+st.markdown("Monthly IPPI and RMPI are averaged over complete quarters and indexed to 100 "
+            "in the first quarter all series share.")
+quarterly = load_aligned(list(load_registry()), "Q", start_date, end_date).dropna()
+if quarterly.empty:
+    st.info("No quarter in the selected range has data for every series.")
+else:
+    rebased = quarterly / quarterly.iloc[0] * 100
+    st.line_chart(rebased.set_axis(quarterly.index.strftime("%Y-Q%q")))
+    st.subheader("Correlation of quarter-over-quarter changes")
+    st.dataframe(quarterly.pct_change().corr().round(2))
@@ -1,14 +1,27 @@
+import textwrap
 import streamlit as st
 import pandas as pd
+import yaml
+from log_config import configure_logging
+from data_layer import data_version, load_revisions, load_series, search_vectors
+from scraper.registry import FREQUENCIES, load_registry
+
+configure_logging()
 
 # Page Setup
 st.set_page_config(page_title="Data Preview", layout="wide")
 st.title("Data Preview")
-st.markdown("Below is the data fetched for Residential and Non-Residential BCPI.")
+st.markdown("Below is the data held in the local series store for every registered series.")
+
+# Full histories from the local series store (filled by `python -m scraper.ingest`)
+series = load_registry()
+results = load_series(series)
+store_version = data_version()
+st.caption(f"Data version: {store_version}" if store_version else "The local series store is empty.")
 
 # Helper function to display a table
 def display_table(data_key, label, table_name):
-    df = st.session_state.get(data_key, pd.DataFrame())
+    df = results.get(data_key, pd.DataFrame())
     if df.empty:
         st.warning(f"No data found for {label}.")
     else:
@@ -16,13 +29,52 @@ def display_table(data_key, label, table_name):
         st.dataframe(df)
         st.download_button(
             label=f"Download {table_name}.csv",
-            data=df.to_csv(index=False),
+            data=df.to_csv(),
             file_name=f"{table_name}.csv",
             mime="text/csv"
         )
 
-# Display both datasets
-display_table("df_res", "BCPI Data for Residential Buildings", "BCPI_residential")
-display_table("df_nonres", "BCPI Data for Non-Residential Buildings", "BCPI_nonresidential")
-display_table("df_ip", "IPPI Data", "IPPI_data")
-display_table("df_rm", "RMPI Data", "RMPI_data")
+# Display every registered series
+for s in series:
+    display_table(s.key, f"{s.description or s.label} ({s.vector})", s.key)
+
+# Revisions seen by the ingestion job (scraper/snapshot_store.py)
+st.markdown("---")
+st.header("Revisions")
+st.markdown("Periods whose published value changed between ingestion runs. Revisions are "
+            "dated by the ingestion run that recorded them, not by StatCan's release time.")
+picked = st.selectbox("Series", series, format_func=lambda s: s.label)
+revisions = load_revisions(picked) if picked else pd.DataFrame()
+if revisions.empty:
+    st.info("No revisions recorded for this series yet.")
+else:
+    st.dataframe(revisions.set_axis(revisions.index.strftime("%Y-%m-%d"), axis=0))
+
+# Search the vector catalogs built by `python -m scraper.ingest --catalog` (scraper/catalog.py)
+st.markdown("---")
+st.header("Find a Series")
+st.markdown("Search every catalogued table by geography, product or other member names, or by VECTOR code.")
+query = st.text_input("Search", placeholder="e.g. canada lumber")
+if query:
+    found = search_vectors(query)
+    if found.empty:
+        st.info("No matching vectors. Catalogs are built by `python -m scraper.ingest --catalog`.")
+    else:
+        st.dataframe(found, hide_index=True)
+        vector = st.selectbox("Vector", found["VECTOR"])
+        row = found[found["VECTOR"] == vector].iloc[0]
+        members = ", ".join(str(row[c]) for c in found.columns
+                            if c not in ("PID", "VECTOR", "COORDINATE", "UOM", "start", "end", "frequency")
+                            and pd.notna(row[c]))
+        frequency = row.get("frequency")
+        if frequency not in FREQUENCIES:
+            st.info(f"{vector} is {frequency if pd.notna(frequency) else 'of unknown frequency'}; "
+                    f"the registry holds {' and '.join(FREQUENCIES)} series only.")
+        else:
+            # A page shows series of one frequency, so take the group of a registered series like it.
+            group = next((s.group for s in series if s.frequency == frequency), None)
+            entry = {"key": vector, "label": vector, "description": members, "pid": str(row["PID"]),
+                     "vector": vector, "frequency": frequency, "group": group}
+            st.markdown("Registry entry for `series.yaml`:")
+            st.code(textwrap.indent(yaml.safe_dump([entry], sort_keys=False, allow_unicode=True), "  "),
+                    language="yaml")
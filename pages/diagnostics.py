@@ -0,0 +1,48 @@
+import pandas as pd
+import streamlit as st
+from log_config import configure_logging
+from scraper import instrumentation as instr
+
+configure_logging()
+
+# Page Setup
+st.set_page_config(page_title="Diagnostics", layout="wide")
+st.title("Diagnostics")
+st.markdown(
+    "Per-stage timings (download, unzip, parse, filter, coerce, merge, analyze) and "
+    "transfer and cache counters collected in this server process."
+)
+
+# Collection is off by default (or on with STATCAN_INSTRUMENTATION=1)
+collect = st.toggle("Collect timings", value=instr.enabled())
+if collect and not instr.enabled():
+    instr.enable()
+elif not collect and instr.enabled():
+    instr.disable()
+if st.button("Reset"):
+    instr.reset()
+
+snap = instr.snapshot()
+if not snap["spans"] and not snap["counters"]:
+    st.info("Nothing recorded yet. Turn collection on and use the other pages.")
+    st.stop()
+
+def as_frame(records, columns):
+    frame = pd.DataFrame(records)
+    frame.insert(1, "labels", [", ".join(f"{k}={v}" for k, v in labels.items()) for labels in frame.pop("labels")])
+    return frame[["name", "labels", *columns]]
+
+if snap["spans"]:
+    st.subheader("Stages")
+    spans = as_frame(snap["spans"], ["count", "total_s", "mean_s", "max_s", "errors"])
+    st.dataframe(spans.sort_values("total_s", ascending=False), hide_index=True)
+if snap["counters"]:
+    st.subheader("Counters")
+    st.dataframe(as_frame(snap["counters"], ["value"]), hide_index=True)
+
+# Exports
+col1, col2 = st.columns(2)
+col1.download_button("Download events (JSON lines)", data=instr.to_jsonl(),
+                     file_name="instrumentation.jsonl", mime="application/x-ndjson")
+col2.download_button("Download metrics (Prometheus)", data=instr.prometheus_text(),
+                     file_name="instrumentation.prom", mime="text/plain")
@@ -0,0 +1,57 @@
+import streamlit as st
+from log_config import configure_logging
+from data_layer import data_version, load_lead_lag, load_rolling_lag
+from scraper.registry import common_freq, load_registry
+
+configure_logging()
+
+# Page Setup
+st.set_page_config(page_title="Lead/Lag", layout="wide")
+st.title("Lead/Lag Between Series")
+st.markdown("How many periods it takes for a move in one index to show up in another: the correlation "
+            "of period-over-period changes with one series shifted by each lag. A peak at lag k for "
+            "A → B means B follows A by k periods.")
+
+# Every registered series; mixing in a quarterly one puts all of them on quarters
+registry = list(load_registry())
+labels = st.multiselect("Series", [s.label for s in registry], default=[s.label for s in registry])
+series = [s for s in registry if s.label in labels]
+if len(series) < 2:
+    st.info("Pick at least two series.")
+    st.stop()
+
+unit = "quarters" if common_freq(series) == "Q" else "months"
+max_lag = st.slider(f"Largest lag ({unit})", min_value=1, max_value=24, value=12 if unit == "months" else 6)
+
+store_version = data_version()
+st.caption(f"Data version: {store_version}" if store_version else "The local series store is empty.")
+result = load_lead_lag(series, max_lag)
+if result["changes"].dropna().shape[0] < 3:
+    st.warning("Not enough overlapping data for these series. "
+               "Run `python -m scraper.ingest --once` to fill the local store.")
+    st.stop()
+
+# Heatmap of every pair by lag
+if st.button("Generate Lead/Lag Heatmap"):
+    from streamlit_echarts import st_echarts  # only needed once a chart is drawn
+    st_echarts(options=result["heatmap"],
+               height=f"{max(300, 40 * len(result['heatmap']['yAxis']['data']) + 160)}px")
+
+# Strongest lag per pair
+st.subheader("Strongest lag per pair")
+st.dataframe(result["summary"].round(3))
+
+# Rolling lag for one pair
+st.markdown("---")
+st.header("Rolling Lag")
+col1, col2 = st.columns(2)
+leader = col1.selectbox("Leading series", labels, index=0)
+follower = col2.selectbox("Following series", labels, index=1)
+window = st.slider(f"Window ({unit})", min_value=6, max_value=60, value=24 if unit == "months" else 12)
+if leader == follower:
+    st.info("Pick two different series.")
+else:
+    rolling = load_rolling_lag(series, leader, follower, window, max_lag).dropna()
+    st.subheader(f"Best lag of {follower} behind {leader} ({window}-{unit[:-1]} window)")
+    st.line_chart(rolling["best_lag"])
+    st.line_chart(rolling["correlation"])
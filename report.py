@@ -0,0 +1,238 @@
+# report.py
+"""Headless report: every registered series, the merged frames, analytics and
+charts written to disk in one run, without Streamlit or a browser.
+
+    python -m report --out reports/latest
+    python -m report --out reports/nightly --refresh --workers 8 --start 2020-01-01
+
+Writes, under ``--out``:
+
+- ``<name>.csv`` and ``<name>.parquet`` for every frame: ``series`` (all
+  observations, long), ``<group>_aligned`` (series of a page on a common
+  index), ``all_quarterly`` (every series averaged to quarters) and, per
+  group, ``_changes``, ``_correlations`` and ``_phases``
+- ``report.html``: a static page with every chart (ECharts, from a CDN) and
+  the tariff-phase tables
+- ``manifest.json``: data version, date range and the files written
+
+Frames and charts are produced on a thread pool (``--workers``).
+"""
+import argparse
+import html
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from alignment import align, to_timestamps
+from analytics import analyze
+from charts import MAX_POINTS, line_chart_options
+from log_config import configure_logging
+from scraper.dashboard import read_series, series_values
+from scraper.registry import Series, common_freq, load_registry
+from scraper.series_store import SeriesStore, get_series_store
+
+FORMATS = ("csv", "parquet")
+ECHARTS_CDN = "https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js"
+
+
+def _groups(series: tuple[Series, ...]) -> dict[str, list[Series]]:
+    groups: dict[str, list[Series]] = {}
+    for s in series:
+        groups.setdefault(s.group, []).append(s)
+    return groups
+
+
+def _to_periods(frame: pd.DataFrame, freq: str) -> pd.DataFrame:
+    return frame.set_axis(frame.index.to_period(freq), axis=0)
+
+
+def _correlations_long(table: dict[tuple[str, str], pd.DataFrame]) -> pd.DataFrame:
+    frames = []
+    for (a, b), frame in table.items():
+        if a < b:
+            long = frame.rename_axis(index="period", columns="window").stack().rename("correlation").reset_index()
+            long.insert(1, "series_a", a)
+            long.insert(2, "series_b", b)
+            frames.append(long)
+    if not frames:
+        return pd.DataFrame(columns=["period", "series_a", "series_b", "window", "correlation"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _changes_long(changes: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return pd.concat(
+        {kind: frame.rename_axis("period").stack().rename("pct_change") for kind, frame in changes.items()},
+        names=["change", "period", "series"],
+    ).reset_index()
+
+
+def build_frames(start: pd.Timestamp | None = None, end: pd.Timestamp | None = None,
+                 store: SeriesStore | None = None) -> tuple[dict[str, pd.DataFrame], list[tuple[str, dict]]]:
+    """Every report frame by name, plus (title, chart-spec arguments) for every chart."""
+    series = load_registry()
+    results = read_series(series, start, end, store=store)
+
+    # Monthly and quarterly periods cannot share a column; use period start dates.
+    frames = {"series": pd.concat(
+        [results[s.key].assign(key=s.key, label=s.label, frequency=s.frequency)
+         .set_axis(results[s.key].index.to_timestamp().rename("REF_DATE")) for s in series]
+    ).reset_index()}
+    charts = []
+
+    for group, members in _groups(series).items():
+        freq = common_freq(members)
+        wide = align(series_values(results, members), freq).dropna()
+        frames[f"{group}_aligned"] = wide
+        colors = {s.label: s.color for s in members}
+        if len(members) > 1:
+            charts.append((f"{' vs '.join(s.label for s in members)} Over Time",
+                           dict(wide=wide, colors=colors, tariff_marks=freq == "M")))
+        for s in members:
+            charts.append((s.description or s.label,
+                           dict(wide=wide[[s.label]], colors=colors, tariff_marks=freq == "M")))
+
+        stats = analyze(to_timestamps(wide), 4 if freq == "Q" else 12)
+        frames[f"{group}_changes"] = _changes_long(
+            {kind: _to_periods(frame, freq) for kind, frame in stats["changes"].items()})
+        frames[f"{group}_correlations"] = _correlations_long(
+            {pair: _to_periods(frame, freq) for pair, frame in stats["correlations"].items()})
+        frames[f"{group}_phases"] = stats["phases"]
+
+    quarterly = align(series_values(results, list(series)), "Q").dropna()
+    frames["all_quarterly"] = quarterly
+    if not quarterly.empty:
+        charts.append(("All series, quarterly (first quarter = 100)",
+                       dict(wide=quarterly / quarterly.iloc[0] * 100)))
+    return frames, charts
+
+
+def _flat(frame: pd.DataFrame, fmt: str) -> pd.DataFrame:
+    """Index as columns; periods as strings in CSV and as start dates in Parquet."""
+    flat = frame.reset_index() if not isinstance(frame.index, pd.RangeIndex) else frame
+    for column in flat.columns:
+        if isinstance(flat[column].dtype, pd.PeriodDtype):
+            flat[column] = flat[column].astype(str) if fmt == "csv" else flat[column].dt.to_timestamp()
+    return flat
+
+
+def write_frame(frame: pd.DataFrame, path: Path) -> Path:
+    fmt = path.suffix.lstrip(".")
+    flat = _flat(frame, fmt)
+    if fmt == "csv":
+        flat.to_csv(path, index=False)
+    else:
+        flat.columns = [str(c) for c in flat.columns]
+        flat.to_parquet(path, index=False)
+    return path
+
+
+def render_html(charts: list[tuple[str, dict]], tables: dict[str, pd.DataFrame], meta: dict) -> str:
+    chart_divs, chart_scripts = [], []
+    for i, (title, options) in enumerate(charts):
+        chart_divs.append(f'<div id="chart{i}" class="chart"></div>')
+        payload = json.dumps(options).replace("</", "<\\/")
+        chart_scripts.append(f'echarts.init(document.getElementById("chart{i}")).setOption({payload});')
+    table_html = "\n".join(
+        f"<h3>{html.escape(name)}</h3>\n{table.round(2).to_html(border=0, classes='table', na_rep='')}"
+        for name, table in tables.items()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>U.S. - Canada Tariff Impact report</title>
+<script src="{ECHARTS_CDN}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #000; }}
+.chart {{ width: 100%; height: 480px; margin-bottom: 2em; }}
+.table {{ border-collapse: collapse; margin-bottom: 2em; }}
+.table td, .table th {{ padding: 0.2em 0.8em; text-align: right; }}
+</style>
+</head>
+<body>
+<h1>U.S. - Canada Tariff Impact on Construction and Production sectors</h1>
+<p>Data version {html.escape(str(meta.get("data_version")))}, generated {html.escape(meta["generated"])}.</p>
+<h2>Charts</h2>
+{chr(10).join(chart_divs)}
+<h2>Tariff phase statistics</h2>
+{table_html}
+<script>
+{chr(10).join(chart_scripts)}
+</script>
+</body>
+</html>
+"""
+
+
+def run_report(out: Path | str, start: pd.Timestamp | None = None, end: pd.Timestamp | None = None,
+               workers: int = 4, formats: tuple[str, ...] = FORMATS, max_points: int = MAX_POINTS,
+               store: SeriesStore | None = None) -> dict:
+    """Build every frame and chart and write them under ``out``; returns the manifest."""
+    t0 = time.perf_counter()
+    store = store or get_series_store()
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    frames, chart_specs = build_frames(start, end, store)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        writes = [pool.submit(write_frame, frame, out / f"{name}.{fmt}")
+                  for name, frame in frames.items() for fmt in formats]
+        charts = [(title, pool.submit(line_chart_options, title=title, max_points=max_points, **spec))
+                  for title, spec in chart_specs]
+        files = [f.result().name for f in writes]
+        charts = [(title, future.result()) for title, future in charts]
+
+    manifest = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "data_version": store.version(),
+        "start": None if start is None else start.isoformat(),
+        "end": None if end is None else end.isoformat(),
+        "series": [s.key for s in load_registry()],
+        "files": sorted(files) + ["report.html"],
+        "charts": len(charts),
+    }
+    tables = {name.removesuffix("_phases"): frame for name, frame in frames.items() if name.endswith("_phases")}
+    (out / "report.html").write_text(render_html(charts, tables, manifest))
+    manifest["seconds"] = round(time.perf_counter() - t0, 3)
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    logging.info(f"Report written to {out} in {manifest['seconds']:.2f}s")
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write every series, analytic and chart to disk.")
+    parser.add_argument("--out", default="reports/latest", help="output directory (default reports/latest)")
+    parser.add_argument("--start", type=pd.Timestamp, default=None, help="first reference date, e.g. 2020-01-01")
+    parser.add_argument("--end", type=pd.Timestamp, default=None, help="last reference date")
+    parser.add_argument("--workers", type=int, default=4, help="threads for writing files and charts")
+    parser.add_argument("--format", choices=FORMATS, action="append", dest="formats",
+                        help="frame format(s) to write (default: csv and parquet)")
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS, help="x-values per chart before downsampling")
+    parser.add_argument("--refresh", action="store_true", help="run an incremental ingest before reporting")
+    args = parser.parse_args(argv)
+    configure_logging("report.log")
+
+    if args.refresh:
+        from scraper.incremental import IncrementalUpdater
+        from scraper.registry import registry_requests
+
+        report = IncrementalUpdater().refresh(registry_requests())
+        failed = [pid for pid, r in report.items() if "error" in r]
+        if failed:
+            print(f"Refresh failed for PID(s) {', '.join(failed)}; reporting from the stored data", file=sys.stderr)
+
+    manifest = run_report(args.out, args.start, args.end, args.workers,
+                          tuple(args.formats or FORMATS), args.max_points)
+    print(f"Wrote {len(manifest['files'])} files and {manifest['charts']} charts to {args.out} "
+          f"in {manifest['seconds']:.2f}s (data version {manifest['data_version']})")
+    return 0 if manifest["data_version"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Interchangeable sources for (PID, vectors) series.
+
+Every backend returns the same long VECTOR/REF_DATE/VALUE frame, so the
+trackers and the batch API do not care where the data came from:
+
+- ``table``: typed Parquet copy of the full table ZIP (default)
+- ``streaming``: block-by-block scan of the table ZIP, bounded memory
+- ``wds``: vector-level Web Data Service, no full-table download
+- ``auto``: WDS first, falling back to the table ZIP for anything it misses
+
+The default can be switched with the ``STATCAN_BACKEND`` environment variable.
+"""
+import logging
+import os
+from typing import Protocol
+
+import pandas as pd
+
+from scraper.streaming import fetch_vectors_streaming
+from scraper.table_cache import get_table_cache
+from scraper.table_store import TableStore, get_table_store
+from scraper.wds import FULL_HISTORY_PERIODS, WDSClient
+
+SERIES_COLUMNS = ["VECTOR", "REF_DATE", "VALUE"]
+DEFAULT_BACKEND = os.environ.get("STATCAN_BACKEND", "table")
+
+
+class SeriesBackend(Protocol):
+    name: str
+
+    def prefetch(self, pid: str) -> None: ...
+
+    def fetch(self, pid: str, vectors: list[str], start: pd.Timestamp | None = None,
+              end: pd.Timestamp | None = None) -> pd.DataFrame: ...
+
+    def version(self, pid: str) -> str | None:
+        """Upstream version of the table, or None when the backend cannot tell."""
+        ...
+
+
+def _between(df: pd.DataFrame, start: pd.Timestamp | None, end: pd.Timestamp | None) -> pd.DataFrame:
+    if start is not None:
+        df = df[df["REF_DATE"] >= start]
+    if end is not None:
+        df = df[df["REF_DATE"] <= end]
+    return df
+
+
+class TableBackend:
+    name = "table"
+
+    def __init__(self, store: TableStore | None = None):
+        # None follows the process-wide store (and its cache).
+        self._store = store
+
+    @property
+    def store(self) -> TableStore:
+        return self._store or get_table_store()
+
+    def prefetch(self, pid: str) -> None:
+        self.store.ensure(pid)
+
+    def fetch(self, pid, vectors, start=None, end=None):
+        return self.store.read(pid, vectors, start=start, end=end)[SERIES_COLUMNS]
+
+    def version(self, pid: str) -> str | None:
+        return self.store.cache.version(pid)
+
+
+class StreamingBackend:
+    name = "streaming"
+
+    def prefetch(self, pid: str) -> None:
+        get_table_cache().get(pid)
+
+    def fetch(self, pid, vectors, start=None, end=None):
+        return _between(fetch_vectors_streaming(pid, vectors), start, end)[SERIES_COLUMNS]
+
+    def version(self, pid: str) -> str | None:
+        return get_table_cache().version(pid)
+
+
+class WDSBackend:
+    name = "wds"
+
+    def __init__(self, client: WDSClient | None = None, history_periods: int = FULL_HISTORY_PERIODS):
+        self.client = client or WDSClient()
+        self.history_periods = history_periods
+
+    def prefetch(self, pid: str) -> None:
+        pass
+
+    def fetch(self, pid, vectors, start=None, end=None):
+        # WDS is keyed by vector alone; the PID is only needed by the ZIP backends.
+        if start is None and end is None:
+            df = self.client.latest_periods(vectors, self.history_periods)
+        else:
+            df = self.client.reference_period_range(
+                vectors,
+                start if start is not None else pd.Timestamp("1900-01-01"),
+                end if end is not None else pd.Timestamp.today(),
+            )
+        # RELEASE_TIME rides along for the incremental updater; batch reads drop it.
+        return _between(df, start, end)[SERIES_COLUMNS + ["RELEASE_TIME"]]
+
+    def version(self, pid: str) -> str | None:
+        return None
+
+
+class FallbackBackend:
+    name = "auto"
+
+    def __init__(self, primary: SeriesBackend, fallback: SeriesBackend):
+        self.primary = primary
+        self.fallback = fallback
+
+    def prefetch(self, pid: str) -> None:
+        self.primary.prefetch(pid)
+
+    def fetch(self, pid, vectors, start=None, end=None):
+        try:
+            df = self.primary.fetch(pid, vectors, start, end)
+        except Exception as e:
+            logging.warning(f"{self.primary.name} backend failed for PID {pid}, using {self.fallback.name}: {e}")
+            return self.fallback.fetch(pid, vectors, start, end)
+
+        missing = sorted(set(v.strip().lower() for v in vectors) - set(df["VECTOR"]))
+        if missing:
+            logging.warning(f"{self.primary.name} backend returned nothing for {missing}, "
+                            f"using {self.fallback.name}")
+            df = pd.concat([df, self.fallback.fetch(pid, missing, start, end)], ignore_index=True)
+        return df
+
+    def version(self, pid: str) -> str | None:
+        return self.primary.version(pid)
+
+
+_backends: dict[str, SeriesBackend] = {}
+
+
+def get_backend(backend: "str | SeriesBackend | None" = None) -> SeriesBackend:
+    """Resolve a backend name (or None for the default) to a shared instance."""
+    if backend is not None and not isinstance(backend, str):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name not in _backends:
+        if name == "table":
+            _backends[name] = TableBackend()
+        elif name == "streaming":
+            _backends[name] = StreamingBackend()
+        elif name == "wds":
+            _backends[name] = WDSBackend()
+        elif name == "auto":
+            _backends[name] = FallbackBackend(get_backend("wds"), get_backend("table"))
+        else:
+            raise ValueError(f"Unknown series backend: {name}")
+    return _backends[name]
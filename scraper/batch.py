@@ -0,0 +1,83 @@
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from scraper.backends import SERIES_COLUMNS, SeriesBackend, get_backend
+
+
+def fetch_series_batch(requests: Iterable[tuple[str, str]], start: pd.Timestamp | None = None,
+                       end: pd.Timestamp | None = None, streaming: bool = False,
+                       backend: str | SeriesBackend | None = None) -> pd.DataFrame:
+    """Fetch many (PID, vector) series with one download and one read per PID.
+
+    Returns a long-format frame with VECTOR, REF_DATE and VALUE columns,
+    sorted by VECTOR then REF_DATE. Vectors are matched exactly and
+    case-insensitively and come back lower-cased.
+    """
+    by_pid: dict[str, list[str]] = defaultdict(list)
+    for pid, vector in requests:
+        vector = vector.strip().lower()
+        if vector not in by_pid[pid]:
+            by_pid[pid].append(vector)
+
+    backend = get_backend(backend or ("streaming" if streaming else None))
+    frames = []
+    for pid, vectors in by_pid.items():
+        df = backend.fetch(pid, vectors, start, end)
+        logging.info(f"Batch read PID {pid} via {backend.name}: {len(df)} rows for {len(vectors)} vectors")
+        if not df.empty:
+            frames.append(df[SERIES_COLUMNS])
+
+    if not frames:
+        return pd.DataFrame(columns=SERIES_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values(["VECTOR", "REF_DATE"], ignore_index=True)
+
+
+def split_by_vector(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    return {vector: group[["REF_DATE", "VALUE"]].reset_index(drop=True)
+            for vector, group in df.groupby("VECTOR", sort=False)}
+
+
+def fetch_series_dict(requests: Iterable[tuple[str, str]], start: pd.Timestamp | None = None,
+                      end: pd.Timestamp | None = None, streaming: bool = False,
+                      backend: str | SeriesBackend | None = None) -> dict[str, pd.DataFrame]:
+    return split_by_vector(fetch_series_batch(requests, start, end, streaming, backend))
+
+
+def fetch_trackers(trackers: dict[str, object], **fetch_kwargs) -> dict[str, pd.DataFrame]:
+    """Fill many trackers from one batched read and return their frames by key.
+
+    Each tracker must expose ``pid``, ``vectors``, ``backend`` and
+    ``load(df, **fetch_kwargs)``, which shapes its slice of the long frame the
+    same way its own ``fetch_data`` would. Trackers are batched per backend.
+    """
+    by_backend: dict[int, dict[str, object]] = defaultdict(dict)
+    for key, tracker in trackers.items():
+        by_backend[id(tracker.backend)][key] = tracker
+
+    results = {}
+    for group in by_backend.values():
+        backend = next(iter(group.values())).backend
+        long_df = fetch_series_batch(
+            [(t.pid, v) for t in group.values() for v in t.vectors], backend=backend
+        )
+        results.update(load_trackers(group, long_df, **fetch_kwargs))
+    return results
+
+
+def load_trackers(trackers: dict[str, object], long_df: pd.DataFrame, **fetch_kwargs) -> dict[str, pd.DataFrame]:
+    """Shape each tracker's slice of an already-fetched long frame.
+
+    The frame is grouped by VECTOR once; each tracker then gets its rows by
+    position instead of another scan of the whole frame.
+    """
+    rows = long_df.groupby("VECTOR", sort=False, observed=True).indices
+    results = {}
+    for key, tracker in trackers.items():
+        positions = [rows[v] for v in tracker.vectors if v in rows]
+        part = long_df.iloc[np.concatenate(positions)] if positions else long_df.iloc[:0]
+        results[key] = tracker.load(part, **fetch_kwargs)
+    return results
@@ -0,0 +1,229 @@
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from scraper.table_store import TableStore, get_table_store
+
+DEFAULT_CATALOG_DIR = Path(os.environ.get(
+    "CATALOG_DIR", Path(__file__).resolve().parent.parent / "data" / "catalog"
+))
+# Every StatCan table CSV has these; whatever else it has are its dimensions.
+NON_DIMENSION_COLUMNS = {"REF_DATE", "DGUID", "UOM", "UOM_ID", "SCALAR_FACTOR", "SCALAR_ID", "VECTOR",
+                         "COORDINATE", "VALUE", "STATUS", "SYMBOL", "TERMINATED", "DECIMALS"}
+# Per-vector columns build_catalog adds; bump CATALOG_FORMAT when they change so catalogs rebuild.
+SUMMARY_COLUMNS = {"start", "end", "frequency"}
+CATALOG_FORMAT = 2
+FREQUENCIES = {1: "monthly", 3: "quarterly", 12: "annual"}
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+def tokens(text: str) -> list[str]:
+    return _TOKEN.findall(str(text).lower())
+
+
+def build_catalog(table_path: Path | str) -> pd.DataFrame:
+    """One row per vector of a stored table: its dimension members, coordinate, unit, date range and frequency."""
+    schema = pq.read_schema(table_path)
+    dimensions = [c for c in schema.names if c not in NON_DIMENSION_COLUMNS]
+    extra = [c for c in ("COORDINATE", "UOM") if c in schema.names]
+    table = pq.read_table(table_path, columns=["VECTOR", "REF_DATE", *extra, *dimensions])
+    df = table.to_pandas()
+    # The table is sorted by VECTOR then REF_DATE, so each vector is one run of rows.
+    vector = df["VECTOR"].to_numpy()
+    first = np.flatnonzero(np.r_[True, vector[1:] != vector[:-1]])
+    last = np.r_[first[1:] - 1, len(df) - 1]
+    catalog = df.iloc[first].reset_index(drop=True)
+    catalog["start"] = df["REF_DATE"].to_numpy()[first]
+    catalog["end"] = df["REF_DATE"].to_numpy()[last]
+    # The smallest step in months between consecutive periods, so gaps in a series don't hide its frequency.
+    ref_dates = pd.DatetimeIndex(df["REF_DATE"])
+    months = ref_dates.year.to_numpy() * 12 + ref_dates.month.to_numpy()
+    steps = np.r_[np.diff(months), 0]
+    steps[last] = np.iinfo(steps.dtype).max
+    catalog["frequency"] = pd.Series(np.minimum.reduceat(steps, first)).map(FREQUENCIES).astype("category")
+    for column in dimensions + extra:
+        catalog[column] = catalog[column].astype("category")
+    return catalog[["VECTOR", *dimensions, *extra, "start", "end", "frequency"]]
+
+
+class TableCatalog:
+    """Vectors of one table with an inverted token index over their dimension members.
+
+    Dimension columns are categorical, so the index tokenizes each distinct
+    member once and maps it to its rows through the category codes. A query
+    intersects the posting lists of its tokens (the last one matched as a
+    prefix, for search-as-you-type); vectors resolve through a hash lookup.
+    """
+
+    def __init__(self, pid: str, frame: pd.DataFrame, source_version: str | None = None):
+        self.pid = pid
+        self.frame = frame
+        self.source_version = source_version
+        self.dimensions = [c for c in frame.columns if c not in NON_DIMENSION_COLUMNS | SUMMARY_COLUMNS]
+        self._rows = {v: i for i, v in enumerate(frame["VECTOR"])}
+
+        postings: dict[str, list[np.ndarray]] = {}
+        for column in self.dimensions:
+            codes = frame[column].cat.codes.to_numpy()
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(frame[column].cat.categories) + 1))
+            for code, member in enumerate(frame[column].cat.categories):
+                rows = order[bounds[code]:bounds[code + 1]]
+                for token in set(tokens(member)):
+                    postings.setdefault(token, []).append(rows)
+        self._postings = {t: self._union(parts) for t, parts in postings.items()}
+        self._tokens = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def get(self, vector: str) -> dict | None:
+        """Dimension members of ``vector``, or None if the table does not have it."""
+        row = self._rows.get(vector.strip().lower())
+        return None if row is None else {c: self.frame[c].iat[row] for c in self.frame.columns}
+
+    def _union(self, parts: list[np.ndarray]) -> np.ndarray:
+        # A mask over the rows beats sorting or hashing when a token covers most of the table.
+        if len(parts) == 1:
+            return parts[0]
+        mask = np.zeros(len(self.frame), dtype=bool)
+        for rows in parts:
+            mask[rows] = True
+        return np.flatnonzero(mask)
+
+    def _matching(self, token: str, prefix: bool) -> np.ndarray:
+        if not prefix:
+            return self._postings.get(token, np.empty(0, dtype=np.int64))
+        lo = bisect.bisect_left(self._tokens, token)
+        hi = bisect.bisect_left(self._tokens, token + "\uffff")
+        return self._union([self._postings[t] for t in self._tokens[lo:hi]])
+
+    def search(self, query: str, limit: int | None = 50) -> pd.DataFrame:
+        """Vectors whose dimension members contain every word of ``query`` (the last as a prefix)."""
+        words = tokens(query)
+        if not words:
+            return self.frame.iloc[:0]
+        rows = None
+        for i, word in enumerate(words):
+            if word in self._rows:  # a vector code
+                found = np.array([self._rows[word]])
+            else:
+                found = self._matching(word, prefix=i == len(words) - 1)
+            if rows is None:
+                rows = found
+            else:
+                keep = np.zeros(len(self.frame), dtype=bool)
+                keep[found] = True
+                rows = rows[keep[rows]]
+            if not len(rows):
+                break
+        return self.frame.iloc[rows[:limit] if limit else rows]
+
+
+class VectorCatalog:
+    """Per-table vector catalogs, rebuilt once per upstream table release.
+
+    Each catalog is written to ``<root>/<pid>/catalog.parquet`` from the
+    ``TableStore`` copy of the table, tagged with the cached ZIP's version;
+    ``load`` only reads what was built, so the app never downloads a table.
+    """
+
+    def __init__(self, root: Path | str = DEFAULT_CATALOG_DIR, store: TableStore | None = None):
+        self.root = Path(root)
+        self.store = store or get_table_store()
+        self._loaded: dict[str, TableCatalog] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, pid: str) -> Path:
+        return self.root / pid / "catalog.parquet"
+
+    def _meta_path(self, pid: str) -> Path:
+        return self.root / pid / "meta.json"
+
+    def version(self, pid: str) -> str | None:
+        try:
+            return json.loads(self._meta_path(pid).read_text())["source_version"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _current(self, pid: str, source_version: str | None) -> bool:
+        try:
+            meta = json.loads(self._meta_path(pid).read_text())
+        except (OSError, ValueError):
+            return False
+        return (meta.get("source_version") == source_version and meta.get("format") == CATALOG_FORMAT
+                and self._path(pid).exists())
+
+    def pids(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "catalog.parquet").exists())
+
+    def ensure(self, pid: str) -> TableCatalog | None:
+        """Build the catalog of ``pid`` if its table changed upstream, then load it."""
+        table_path = self.store.ensure(pid)
+        if table_path is None:
+            return self.load(pid)
+        source_version = self.store.version(pid)
+        with self._lock:
+            if not self._current(pid, source_version):
+                frame = build_catalog(table_path)
+                path = self._path(pid)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".parquet.part")
+                frame.to_parquet(tmp, index=False)
+                os.replace(tmp, path)
+                self._meta_path(pid).write_text(json.dumps(
+                    {"pid": pid, "source_version": source_version, "format": CATALOG_FORMAT,
+                     "vectors": len(frame)}, indent=2
+                ))
+                self._loaded.pop(pid, None)
+                logging.info(f"Built catalog for PID {pid}: {len(frame)} vectors")
+        return self.load(pid)
+
+    def load(self, pid: str) -> TableCatalog | None:
+        """The built catalog of ``pid`` (indexed once per version and process), or None."""
+        version = self.version(pid)
+        cached = self._loaded.get(pid)
+        if cached is not None and cached.source_version == version:
+            return cached
+        if not self._path(pid).exists():
+            return None
+        catalog = TableCatalog(pid, pd.read_parquet(self._path(pid)), version)
+        self._loaded[pid] = catalog
+        return catalog
+
+    def search(self, query: str, pids: list[str] | None = None, limit: int | None = 50) -> pd.DataFrame:
+        """``TableCatalog.search`` across tables, with a PID column."""
+        frames = []
+        for pid in pids or self.pids():
+            catalog = self.load(pid)
+            found = catalog.search(query, limit) if catalog is not None else None
+            if found is not None and not found.empty:
+                frames.append(found.assign(PID=pid))
+        if not frames:
+            return pd.DataFrame(columns=["PID", "VECTOR"])
+        out = pd.concat(frames, ignore_index=True)
+        return out[["PID", *[c for c in out.columns if c != "PID"]]].head(limit) if limit else out
+
+    def resolve(self, pid: str, vector: str) -> dict | None:
+        catalog = self.load(pid)
+        return None if catalog is None else catalog.get(vector)
+
+
+_default_catalog: VectorCatalog | None = None
+
+
+def get_vector_catalog() -> VectorCatalog:
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = VectorCatalog()
+    return _default_catalog
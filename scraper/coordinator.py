@@ -0,0 +1,64 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import pandas as pd
+
+from scraper.backends import SeriesBackend, get_backend
+from scraper.batch import fetch_trackers
+from scraper.http_session import MAX_PER_HOST
+
+
+def _prepare(pid: str, backend: SeriesBackend) -> float:
+    t0 = time.perf_counter()
+    backend.prefetch(pid)
+    return time.perf_counter() - t0
+
+
+def prefetch_tables(pids: Iterable[str], max_workers: int = MAX_PER_HOST,
+                    backend: str | SeriesBackend | None = None) -> dict[str, float]:
+    """Prepare every table for ``backend`` concurrently.
+
+    For the table backend that means download and convert to Parquet; for
+    the streaming backend, download only; the WDS backend needs nothing.
+
+    All workers share the pooled keep-alive session, and downloads to the
+    same host are capped by ``host_slot``, so cold-start wall time is bounded
+    by the slowest table rather than the sum of all of them.
+    """
+    backend = get_backend(backend)
+    pids = list(dict.fromkeys(pids))
+    if not pids:
+        return {}
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pids)))) as pool:
+        futures = {pid: pool.submit(_prepare, pid, backend) for pid in pids}
+    results = {}
+    for pid, future in futures.items():
+        try:
+            elapsed = future.result()
+        except Exception as e:
+            logging.error(f"Prefetch failed for PID {pid}: {e}")
+            elapsed = float("nan")
+        results[pid] = elapsed
+        logging.info(f"Prefetched PID {pid} in {elapsed:.2f}s")
+    logging.info(f"Prefetched {len(pids)} tables in {time.perf_counter() - t0:.2f}s")
+    return results
+
+
+def fetch_all(groups: list[tuple[dict[str, object], dict]], max_workers: int = MAX_PER_HOST) -> dict[str, pd.DataFrame]:
+    """Fetch every tracker of every group with one concurrent prefetch.
+
+    ``groups`` is a list of ``(trackers, fetch_kwargs)`` pairs, so trackers
+    can be given different date ranges. Returns the frames of all trackers
+    keyed as given.
+    """
+    trackers = [t for group, _ in groups for t in group.values()]
+    for backend in {id(t.backend): t.backend for t in trackers}.values():
+        prefetch_tables([t.pid for t in trackers if t.backend is backend], max_workers, backend)
+
+    results = {}
+    for group, fetch_kwargs in groups:
+        results.update(fetch_trackers(group, **fetch_kwargs))
+    return results
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from scraper.batch import load_trackers
+from scraper.registry import Series, load_registry
+from scraper.series_store import SeriesStore, get_series_store
+
+
+def series_trackers(series: list[Series] | None = None, store: SeriesStore | None = None) -> dict[str, object]:
+    """Trackers of registry series holding their full history from the local store, keyed by series key.
+
+    One store read for every series; date ranges are then served by each
+    tracker's ``view`` without touching the store again. No network I/O
+    happens here; the store is filled by ``python -m scraper.ingest``.
+    """
+    series = list(series) if series is not None else list(load_registry())
+    store = store or get_series_store()
+    trackers = {s.key: s.tracker() for s in series}
+    load_trackers(trackers, store.read([s.vector for s in series]))
+    return trackers
+
+
+def read_series(series: list[Series] | None = None, start: pd.Timestamp | None = None,
+                end: pd.Timestamp | None = None, store: SeriesStore | None = None) -> dict[str, pd.DataFrame]:
+    """Read registry series from the local store in one pass, keyed by series key.
+
+    Each frame is its tracker's canonical output (``period`` index,
+    categorical VECTOR, float64 VALUE) over [start, end].
+    """
+    return {key: tracker.view(start, end) for key, tracker in series_trackers(series, store).items()}
+
+
+def series_values(results: dict[str, pd.DataFrame], series: list[Series]) -> dict[str, pd.Series]:
+    """Each tracker result as a period-indexed value series, keyed by label."""
+    return {s.label: results[s.key]["VALUE"] for s in series}
+
@@ -0,0 +1,53 @@
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MAX_PER_HOST = 4
+POOL_SIZE = 16
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    # Exponential backoff (0.5s, 1s, 2s, 4s) on throttling and server errors,
+    # honouring Retry-After when StatCan sends one.
+    retry = Retry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session shared by every StatCan request."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+@contextmanager
+def host_slot(url: str, limit: int = MAX_PER_HOST):
+    """Hold one of ``limit`` concurrent request slots for the URL's host."""
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        slot = _host_slots.setdefault(host, threading.BoundedSemaphore(limit))
+    with slot:
+        yield
@@ -0,0 +1,121 @@
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterable
+
+import pandas as pd
+
+from scraper.backends import SeriesBackend, get_backend
+from scraper.http_session import MAX_PER_HOST
+from scraper.series_store import STORE_COLUMNS, SeriesStore, get_series_store
+from scraper.snapshot_store import SnapshotStore, get_snapshot_store
+
+# StatCan revises the last few periods of IPPI/RMPI with each release, and
+# BCPI the previous quarter; six months of overlap covers both.
+DEFAULT_REVISION_MONTHS = 6
+
+
+class IncrementalUpdater:
+    """Bring the local ``SeriesStore`` up to date with what StatCan has published.
+
+    A vector seen for the first time is loaded in full. After that, only the
+    periods from ``revision_months`` before its last stored reference period
+    onwards are fetched and upserted, so the cost of a refresh follows the
+    amount of new data rather than the length of the history. With a table
+    backend a PID whose upstream version (ETag) has not changed since the
+    last refresh is skipped outright; the WDS backend fetches just the window.
+    Every refreshed vector is also recorded in the ``SnapshotStore``, which
+    keeps the values each refresh saw (revisions included). The rows the
+    last ``refresh`` inserted or revised are kept in ``changes``.
+    """
+
+    def __init__(self, store: SeriesStore | None = None, backend: str | SeriesBackend | None = None,
+                 revision_months: int = DEFAULT_REVISION_MONTHS, snapshots: SnapshotStore | None = None):
+        self.store = store or get_series_store()
+        self.snapshots = snapshots or get_snapshot_store()
+        self.backend = get_backend(backend)
+        self.revision_months = revision_months
+        self.changes = pd.DataFrame(columns=STORE_COLUMNS)
+
+    def refresh(self, requests: Iterable[tuple[str, str]], full: bool = False,
+                max_workers: int = MAX_PER_HOST) -> dict[str, dict]:
+        """Refresh every (PID, vector), PIDs concurrently; returns per-PID timing and row counts."""
+        by_pid: dict[str, list[str]] = defaultdict(list)
+        for pid, vector in requests:
+            vector = vector.strip().lower()
+            if vector not in by_pid[pid]:
+                by_pid[pid].append(vector)
+
+        changes: list[pd.DataFrame] = []
+        self.changes = pd.DataFrame(columns=STORE_COLUMNS)
+        if not by_pid:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(by_pid)))) as pool:
+            futures = {pid: pool.submit(self._timed_refresh, pid, vectors, full, changes)
+                       for pid, vectors in by_pid.items()}
+        report = {pid: future.result() for pid, future in futures.items()}
+        if changes:
+            self.changes = pd.concat(changes, ignore_index=True)
+        return report
+
+    def _timed_refresh(self, pid: str, vectors: list[str], full: bool, changes: list[pd.DataFrame]) -> dict:
+        t0 = time.perf_counter()
+        try:
+            summary = self._refresh_pid(pid, vectors, full, changes)
+        except Exception as e:
+            logging.error(f"Incremental refresh failed for PID {pid}: {e}")
+            summary = {"vectors": len(vectors), "error": str(e)}
+        summary["seconds"] = round(time.perf_counter() - t0, 3)
+        return summary
+
+    def _refresh_pid(self, pid: str, vectors: list[str], full: bool, changes: list[pd.DataFrame]) -> dict:
+        self.backend.prefetch(pid)
+        source_version = self.backend.version(pid)
+        state = self.store.state()
+
+        new = [v for v in vectors if full or v not in state]
+        known = [v for v in vectors if v not in new]
+        summary = {"vectors": len(vectors), "fetched": 0, "inserted": 0, "revised": 0, "skipped": 0}
+
+        if known and source_version is not None and all(
+            state[v].get("source_version") == source_version for v in known
+        ):
+            logging.info(f"PID {pid} unchanged upstream ({source_version}), skipping {len(known)} vectors")
+            summary["skipped"] = len(known)
+            known = []
+
+        frames = []
+        if new:
+            frames.append(self.backend.fetch(pid, new))
+        if known:
+            last = min(pd.Timestamp(state[v]["last_ref_date"]) for v in known)
+            since = last - pd.DateOffset(months=self.revision_months)
+            frames.append(self.backend.fetch(pid, known, start=since))
+
+        for df in frames:
+            if df.empty:
+                continue
+            summary["fetched"] += len(df)
+            counts = self.store.upsert(df, changes)
+            summary["inserted"] += counts["inserted"]
+            summary["revised"] += counts["revised"]
+
+        refreshed_at = datetime.now(timezone.utc)
+        stored = self.store.read(new + known)
+        # The whole stored series, so a vector's first snapshot is its full history.
+        # Parts are stamped with this run's time: snapshots track what ingestion saw and when.
+        summary["snapshot"] = sum(self.snapshots.record(stored, release=refreshed_at).values())
+        for vector, group in stored.groupby("VECTOR"):
+            release = group["RELEASE_TIME"].max()
+            self.store.update_state(
+                vector,
+                pid=pid,
+                last_ref_date=group["REF_DATE"].max().isoformat(),
+                last_release=None if pd.isna(release) else release.isoformat(),
+                source_version=source_version,
+                refreshed_at=refreshed_at.isoformat(),
+            )
+        logging.info(f"Refreshed PID {pid}: {summary}")
+        return summary
@@ -0,0 +1,123 @@
+"""Scheduled ingestion of every registered series into the local series store.
+
+The Streamlit pages only read from the store, so all network I/O happens
+here, outside any user session:
+
+    python -m scraper.ingest --once                 # one refresh, then exit
+    python -m scraper.ingest --interval 3600        # refresh every hour
+    python -m scraper.ingest --once --full --backend wds
+    python -m scraper.ingest --once --warehouse sqlite:///data/warehouse.db
+    python -m scraper.ingest --interval 3600 --metrics logs/ingest.prom
+    python -m scraper.ingest --once --catalog
+
+Each run prints, and appends to ``ingest.log`` in ``LOG_DIR`` (``logs/`` by
+default), one line per PID with its timing and row counts, plus a JSON
+summary line. With ``--warehouse``
+(or ``WAREHOUSE_URL``) every run also upserts the registered series into
+that database (see ``db_utils.py``). With ``--metrics`` the per-stage
+timings and counters of every run are exported (see ``instrumentation.py``):
+Prometheus text for a ``.prom`` path, JSON lines otherwise. With
+``--catalog`` the vector catalog of every registered table is rebuilt when
+the table has a new release (see ``catalog.py``).
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from db_utils import WAREHOUSE_URL, get_warehouse_engine, sync_store, upsert_series
+from log_config import configure_logging
+from scraper import instrumentation as instr
+from scraper.catalog import VectorCatalog, get_vector_catalog
+from scraper.incremental import DEFAULT_REVISION_MONTHS, IncrementalUpdater
+from scraper.registry import load_registry, registry_requests
+
+
+def run_once(updater: IncrementalUpdater, full: bool = False, warehouse=None,
+             metrics: Path | None = None, catalog: VectorCatalog | None = None) -> dict:
+    started = datetime.now(timezone.utc)
+    t0 = time.perf_counter()
+    report = updater.refresh(registry_requests(), full=full)
+    run = {
+        "started": started.isoformat(),
+        "seconds": round(time.perf_counter() - t0, 3),
+        "backend": updater.backend.name,
+        "store_version": updater.store.version(),
+        "pids": report,
+        "inserted": sum(r.get("inserted", 0) for r in report.values()),
+        "revised": sum(r.get("revised", 0) for r in report.values()),
+        "errors": sum(1 for r in report.values() if "error" in r),
+    }
+    if warehouse is not None:
+        series = load_registry()
+        upsert_series(warehouse, series)
+        run["warehouse_rows"] = sync_store(warehouse, updater.store, [s.vector for s in series], updater.changes)
+    if catalog is not None:
+        built = {pid: catalog.ensure(pid) for pid in sorted(report)}
+        run["catalog"] = {pid: len(c) for pid, c in built.items() if c is not None}
+
+    for pid, r in report.items():
+        if "error" in r:
+            line = f"PID {pid}: FAILED after {r['seconds']:.2f}s: {r['error']}"
+        else:
+            line = (f"PID {pid}: {r['vectors']} vectors, {r['fetched']} fetched, {r['inserted']} new, "
+                    f"{r['revised']} revised, {r['skipped']} skipped in {r['seconds']:.2f}s")
+        print(line)
+        logging.info(line)
+    print(f"Run finished in {run['seconds']:.2f}s: {run['inserted']} new, {run['revised']} revised, "
+          f"{run['errors']} failed (store version {run['store_version']})")
+    if warehouse is not None:
+        print(f"Synced {run['warehouse_rows']} rows to the warehouse")
+    if catalog is not None:
+        print(f"Catalog: {', '.join(f'PID {pid}: {n} vectors' for pid, n in run['catalog'].items()) or 'nothing built'}")
+    logging.info(json.dumps(run))
+    if metrics is not None:
+        instr.export(metrics)
+        if metrics.suffix != ".prom":
+            instr.reset()  # each run appends only its own events
+    return run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh every registered series into the local store.")
+    parser.add_argument("--once", action="store_true", help="run a single refresh and exit")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between runs (default 3600)")
+    parser.add_argument("--full", action="store_true", help="reload full histories instead of the revision window")
+    parser.add_argument("--backend", default=None, help="table, streaming, wds or auto (default STATCAN_BACKEND)")
+    parser.add_argument("--revision-months", type=int, default=DEFAULT_REVISION_MONTHS)
+    parser.add_argument("--warehouse", default=WAREHOUSE_URL,
+                        help="database URL to mirror the store into (default WAREHOUSE_URL)")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="export stage timings after each run (.prom: Prometheus text, else JSON lines)")
+    parser.add_argument("--catalog", action="store_true",
+                        help="rebuild the searchable vector catalog of every registered table on a new release")
+    args = parser.parse_args(argv)
+
+    configure_logging("ingest.log")
+    updater = IncrementalUpdater(backend=args.backend, revision_months=args.revision_months)
+    warehouse = get_warehouse_engine(args.warehouse) if args.warehouse else None
+    catalog = get_vector_catalog() if args.catalog else None
+    if args.metrics:
+        instr.enable()
+
+    if args.once:
+        return 1 if run_once(updater, args.full, warehouse, args.metrics, catalog)["errors"] else 0
+
+    while True:
+        next_run = time.monotonic() + args.interval
+        try:
+            run_once(updater, args.full, warehouse, args.metrics, catalog)
+        except Exception as e:
+            logging.exception(f"Ingestion run failed: {e}")
+            print(f"Ingestion run failed: {e}", file=sys.stderr)
+        try:
+            time.sleep(max(0.0, next_run - time.monotonic()))
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Timing spans and counters for the fetch and analysis pipeline.
+
+    from scraper import instrumentation as instr
+
+    with instr.span("download", pid=pid):
+        ...
+    instr.count("bytes_downloaded", size, pid=pid)
+
+Stages used across the code base: ``download``, ``unzip``, ``parse``,
+``filter``, ``coerce``, ``merge`` and ``analyze``; counters include
+``bytes_downloaded`` and ``table_cache`` (by ``result``: hit, revalidated,
+miss, stale).
+
+Collection is off unless ``STATCAN_INSTRUMENTATION=1`` is set or
+``enable()`` is called. While off, ``span`` hands back one shared no-op
+context manager and ``count`` returns at once, so the calls can stay in hot
+paths. Aggregates export as Prometheus text; the most recent raw events
+export as JSON lines.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+
+MAX_EVENTS = 10_000
+PROMETHEUS_PREFIX = "statcan"
+
+_NOOP = nullcontext()
+_enabled = os.environ.get("STATCAN_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+_lock = threading.Lock()
+_spans: dict[tuple, list] = {}       # (name, labels) -> [count, total seconds, max seconds, errors]
+_counters: dict[tuple, float] = {}   # (name, labels) -> value
+_events: deque = deque(maxlen=MAX_EVENTS)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _events.clear()
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Span:
+    __slots__ = ("name", "labels", "t0")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.t0
+        key = _key(self.name, self.labels)
+        with _lock:
+            agg = _spans.setdefault(key, [0, 0.0, 0.0, 0])
+            agg[0] += 1
+            agg[1] += elapsed
+            agg[2] = max(agg[2], elapsed)
+            agg[3] += exc_type is not None
+            _events.append({"ts": time.time(), "type": "span", "name": self.name, "labels": dict(key[1]),
+                            "seconds": round(elapsed, 6), "error": exc_type is not None})
+        return False
+
+
+def span(name: str, **labels):
+    """Context manager timing one stage; a shared no-op while collection is off."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, labels)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Add ``value`` to counter ``name``; does nothing while collection is off."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+        _events.append({"ts": time.time(), "type": "counter", "name": name, "labels": dict(key[1]),
+                        "value": value})
+
+
+def snapshot() -> dict[str, list[dict]]:
+    """Aggregated spans and counters as plain records."""
+    with _lock:
+        spans = [{"name": name, "labels": dict(labels), "count": c, "total_s": round(total, 6),
+                  "mean_s": round(total / c, 6) if c else 0.0, "max_s": round(mx, 6), "errors": err}
+                 for (name, labels), (c, total, mx, err) in sorted(_spans.items())]
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+    return {"spans": spans, "counters": counters}
+
+
+def events() -> list[dict]:
+    with _lock:
+        return list(_events)
+
+
+def to_jsonl() -> str:
+    """The recorded events, one JSON object per line."""
+    return "".join(json.dumps(e) + "\n" for e in events())
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                    for k, v in labels.items())
+    return "{" + body + "}"
+
+
+def prometheus_text(prefix: str = PROMETHEUS_PREFIX) -> str:
+    """Aggregates in the Prometheus text exposition format."""
+    snap = snapshot()
+    lines = [
+        f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+        f"# TYPE {prefix}_stage_seconds summary",
+    ]
+    for s in snap["spans"]:
+        labels = {"stage": s["name"], **s["labels"]}
+        lines.append(f"{prefix}_stage_seconds_sum{_labels(labels)} {s['total_s']}")
+        lines.append(f"{prefix}_stage_seconds_count{_labels(labels)} {s['count']}")
+    lines += [
+        f"# HELP {prefix}_stage_seconds_max Slowest single run per pipeline stage.",
+        f"# TYPE {prefix}_stage_seconds_max gauge",
+    ]
+    for s in snap["spans"]:
+        lines.append(f"{prefix}_stage_seconds_max{_labels({'stage': s['name'], **s['labels']})} {s['max_s']}")
+    for name in sorted({c["name"] for c in snap["counters"]}):
+        lines += [f"# TYPE {prefix}_{name}_total counter"]
+        for c in snap["counters"]:
+            if c["name"] == name:
+                lines.append(f"{prefix}_{name}_total{_labels(c['labels'])} {c['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path: Path | str) -> Path:
+    """Write Prometheus text to a ``.prom`` file, otherwise append JSON lines."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".prom":
+        tmp = path.with_suffix(".prom.tmp")
+        tmp.write_text(prometheus_text())
+        os.replace(tmp, path)
+    else:
+        with open(path, "a") as f:
+            f.write(to_jsonl())
+    return path
@@ -0,0 +1,226 @@
+"""Local stand-in for the StatCan table download and WDS endpoints.
+
+Serves ``<code>-eng.zip`` files from a fixtures directory under the same path
+layout as www150.statcan.gc.ca, with ETag / Last-Modified validators so the
+table cache can be exercised offline. Recorded WDS responses in
+``<fixtures>/wds/<vectorId>.json`` (see ``python -m scraper.wds record``) are
+replayed for the vector-level endpoints:
+
+    python -m scraper.mock_statcan data/fixtures --port 8765
+    STATCAN_BASE_URL=http://127.0.0.1:8765/n1/tbl/csv \
+    STATCAN_WDS_URL=http://127.0.0.1:8765/t1/wds/rest streamlit run app.py
+
+``--latency``/``--jitter`` delay every response and ``--failure-rate`` answers
+that share of requests with a ``503``, to see how clients cope with a slow
+or flaky upstream (``benchmarks/load.py`` drives both).
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+TABLE_PREFIX = "/n1/tbl/csv/"
+WDS_PREFIX = "/t1/wds/rest/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MockStatCanServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _table_file(self) -> Path | None:
+        if not self.path.startswith(TABLE_PREFIX):
+            return None
+        name = Path(self.path[len(TABLE_PREFIX):].split("?")[0]).name
+        path = self.server.fixtures_dir / name
+        return path if path.is_file() else None
+
+    def _inject(self) -> bool:
+        """Apply the configured latency; True when this request should fail instead."""
+        if self.server.inject():
+            self.send_error(503, "Injected failure")
+            return True
+        return False
+
+    def _serve_table(self, send_body: bool):
+        self.server.record(self.command, self.path)
+        if self._inject():
+            return
+        path = self._table_file()
+        if path is None:
+            self.send_error(404)
+            return
+
+        stat = path.stat()
+        etag = '"' + hashlib.md5(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest() + '"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        since = self.headers.get("If-Modified-Since")
+        if since and "If-None-Match" not in self.headers:
+            try:
+                if int(stat.st_mtime) <= parsedate_to_datetime(since).timestamp():
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+            except (TypeError, ValueError):
+                pass
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(stat.st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        if send_body:
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    self.wfile.write(chunk)
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_wds(self):
+        self.server.record(self.command, self.path)
+        if self._inject():
+            return
+        url = urlsplit(self.path)
+        endpoint = url.path[len(WDS_PREFIX):]
+        body = None
+        if self.command == "POST":
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+
+        if endpoint == "getDataFromVectorsAndLatestNPeriods":
+            self._send_json([self.server.wds_points(int(r["vectorId"]), latest_n=int(r["latestN"]))
+                             for r in body])
+        elif endpoint == "getBulkVectorDataByRange":
+            start, end = body["startDataPointReleaseDate"], body["endDataPointReleaseDate"]
+            self._send_json([self.server.wds_points(int(v), release_range=(start, end))
+                             for v in body["vectorIds"]])
+        elif endpoint == "getDataFromVectorByReferencePeriodRange":
+            query = parse_qs(url.query)
+            ids = [int(v.strip('"')) for v in query["vectorIds"][0].split(",")]
+            ref_range = (query["startRefPeriod"][0], query["endReferencePeriod"][0])
+            self._send_json([self.server.wds_points(v, ref_range=ref_range) for v in ids])
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        if self.path.startswith(WDS_PREFIX):
+            self._serve_wds()
+        else:
+            self._serve_table(send_body=True)
+
+    def do_POST(self):
+        if self.path.startswith(WDS_PREFIX):
+            self._serve_wds()
+        else:
+            self.send_error(405)
+
+    def do_HEAD(self):
+        self._serve_table(send_body=False)
+
+
+class MockStatCanServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixtures_dir: Path | str, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0, seed: int | None = None):
+        super().__init__((host, port), _Handler)
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = Counter()
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._requests_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def record(self, method: str, path: str) -> None:
+        with self._requests_lock:
+            self.requests[(method, path.split("?")[0])] += 1
+
+    def inject(self) -> bool:
+        """Sleep for the configured latency (plus up to ``jitter``); True when the request should fail."""
+        with self._requests_lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            self.failures += fail
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def wds_points(self, vector_id: int, latest_n: int | None = None,
+                   ref_range: tuple[str, str] | None = None,
+                   release_range: tuple[str, str] | None = None) -> dict:
+        path = self.fixtures_dir / "wds" / f"{vector_id}.json"
+        if not path.is_file():
+            return {"status": "FAILED", "object": f"Vector {vector_id} not found"}
+        item = json.loads(path.read_text())
+        points = item["object"]["vectorDataPoint"]
+        if ref_range:
+            points = [p for p in points if ref_range[0] <= p["refPer"] <= ref_range[1]]
+        if release_range:
+            points = [p for p in points if release_range[0] <= p["releaseTime"][:16] <= release_range[1]]
+        if latest_n is not None:
+            points = points[-latest_n:]
+        return {"status": "SUCCESS", "object": {**item["object"], "vectorDataPoint": points}}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{TABLE_PREFIX.rstrip('/')}"
+
+    @property
+    def wds_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{WDS_PREFIX.rstrip('/')}"
+
+    def start(self) -> "MockStatCanServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve StatCan table ZIP fixtures locally.")
+    parser.add_argument("fixtures_dir")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, at random")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    args = parser.parse_args()
+
+    server = MockStatCanServer(args.fixtures_dir, args.host, args.port, latency=args.latency,
+                               jitter=args.jitter, failure_rate=args.failure_rate)
+    print(f"Serving {args.fixtures_dir} at {server.base_url} and {server.wds_url}")
+    server.serve_forever()
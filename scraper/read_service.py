@@ -0,0 +1,348 @@
+"""Local HTTP read service over the series store for non-Streamlit consumers.
+
+Serves the registered series from the local series store (filled by
+``python -m scraper.ingest``), so any number of consumers share one
+ingestion and never touch StatCan:
+
+    python -m scraper.read_service --port 8780
+    curl 'http://127.0.0.1:8780/series?series=ippi,rmpi&start=2020-01&format=json'
+    curl 'http://127.0.0.1:8780/series/v1230995999?format=arrow' -o ippi.arrows
+    pd.read_parquet('http://127.0.0.1:8780/series?group=bcpi&format=parquet')
+
+Endpoints: ``/series`` (``series=`` registry keys or vectors, comma
+separated, or ``group=``; all registered series by default), ``/series/<key
+or vector>``, ``/registry`` and ``/version``. ``start``/``end`` take dates
+or period strings such as ``2020Q1``. ``format`` is ``json`` (default),
+``arrow`` (Arrow IPC stream) or ``parquet``, or is taken from the Accept
+header.
+
+Every response carries an ETag derived from the store ``VERSION``, the
+normalized query and the content encoding, so a client revalidating with ``If-None-Match`` gets a
+``304`` until the next ingestion run changes the data. Bodies are gzipped
+for clients that accept it (Parquet is compressed already), encoded bodies
+are kept in a small LRU per version, and concurrent identical requests
+wait for the first one instead of encoding the same body again.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from log_config import configure_logging
+from scraper import instrumentation as instr
+from scraper.dashboard import series_trackers
+from scraper.registry import Series, load_registry
+from scraper.series_store import SeriesStore, get_series_store
+from scraper.tracker import period_bound
+
+DEFAULT_PORT = int(os.environ.get("READ_SERVICE_PORT", 8780))
+MAX_CACHED_RESPONSES = int(os.environ.get("READ_SERVICE_CACHE_ENTRIES", 256))
+FORMATS = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Bodies smaller than this are not worth a gzip round.
+GZIP_MIN_BYTES = 1024
+_SCHEMA = pa.schema([
+    ("SERIES", pa.string()),
+    ("VECTOR", pa.string()),
+    ("REF_DATE", pa.timestamp("ns")),
+    ("PERIOD", pa.string()),
+    ("VALUE", pa.float64()),
+])
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class NotFound(KeyError):
+    pass
+
+
+def series_frame(trackers: dict[str, object], series: list[Series], start=None, end=None) -> pd.DataFrame:
+    """Long SERIES/VECTOR/REF_DATE/PERIOD/VALUE frame of ``series`` over [start, end]."""
+    frames = []
+    for s in series:
+        view = trackers[s.key].view(start, end)
+        frames.append(pd.DataFrame({
+            "SERIES": s.key,
+            "VECTOR": view["VECTOR"].astype(str).to_numpy(),
+            "REF_DATE": view.index.start_time,
+            "PERIOD": view.index.astype(str),
+            "VALUE": view["VALUE"].to_numpy(),
+        }))
+    if not frames:
+        return _SCHEMA.empty_table().to_pandas()
+    return pd.concat(frames, ignore_index=True)
+
+
+def encode(df: pd.DataFrame, fmt: str) -> bytes:
+    """``df`` as a JSON records array, an Arrow IPC stream or a Parquet file."""
+    if fmt == "json":
+        return df.to_json(orient="records", date_format="iso", date_unit="s").encode()
+    table = pa.Table.from_pandas(df, schema=_SCHEMA, preserve_index=False)
+    sink = io.BytesIO()
+    if fmt == "arrow":
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+
+class _Inflight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: tuple[bytes, bool] | None = None
+        self.error: Exception | None = None
+
+
+class SeriesReadService:
+    """Query resolution, encoding and response caching, independent of HTTP.
+
+    Trackers holding the full history of every registered series are
+    loaded once per store version; each query is a ``view`` slice of them.
+    """
+
+    def __init__(self, store: SeriesStore | None = None, max_cached: int = MAX_CACHED_RESPONSES):
+        self.store = store or get_series_store()
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._loaded: tuple[str | None, tuple[Series, ...], dict] | None = None
+        self._responses: OrderedDict[tuple, tuple[bytes, bool]] = OrderedDict()
+        self._inflight: dict[tuple, _Inflight] = {}
+
+    def version(self) -> str | None:
+        return self.store.version()
+
+    def trackers(self, version: str | None) -> tuple[tuple[Series, ...], dict]:
+        registry = load_registry()
+        with self._lock:
+            if self._loaded is None or self._loaded[:2] != (version, registry):
+                self._loaded = (version, registry, series_trackers(registry, self.store))
+                self._responses.clear()
+            return self._loaded[1], self._loaded[2]
+
+    def resolve(self, names: list[str], group: str | None = None) -> list[Series]:
+        registry = load_registry()
+        if group:
+            series = [s for s in registry if s.group == group]
+            if not series:
+                raise NotFound(f"No series in group {group!r}")
+        else:
+            series = list(registry)
+        if not names:
+            return series
+        by_name = {s.key: s for s in series} | {s.vector: s for s in series}
+        missing = [n for n in names if n not in by_name and n.lower() not in by_name]
+        if missing:
+            raise NotFound(f"Unknown series: {', '.join(missing)}")
+        return list(dict.fromkeys(by_name.get(n) or by_name[n.lower()] for n in names))
+
+    def bounds(self, series: list[Series], start, end) -> tuple[str | None, str | None]:
+        """``start``/``end`` as the periods they select at the finest frequency of ``series``.
+
+        Spellings of the same range (``2020-01``, ``2020-01-15``, a timestamp)
+        then share one cache entry and ETag.
+        """
+        freq = "M" if any(s.frequency == "monthly" for s in series) else "Q"
+        try:
+            return tuple(None if value is None else str(pd.Period(period_bound(value, freq, side), freq=freq))
+                         for value, side in ((start, "start"), (end, "end")))
+        except ValueError as e:
+            raise BadRequest(f"Bad date range: {e}") from e
+
+    def etag(self, version: str | None, query: tuple) -> str:
+        return '"' + hashlib.sha1(repr((version, query)).encode()).hexdigest()[:20] + '"'
+
+    def body(self, version: str | None, series: list[Series], start, end, fmt: str,
+             gzipped: bool) -> tuple[bytes, bool]:
+        """The encoded response for one query, built at most once per version at a time.
+
+        Returns the body and whether it is gzipped.
+        """
+        key = (version, tuple(s.key for s in series), start, end, fmt, gzipped)
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+                instr.count("read_service", result="hit")
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Inflight()
+        if not leader:
+            instr.count("read_service", result="coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        instr.count("read_service", result="miss")
+        try:
+            _, trackers = self.trackers(version)
+            with instr.span("encode", format=fmt):
+                try:
+                    data = encode(series_frame(trackers, series, start, end), fmt)
+                except ValueError as e:
+                    raise BadRequest(f"Bad date range: {e}") from e
+                compress = gzipped and fmt != "parquet" and len(data) >= GZIP_MIN_BYTES
+                result = (gzip.compress(data, compresslevel=6) if compress else data, compress)
+            flight.result = result
+            with self._lock:
+                self._responses[key] = result
+                while len(self._responses) > self.max_cached:
+                    self._responses.popitem(last=False)
+            return result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "SeriesReadServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: dict | None = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, payload, status: int = 200, headers: dict | None = None):
+        self._send(status, json.dumps(payload).encode(), headers=headers)
+
+    def _format(self, query: dict) -> str:
+        fmt = query.get("format", [None])[0]
+        if fmt is None:
+            accept = self.headers.get("Accept", "")
+            fmt = next((f for f, mime in FORMATS.items() if mime in accept), "json")
+        if fmt not in FORMATS:
+            raise BadRequest(f"format must be one of {', '.join(FORMATS)}")
+        return fmt
+
+    def _serve_series(self, names: list[str], query: dict):
+        service = self.server.service
+        version = service.version()
+        fmt = self._format(query)
+        series = service.resolve(names, query.get("group", [None])[0])
+        start, end = service.bounds(series, query.get("start", [None])[0], query.get("end", [None])[0])
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "") and fmt != "parquet"
+        # The gzipped and identity bodies are different representations, so different ETags.
+        etag = service.etag(version, (tuple(s.key for s in series), start, end, fmt, gzipped))
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept, Accept-Encoding",
+                   "X-Data-Version": version or ""}
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            instr.count("read_service", result="not_modified")
+            self._send(304, headers=headers)
+            return
+        body, compressed = service.body(version, series, start, end, fmt, gzipped)
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, body, FORMATS[fmt], headers)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/")
+        try:
+            if path == "/series":
+                names = [n.strip() for v in query.get("series", []) for n in v.split(",") if n.strip()]
+                self._serve_series(names, query)
+            elif path.startswith("/series/"):
+                self._serve_series([unquote(path[len("/series/"):])], query)
+            elif path == "/registry":
+                self._send_json([{"key": s.key, "label": s.label, "pid": s.pid, "vector": s.vector,
+                                  "frequency": s.frequency, "group": s.group, "description": s.description}
+                                 for s in load_registry()])
+            elif path == "/version":
+                self._send_json({"version": self.server.service.version()})
+            else:
+                self._send_json({"error": "not found"}, 404)
+        except NotFound as e:
+            self._send_json({"error": e.args[0]}, 404)
+        except BadRequest as e:
+            self._send_json({"error": str(e)}, 400)
+        except Exception as e:
+            logging.exception(f"Error serving {self.path}: {e}")
+            self._send_json({"error": "internal error"}, 500)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+
+class SeriesReadServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, service: SeriesReadService | None = None):
+        super().__init__((host, port), _Handler)
+        self.service = service or SeriesReadService()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SeriesReadServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the local series store over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    configure_logging("read_service.log")
+    server = SeriesReadServer(args.host, args.port)
+    print(f"Serving the series store (version {server.service.version()}) at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+DEFAULT_REGISTRY_PATH = Path(os.environ.get(
+    "SERIES_REGISTRY", Path(__file__).resolve().parent.parent / "series.yaml"
+))
+FREQUENCIES = ("monthly", "quarterly")
+_REQUIRED = ("key", "label", "pid", "vector", "frequency", "group")
+
+
+@dataclass(frozen=True)
+class Series:
+    key: str
+    label: str
+    pid: str
+    vector: str
+    frequency: str
+    group: str
+    color: str | None = None
+    description: str = ""
+
+    def tracker(self, backend=None):
+        """The tracker that shapes this series for its page (default backend unless given)."""
+        # Imported here: the trackers pull in the whole fetch stack.
+        if self.frequency == "quarterly":
+            from scraper.bcpi_scraper import BCPITracker
+            return BCPITracker(pid=self.pid, target_vectors=[self.vector], backend=backend)
+        from scraper.statcan_scraper import IndexTracker
+        return IndexTracker(pid=self.pid, target_product=self.vector, backend=backend)
+
+
+def parse_registry(entries: list[dict]) -> tuple[Series, ...]:
+    series, seen = [], set()
+    for i, entry in enumerate(entries):
+        missing = [f for f in _REQUIRED if not entry.get(f)]
+        if missing:
+            raise ValueError(f"Series entry {i} is missing {', '.join(missing)}")
+        if entry["frequency"] not in FREQUENCIES:
+            raise ValueError(f"Series {entry['key']}: frequency must be one of {FREQUENCIES}")
+        if entry["key"] in seen:
+            raise ValueError(f"Duplicate series key: {entry['key']}")
+        seen.add(entry["key"])
+        series.append(Series(
+            key=str(entry["key"]),
+            label=str(entry["label"]),
+            pid=str(entry["pid"]),
+            vector=str(entry["vector"]).strip().lower(),
+            frequency=entry["frequency"],
+            group=str(entry["group"]),
+            color=entry.get("color"),
+            description=entry.get("description", ""),
+        ))
+    return tuple(series)
+
+
+@lru_cache(maxsize=None)
+def _load(path: Path, mtime_ns: int) -> tuple[Series, ...]:
+    with open(path) as f:
+        return parse_registry((yaml.safe_load(f) or {}).get("series", []))
+
+
+def load_registry(path: Path | str = DEFAULT_REGISTRY_PATH) -> tuple[Series, ...]:
+    """Parsed registry, re-read only when the file changes."""
+    path = Path(path)
+    return _load(path, path.stat().st_mtime_ns)
+
+
+def series_in_group(group: str, path: Path | str = DEFAULT_REGISTRY_PATH) -> list[Series]:
+    return [s for s in load_registry(path) if s.group == group]
+
+
+def registry_requests(series: list[Series] | None = None) -> list[tuple[str, str]]:
+    """(PID, vector) pairs for ``series`` (default: the whole registry)."""
+    return [(s.pid, s.vector) for s in (series if series is not None else load_registry())]
+
+
+def common_freq(series: list[Series]) -> str:
+    """Finest frequency every series can be aggregated to: quarterly as soon as one is."""
+    return "Q" if any(s.frequency == "quarterly" for s in series) else "M"
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scraper import instrumentation as instr
+
+DEFAULT_SERIES_DIR = Path(os.environ.get(
+    "SERIES_STORE_DIR", Path(__file__).resolve().parent.parent / "data" / "series"
+))
+STORE_COLUMNS = ["VECTOR", "REF_DATE", "VALUE", "RELEASE_TIME"]
+_SCHEMA = pa.schema([
+    ("VECTOR", pa.string()),
+    ("REF_DATE", pa.timestamp("ns")),
+    ("VALUE", pa.float64()),
+    ("RELEASE_TIME", pa.timestamp("ns")),
+])
+
+
+class SeriesStore:
+    """Local per-vector store of observations, updated by upsert.
+
+    Each vector lives in ``<root>/<vector>.parquet`` so an update rewrites
+    only the series it touches. ``state.json`` keeps, per vector, the last
+    reference period and release time seen plus the upstream table version;
+    ``VERSION`` changes whenever any observation does, so readers can key
+    caches on it.
+    """
+
+    def __init__(self, root: Path | str = DEFAULT_SERIES_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _path(self, vector: str) -> Path:
+        return self.root / f"{vector}.parquet"
+
+    @property
+    def _state_path(self) -> Path:
+        return self.root / "state.json"
+
+    @property
+    def _version_path(self) -> Path:
+        return self.root / "VERSION"
+
+    def version(self) -> str | None:
+        try:
+            return self._version_path.read_text().strip()
+        except OSError:
+            return None
+
+    def state(self) -> dict[str, dict]:
+        try:
+            return json.loads(self._state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+        os.replace(tmp, self._state_path)
+
+    def update_state(self, vector: str, **fields) -> None:
+        with self._lock:
+            state = self.state()
+            state.setdefault(vector, {}).update(fields)
+            self._write_state(state)
+
+    def vectors(self) -> list[str]:
+        return sorted(p.stem for p in self.root.glob("v*.parquet"))
+
+    def _read_vector(self, vector: str) -> pd.DataFrame:
+        path = self._path(vector)
+        if not path.exists():
+            return _SCHEMA.empty_table().to_pandas()
+        return pq.read_table(path).to_pandas()
+
+    def read(self, vectors: list[str], start: pd.Timestamp | None = None,
+             end: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Long VECTOR/REF_DATE/VALUE/RELEASE_TIME frame for ``vectors``, sorted."""
+        frames = []
+        with instr.span("filter", source="series_store"):
+            for vector in vectors:
+                path = self._path(vector.strip().lower())
+                if not path.exists():
+                    continue
+                filters = []
+                if start is not None:
+                    filters.append(("REF_DATE", ">=", pd.Timestamp(start)))
+                if end is not None:
+                    filters.append(("REF_DATE", "<=", pd.Timestamp(end)))
+                frames.append(pq.read_table(path, filters=filters or None).to_pandas())
+        if not frames:
+            return _SCHEMA.empty_table().to_pandas()
+        return pd.concat(frames, ignore_index=True)
+
+    def upsert(self, df: pd.DataFrame, changes: list[pd.DataFrame] | None = None) -> dict[str, int]:
+        """Insert new periods and overwrite revised values; returns row counts.
+
+        ``df`` is a long frame with VECTOR, REF_DATE and VALUE (RELEASE_TIME
+        optional). Rows identical to what is stored are ignored, so a
+        re-fetched revision window costs no write unless something changed.
+        The new and revised rows, as stored, are appended to ``changes``.
+        """
+        inserted = revised = 0
+        if df.empty:
+            return {"inserted": 0, "revised": 0}
+        df = df.copy()
+        if "RELEASE_TIME" not in df.columns:
+            df["RELEASE_TIME"] = pd.NaT
+        df = df[STORE_COLUMNS].dropna(subset=["REF_DATE"])
+        df["VECTOR"] = df["VECTOR"].str.lower()
+
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            for vector, new in df.groupby("VECTOR"):
+                old = self._read_vector(vector)
+                merged = old.merge(new, on=["VECTOR", "REF_DATE"], how="outer",
+                                   suffixes=("_old", ""), indicator=True)
+                is_new = merged["_merge"] == "right_only"
+                is_revised = (merged["_merge"] == "both") & ~(
+                    (merged["VALUE"] == merged["VALUE_old"])
+                    | (merged["VALUE"].isna() & merged["VALUE_old"].isna())
+                )
+                keep_old = merged["_merge"] == "left_only"
+                merged.loc[keep_old, "VALUE"] = merged.loc[keep_old, "VALUE_old"]
+                merged.loc[keep_old, "RELEASE_TIME"] = merged.loc[keep_old, "RELEASE_TIME_old"]
+                unchanged = (merged["_merge"] == "both") & ~is_revised
+                merged.loc[unchanged, "RELEASE_TIME"] = merged.loc[unchanged, "RELEASE_TIME_old"]
+
+                n_new, n_rev = int(is_new.sum()), int(is_revised.sum())
+                if n_new or n_rev:
+                    if changes is not None:
+                        changes.append(merged.loc[is_new | is_revised, STORE_COLUMNS])
+                    out = merged[STORE_COLUMNS].sort_values("REF_DATE", ignore_index=True)
+                    tmp = self._path(vector).with_suffix(".parquet.part")
+                    pq.write_table(pa.Table.from_pandas(out, schema=_SCHEMA, preserve_index=False), tmp)
+                    os.replace(tmp, self._path(vector))
+                inserted += n_new
+                revised += n_rev
+                logging.info(f"Upserted {vector}: {n_new} new, {n_rev} revised")
+
+            if inserted or revised:
+                self._version_path.write_text(
+                    f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}\n"
+                )
+        return {"inserted": inserted, "revised": revised}
+
+
+_default_series_store: SeriesStore | None = None
+
+
+def get_series_store() -> SeriesStore:
+    global _default_series_store
+    if _default_series_store is None:
+        _default_series_store = SeriesStore()
+    return _default_series_store
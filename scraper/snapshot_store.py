@@ -0,0 +1,186 @@
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_SNAPSHOT_DIR = Path(os.environ.get(
+    "SNAPSHOT_STORE_DIR", Path(__file__).resolve().parent.parent / "data" / "snapshots"
+))
+SNAPSHOT_COLUMNS = ["VECTOR", "REF_DATE", "VALUE", "RELEASE"]
+_PART_SCHEMA = pa.schema([
+    ("REF_DATE", pa.timestamp("ns")),
+    ("VALUE", pa.float64()),
+    ("RELEASE", pa.timestamp("ns")),
+])
+_RELEASE_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+def _release(value) -> pd.Timestamp:
+    """``value`` as a naive UTC timestamp, the form releases are stored in."""
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo else ts
+
+
+def _same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+
+class SnapshotStore:
+    """Append-only history of every value each release published, per vector.
+
+    A release writes ``<root>/<vector>/<release>.parquet`` holding only the
+    observations that are new or differ from what the vector looked like
+    before it, so a history costs its first load plus the revisions, not a
+    full copy per release. Part files are never rewritten. Reading "as of"
+    a release replays the parts up to it; the replayed history of each
+    vector is kept in memory until a new part lands.
+
+    A "release" here is the time a value was recorded, i.e. the ingestion
+    run that first saw it, not StatCan's publication time (the series
+    store's RELEASE_TIME). Values published between two runs share the
+    later run's release.
+    """
+
+    def __init__(self, root: Path | str = DEFAULT_SNAPSHOT_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._histories: dict[str, tuple[tuple[str, ...], pd.DataFrame]] = {}
+
+    def _dir(self, vector: str) -> Path:
+        return self.root / vector
+
+    def _parts(self, vector: str) -> tuple[str, ...]:
+        try:
+            return tuple(sorted(n for n in os.listdir(self._dir(vector)) if n.endswith(".parquet")))
+        except FileNotFoundError:
+            return ()
+
+    def vectors(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and self._parts(p.name))
+
+    def releases(self, vector: str | None = None) -> list[pd.Timestamp]:
+        """Release times that changed ``vector`` (any vector by default), oldest first."""
+        vectors = [vector.strip().lower()] if vector else self.vectors()
+        names = {name for v in vectors for name in self._parts(v)}
+        return [pd.Timestamp(datetime.strptime(n.removesuffix(".parquet"), _RELEASE_FORMAT)) for n in sorted(names)]
+
+    def history(self, vector: str) -> pd.DataFrame:
+        """Every REF_DATE/VALUE/RELEASE row ever recorded for ``vector``, by REF_DATE then RELEASE."""
+        vector = vector.strip().lower()
+        parts = self._parts(vector)
+        cached = self._histories.get(vector)
+        if cached is not None and cached[0] == parts:
+            return cached[1]
+        if parts:
+            table = pa.concat_tables([pq.read_table(self._dir(vector) / name) for name in parts])
+            frame = table.to_pandas().sort_values(["REF_DATE", "RELEASE"], kind="stable", ignore_index=True)
+        else:
+            frame = _PART_SCHEMA.empty_table().to_pandas()
+        self._histories[vector] = (parts, frame)
+        return frame
+
+    def _as_of(self, vector: str, release: pd.Timestamp | None) -> pd.DataFrame:
+        history = self.history(vector)
+        if release is not None:
+            history = history[history["RELEASE"].to_numpy() <= np.datetime64(_release(release), "ns")]
+        ref = history["REF_DATE"].to_numpy()
+        # Sorted by REF_DATE then RELEASE: the last row of each period is its latest value.
+        last = np.append(ref[1:] != ref[:-1], True) if len(ref) else np.zeros(0, dtype=bool)
+        return history[last]
+
+    def as_of(self, vectors: list[str], release=None, start: pd.Timestamp | None = None,
+              end: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Long VECTOR/REF_DATE/VALUE/RELEASE frame of ``vectors`` as known at ``release``.
+
+        ``release`` is any timestamp (UTC when naive); None means the latest
+        values. RELEASE is when an ingestion run first recorded each value,
+        so this is what the ingestion job had seen by ``release``, not what
+        StatCan had published by then.
+        """
+        frames = []
+        for vector in vectors:
+            vector = vector.strip().lower()
+            frame = self._as_of(vector, release)
+            if start is not None:
+                frame = frame[frame["REF_DATE"] >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame["REF_DATE"] <= pd.Timestamp(end)]
+            frames.append(frame.assign(VECTOR=vector))
+        if not frames:
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[SNAPSHOT_COLUMNS]
+
+    def diff(self, vector: str, before, after=None) -> pd.DataFrame:
+        """Periods of ``vector`` whose value differs between two releases.
+
+        Indexed by REF_DATE with the value ``before`` and ``after`` (latest
+        by default), the change, and the release (ingestion run) that
+        recorded it. Periods first recorded in between have a NaN ``before``.
+        """
+        old = self._as_of(vector, before).set_index("REF_DATE")
+        new = self._as_of(vector, after).set_index("REF_DATE")
+        joined = old[["VALUE"]].join(new[["VALUE", "RELEASE"]], how="right", lsuffix="_before")
+        joined.columns = ["before", "after", "release"]
+        changed = ~joined.index.isin(old.index) | ~_same(joined["before"].to_numpy(), joined["after"].to_numpy())
+        out = joined[changed]
+        return out.assign(change=out["after"] - out["before"])[["before", "after", "change", "release"]]
+
+    def revisions(self, vector: str) -> pd.DataFrame:
+        """Every revised period of ``vector``: first and latest value and how often it changed."""
+        history = self.history(vector)
+        out = pd.DataFrame({
+            "first": history.drop_duplicates("REF_DATE", keep="first").set_index("REF_DATE")["VALUE"],
+            "latest": history.drop_duplicates("REF_DATE", keep="last").set_index("REF_DATE")["VALUE"],
+            "revisions": history.groupby("REF_DATE").size() - 1,
+        })
+        out = out[out["revisions"] > 0]
+        return out.assign(change=out["latest"] - out["first"])
+
+    def record(self, df: pd.DataFrame, release=None) -> dict[str, int]:
+        """Append the rows of ``df`` that change what is known; returns rows written per vector.
+
+        ``df`` is a long VECTOR/REF_DATE/VALUE frame, e.g. a fetch or a
+        ``SeriesStore.read``. Rows equal to the latest recorded value are
+        dropped, so recording the same data twice writes nothing.
+        """
+        release = _release(release if release is not None else datetime.now(timezone.utc))
+        written = {}
+        if df.empty:
+            return written
+        df = df.dropna(subset=["REF_DATE"])
+        with self._lock:
+            for vector, new in df.groupby(df["VECTOR"].str.lower(), sort=True):
+                new = new.drop_duplicates("REF_DATE", keep="last").set_index("REF_DATE")["VALUE"].astype("float64")
+                known = self._as_of(vector, None).set_index("REF_DATE")["VALUE"]
+                changed = new[~new.index.isin(known.index)
+                              | ~_same(new.to_numpy(), known.reindex(new.index).to_numpy())]
+                if changed.empty:
+                    continue
+                part = pd.DataFrame({"REF_DATE": changed.index, "VALUE": changed.to_numpy(), "RELEASE": release})
+                path = self._dir(vector) / f"{release.strftime(_RELEASE_FORMAT)}.parquet"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".parquet.part")
+                pq.write_table(pa.Table.from_pandas(part.sort_values("REF_DATE"), schema=_PART_SCHEMA,
+                                                    preserve_index=False), tmp, compression="zstd")
+                os.replace(tmp, path)
+                written[vector] = len(part)
+                logging.info(f"Snapshot of {vector} at {release}: {len(part)} new or revised rows")
+        return written
+
+
+_default_snapshot_store: SnapshotStore | None = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _default_snapshot_store
+    if _default_snapshot_store is None:
+        _default_snapshot_store = SnapshotStore()
+    return _default_snapshot_store
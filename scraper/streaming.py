@@ -0,0 +1,109 @@
+import logging
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import IO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import requests
+
+from scraper import instrumentation as instr
+from scraper.http_session import get_session, host_slot
+from scraper.table_cache import STATCAN_BASE_URL, get_table_cache, table_zip_url
+
+STREAM_COLUMNS = ["REF_DATE", "VECTOR", "VALUE"]
+# Peak memory is roughly one CSV block plus the matching rows, whatever the table size.
+# The reader runs single-threaded: the threaded reader reads ahead one block per core.
+BLOCK_SIZE = 1024 * 1024
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DOWNLOAD_CHUNK = 1024 * 1024
+
+
+def spool_table_zip(pid: str, base_url: str = STATCAN_BASE_URL, timeout: int = 30) -> IO[bytes]:
+    """Stream the table ZIP into a spooled temp file (rolls over to disk past 8 MB)."""
+    url = table_zip_url(pid, base_url)
+    logging.info(f"Streaming StatsCan table from {url}")
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    size = 0
+    try:
+        with (instr.span("download", source="stream"), host_slot(url),
+              get_session().get(url, timeout=timeout, stream=True) as resp):
+            resp.raise_for_status()
+            for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                spool.write(chunk)
+                size += len(chunk)
+    except Exception:
+        spool.close()
+        raise
+    instr.count("bytes_downloaded", size, source="stream")
+    spool.seek(0)
+    return spool
+
+
+def filter_table_zip(source: Path | IO[bytes], vectors: list[str],
+                     block_size: int = BLOCK_SIZE) -> pd.DataFrame:
+    """Scan a table ZIP block by block, keeping only the rows of ``vectors``.
+
+    Only REF_DATE/VECTOR/VALUE are decoded; every block is filtered before the
+    next one is read, so the full table is never materialised.
+    """
+    targets = pa.array([v.strip().lower() for v in vectors])
+    matched = []
+    with zipfile.ZipFile(source) as z:
+        with instr.span("unzip", reader="stream"):
+            csv_name = next(
+                (n for n in z.namelist() if n.lower().endswith(".csv") and "metadata" not in n.lower()),
+                None,
+            )
+        if not csv_name:
+            logging.warning("No CSV file found in ZIP")
+            return pd.DataFrame(columns=STREAM_COLUMNS)
+        with instr.span("filter", source="stream"), z.open(csv_name) as f:
+            reader = pacsv.open_csv(
+                f,
+                read_options=pacsv.ReadOptions(block_size=block_size, use_threads=False),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=STREAM_COLUMNS,
+                    column_types={"REF_DATE": pa.string(), "VECTOR": pa.string(), "VALUE": pa.float64()},
+                ),
+            )
+            for batch in reader:
+                mask = pc.is_in(pc.utf8_lower(batch.column("VECTOR")), value_set=targets)
+                if pc.any(mask).as_py():
+                    matched.append(batch.filter(mask))
+
+    if not matched:
+        return pd.DataFrame(columns=STREAM_COLUMNS)
+    with instr.span("coerce", reader="stream"):
+        df = pa.Table.from_batches(matched).to_pandas()
+        df["VECTOR"] = df["VECTOR"].str.lower()
+        df["REF_DATE"] = pd.to_datetime(df["REF_DATE"], errors="coerce")
+    return df
+
+
+def fetch_vectors_streaming(pid: str, vectors: list[str], use_cache: bool = True) -> pd.DataFrame:
+    """Fetch ``vectors`` from table ``pid`` with bounded memory.
+
+    With ``use_cache`` the ZIP comes from the on-disk table cache (already
+    streamed to disk); otherwise it is streamed into a spooled temp file that
+    is discarded after the scan.
+    """
+    if use_cache:
+        zip_path = get_table_cache().get(pid)
+        if zip_path is None:
+            return pd.DataFrame(columns=STREAM_COLUMNS)
+        df = filter_table_zip(zip_path, vectors)
+    else:
+        try:
+            spool = spool_table_zip(pid)
+        except requests.RequestException as e:
+            logging.error(f"Download failed for PID {pid}: {e}")
+            return pd.DataFrame(columns=STREAM_COLUMNS)
+        with spool:
+            df = filter_table_zip(spool, vectors)
+
+    logging.info(f"Streamed PID {pid}: {len(df)} rows for {len(vectors)} vectors")
+    return df
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import threading
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import requests
+
+from scraper import instrumentation as instr
+from scraper.http_session import get_session, host_slot
+
+STATCAN_BASE_URL = os.environ.get("STATCAN_BASE_URL", "https://www150.statcan.gc.ca/n1/tbl/csv")
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "TABLE_CACHE_DIR", Path(__file__).resolve().parent.parent / "data" / "cache"
+))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# StatCan publishes through The Daily at 08:30 Eastern on business days,
+# so a cached table cannot change before the next release slot.
+RELEASE_TZ = ZoneInfo("America/Toronto")
+RELEASE_HOUR, RELEASE_MINUTE = 8, 30
+
+
+def table_code(pid: str) -> str:
+    return pid[:-2]
+
+
+def table_zip_url(pid: str, base_url: str = STATCAN_BASE_URL) -> str:
+    return f"{base_url.rstrip('/')}/{table_code(pid)}-eng.zip"
+
+
+def next_release(after: datetime) -> datetime:
+    local = after.astimezone(RELEASE_TZ)
+    release = local.replace(hour=RELEASE_HOUR, minute=RELEASE_MINUTE, second=0, microsecond=0)
+    if release <= local:
+        release += timedelta(days=1)
+    while release.weekday() >= 5:
+        release += timedelta(days=1)
+    return release.astimezone(timezone.utc)
+
+
+def read_table_csv(zip_path: Path, **read_csv_kwargs) -> pd.DataFrame:
+    with zipfile.ZipFile(zip_path) as z:
+        with instr.span("unzip", reader="pandas"):
+            csv_name = next(
+                (n for n in z.namelist() if n.lower().endswith(".csv") and "metadata" not in n.lower()),
+                None,
+            )
+        if not csv_name:
+            logging.warning(f"No CSV file found in {zip_path}")
+            return pd.DataFrame()
+        with instr.span("parse", reader="pandas"), z.open(csv_name) as f:
+            return pd.read_csv(f, **read_csv_kwargs)
+
+
+class TableCache:
+    """On-disk cache of StatCan full-table ZIPs, keyed by PID.
+
+    Each entry lives in ``<root>/<pid>/`` as ``table.zip`` plus ``meta.json``
+    holding the validators (ETag / Last-Modified) and the expiry time. A fresh
+    entry is served without touching the network; a stale one is revalidated
+    with a conditional GET, which costs a single 304 when nothing changed.
+    The ZIP's mtime records when the entry was last used, so a hit costs one
+    metadata read and a touch, and LRU eviction (only after a download)
+    needs no metadata at all.
+    """
+
+    def __init__(self, root: Path | str = DEFAULT_CACHE_DIR, base_url: str = STATCAN_BASE_URL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, timeout: int = 30):
+        self.root = Path(root)
+        self.base_url = base_url
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, pid: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(pid, threading.Lock())
+
+    def _entry_dir(self, pid: str) -> Path:
+        return self.root / pid
+
+    def _read_meta(self, pid: str) -> dict | None:
+        meta_path = self._entry_dir(pid) / "meta.json"
+        zip_path = self._entry_dir(pid) / "table.zip"
+        if not meta_path.exists() or not zip_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable cache metadata for PID {pid}: {e}")
+            return None
+
+    def _write_meta(self, pid: str, meta: dict) -> None:
+        meta_path = self._entry_dir(pid) / "meta.json"
+        tmp = meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, meta_path)
+
+    def meta(self, pid: str) -> dict | None:
+        return self._read_meta(pid)
+
+    def version(self, pid: str) -> str | None:
+        meta = self._read_meta(pid)
+        return meta["version"] if meta else None
+
+    def get(self, pid: str, force: bool = False) -> Path | None:
+        """Return the path of an up-to-date ZIP for ``pid``, or None if unavailable."""
+        with self._lock(pid):
+            path, downloaded = self._get_locked(pid, force)
+        if downloaded:
+            self.evict(keep=pid)
+        return path
+
+    def _get_locked(self, pid: str, force: bool) -> tuple[Path | None, bool]:
+        """The entry's ZIP path (None if unavailable) and whether it was just downloaded."""
+        entry = self._entry_dir(pid)
+        zip_path = entry / "table.zip"
+        meta = self._read_meta(pid)
+        now = datetime.now(timezone.utc)
+
+        if meta and not force and now < datetime.fromisoformat(meta["expires_at"]):
+            logging.info(f"Table cache hit for PID {pid}")
+            instr.count("table_cache", result="hit")
+            os.utime(zip_path)
+            return zip_path, False
+
+        url = table_zip_url(pid, self.base_url)
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        logging.info(f"Revalidating PID {pid} from {url}" if headers else f"Downloading PID {pid} from {url}")
+        try:
+            with instr.span("download", source="table"), host_slot(url):
+                resp = get_session().get(url, headers=headers, timeout=self.timeout, stream=True)
+                if resp.status_code == 304 and meta:
+                    resp.close()
+                    logging.info(f"Table cache revalidated (304) for PID {pid}")
+                    instr.count("table_cache", result="revalidated")
+                    meta.update(checked_at=now.isoformat(), expires_at=next_release(now).isoformat())
+                    self._write_meta(pid, meta)
+                    os.utime(zip_path)
+                    return zip_path, False
+                resp.raise_for_status()
+
+                entry.mkdir(parents=True, exist_ok=True)
+                tmp_path = entry / "table.zip.part"
+                size = 0
+                with resp, open(tmp_path, "wb") as out:
+                    for chunk in resp.iter_content(chunk_size=1 << 20):
+                        out.write(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, zip_path)
+        except requests.RequestException as e:
+            if meta:
+                logging.warning(f"Revalidation failed for PID {pid}, serving stale copy: {e}")
+                instr.count("table_cache", result="stale")
+                return zip_path, False
+            logging.error(f"Download failed for PID {pid}: {e}")
+            return None, False
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        meta = {
+            "pid": pid,
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "version": etag or last_modified or now.isoformat(),
+            "size": size,
+            "fetched_at": now.isoformat(),
+            "checked_at": now.isoformat(),
+            "expires_at": next_release(now).isoformat(),
+        }
+        self._write_meta(pid, meta)
+        instr.count("table_cache", result="miss")
+        instr.count("bytes_downloaded", size, source="table")
+        logging.info(f"Cached PID {pid}: {size} bytes")
+        return zip_path, True
+
+    def invalidate(self, pid: str) -> None:
+        with self._lock(pid):
+            entry = self._entry_dir(pid)
+            for name in ("table.zip", "meta.json"):
+                (entry / name).unlink(missing_ok=True)
+            if entry.exists() and not any(entry.iterdir()):
+                entry.rmdir()
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """Drop least-recently-used entries (oldest ZIP mtime) until the cache fits in ``max_bytes``."""
+        if not self.root.exists():
+            return []
+        entries = []
+        for entry in self.root.iterdir():
+            try:
+                stat = (entry / "table.zip").stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, entry.name, stat.st_size))
+
+        total = sum(size for _, _, size in entries)
+        evicted = []
+        for _, pid, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if pid == keep:
+                continue
+            self.invalidate(pid)
+            total -= size
+            evicted.append(pid)
+            logging.info(f"Evicted PID {pid} from table cache ({size} bytes)")
+        return evicted
+
+
+_default_cache: TableCache | None = None
+
+
+def get_table_cache() -> TableCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TableCache()
+    return _default_cache
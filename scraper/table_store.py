@@ -0,0 +1,172 @@
+import csv
+import json
+import logging
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from scraper import instrumentation as instr
+from scraper.table_cache import TableCache, get_table_cache
+
+DEFAULT_STORE_DIR = Path(os.environ.get(
+    "TABLE_STORE_DIR", Path(__file__).resolve().parent.parent / "data" / "store"
+))
+
+# Rows are sorted by VECTOR then REF_DATE, so small row groups give tight
+# min/max statistics and a vector lookup only decodes the groups that hold it.
+ROW_GROUP_SIZE = 32_768
+SERIES_COLUMNS = ["REF_DATE", "VECTOR", "VALUE"]
+NUMERIC_COLUMNS = {"VALUE": pa.float64(), "DECIMALS": pa.int32()}
+
+
+def _csv_header(z: zipfile.ZipFile, csv_name: str) -> list[str]:
+    with z.open(csv_name) as f:
+        line = f.readline().decode("utf-8-sig")
+    return next(csv.reader([line]))
+
+
+def _parse_ref_dates(ref: pa.ChunkedArray) -> pa.Array:
+    # REF_DATE has a handful of distinct values (one per period), so parse the
+    # dictionary once rather than every row.
+    encoded = ref.combine_chunks().dictionary_encode()
+    parsed = pd.to_datetime(pd.Series(encoded.dictionary.to_pylist()), errors="coerce")
+    dictionary = pa.array(parsed, type=pa.timestamp("ns"))
+    return dictionary.take(encoded.indices)
+
+
+def convert_table_zip(zip_path: Path, out_path: Path) -> int:
+    """Convert a StatCan table ZIP into a typed Parquet file sorted by VECTOR."""
+    with zipfile.ZipFile(zip_path) as z:
+        with instr.span("unzip", reader="arrow"):
+            csv_name = next(
+                (n for n in z.namelist() if n.lower().endswith(".csv") and "metadata" not in n.lower()),
+                None,
+            )
+            if not csv_name:
+                raise ValueError(f"No CSV file found in {zip_path}")
+            columns = _csv_header(z, csv_name)
+        column_types = {c: NUMERIC_COLUMNS.get(c, pa.string()) for c in columns}
+        with instr.span("parse", reader="arrow"), z.open(csv_name) as f:
+            table = pacsv.read_csv(
+                f,
+                read_options=pacsv.ReadOptions(use_threads=True),
+                convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+            )
+
+    if "VECTOR" not in table.column_names:
+        raise ValueError(f"VECTOR column not found in {zip_path}")
+
+    with instr.span("coerce", reader="arrow"):
+        arrays, fields = [], []
+        for name in table.column_names:
+            col = table[name]
+            if name == "REF_DATE":
+                col = _parse_ref_dates(col)
+            elif name == "VECTOR":
+                col = pc.utf8_lower(col.combine_chunks())
+            elif pa.types.is_string(col.type):
+                # Dimension columns repeat a few members across every row.
+                col = col.combine_chunks().dictionary_encode()
+            arrays.append(col)
+            fields.append(pa.field(name, col.type))
+        table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+        table = table.sort_by([("VECTOR", "ascending"), ("REF_DATE", "ascending")])
+
+    tmp_path = out_path.with_suffix(".parquet.part")
+    with instr.span("write", target="parquet"):
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE, compression="zstd",
+                       write_statistics=True)
+    os.replace(tmp_path, out_path)
+    return table.num_rows
+
+
+class TableStore:
+    """Columnar Parquet copies of cached StatCan tables.
+
+    Each table is converted once per upstream version (as reported by the
+    ``TableCache``) into ``<root>/<pid>/table.parquet``. Reads push the VECTOR
+    and date predicates down to the row-group statistics and only decode the
+    requested columns.
+    """
+
+    def __init__(self, root: Path | str = DEFAULT_STORE_DIR, cache: TableCache | None = None):
+        self.root = Path(root)
+        self.cache = cache or get_table_cache()
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, pid: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(pid, threading.Lock())
+
+    def table_path(self, pid: str) -> Path:
+        return self.root / pid / "table.parquet"
+
+    def _meta_path(self, pid: str) -> Path:
+        return self.root / pid / "meta.json"
+
+    def version(self, pid: str) -> str | None:
+        try:
+            return json.loads(self._meta_path(pid).read_text())["source_version"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def ensure(self, pid: str) -> Path | None:
+        """Make sure the Parquet copy of ``pid`` matches the cached ZIP."""
+        zip_path = self.cache.get(pid)
+        out_path = self.table_path(pid)
+        if zip_path is None:
+            # Fall back to whatever was converted last, if anything.
+            return out_path if out_path.exists() else None
+
+        source_version = self.cache.version(pid)
+        with self._lock(pid):
+            if out_path.exists() and self.version(pid) == source_version:
+                return out_path
+
+            logging.info(f"Converting PID {pid} to Parquet (source version {source_version})")
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                rows = convert_table_zip(zip_path, out_path)
+            except Exception as e:
+                logging.error(f"Error converting PID {pid} to Parquet: {e}")
+                return out_path if out_path.exists() else None
+            self._meta_path(pid).write_text(json.dumps(
+                {"pid": pid, "source_version": source_version, "rows": rows}, indent=2
+            ))
+            logging.info(f"Stored PID {pid} as Parquet: {rows} rows")
+        return out_path
+
+    def read(self, pid: str, vectors: list[str], columns: list[str] | None = None,
+             start: pd.Timestamp | None = None, end: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Read the rows of ``vectors`` (exact, case-insensitive) from table ``pid``."""
+        path = self.ensure(pid)
+        if path is None:
+            return pd.DataFrame()
+
+        filters = [("VECTOR", "in", [v.strip().lower() for v in vectors])]
+        if start is not None:
+            filters.append(("REF_DATE", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("REF_DATE", "<=", pd.Timestamp(end)))
+
+        with instr.span("filter", source="parquet"):
+            table = pq.read_table(path, columns=columns or SERIES_COLUMNS, filters=filters)
+            return table.to_pandas()
+
+
+_default_store: TableStore | None = None
+
+
+def get_table_store() -> TableStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = TableStore()
+    return _default_store
@@ -0,0 +1,149 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from scraper import instrumentation as instr
+from scraper.backends import SeriesBackend, get_backend
+from scraper.batch import fetch_series_batch
+
+def period_bound(value, freq: str, side: str) -> pd.Timestamp | None:
+    """A date-range bound as a timestamp.
+
+    ``value`` may be a timestamp/date, a ``pd.Period`` or a period string
+    such as ``"2020Q1"`` or ``"2020-01"``; periods resolve to their first
+    (``side="start"``) or last (``side="end"``) instant.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = pd.Period(value, freq="Q" if "Q" in value.upper() else freq)
+    if isinstance(value, pd.Period):
+        return value.start_time if side == "start" else value.end_time
+    return pd.Timestamp(value)
+
+
+def empty_frame(vectors: list[str], freq: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"VECTOR": pd.Categorical([], categories=vectors), "VALUE": pd.Series([], dtype="float64")},
+        index=pd.PeriodIndex([], freq=freq, name="period"),
+    )
+
+
+class SeriesTracker:
+    """One or more vectors of a StatCan table, shaped into the canonical frame.
+
+    Every tracker returns the same compact, typed frame: a ``period``
+    PeriodIndex at ``freq``, a categorical ``VECTOR`` column and float64
+    ``VALUE``s, sorted by vector then period. Vectors are matched exactly,
+    case-insensitively. Subclasses only fix the frequency and constructor.
+
+    The tracker keeps the full history it last loaded in ``data``; date
+    ranges are served by ``view``, which binary-searches each vector's
+    block of the sorted period index and slices it, so changing the range
+    needs no fetch, no parse and (for one vector) no copy.
+    """
+
+    freq = "M"
+
+    def __init__(self, pid: str, vectors: list[str], streaming: bool = False,
+                 backend: str | SeriesBackend | None = None):
+        self.pid = pid
+        self.target_vectors = [v.strip().lower() for v in vectors]
+        self.backend = get_backend(backend or ("streaming" if streaming else None))
+        self.data = None
+        self._blocks: dict[str, tuple[int, int]] = {}
+        logging.debug(f"Initialized {type(self).__name__} for PID {pid}: {', '.join(self.target_vectors)}")
+
+    @property
+    def vectors(self) -> list[str]:
+        return self.target_vectors
+
+    def fetch_data(self, start=None, end=None, refresh: bool = False) -> pd.DataFrame:
+        """Rows of this tracker's vectors in [start, end], fetching the full history once.
+
+        Later calls slice the history already held; pass ``refresh`` to read
+        it again through the backend.
+        """
+        if self.data is not None and not refresh:
+            return self.view(start, end)
+        try:
+            df = fetch_series_batch([(self.pid, v) for v in self.vectors], backend=self.backend)
+        except Exception as e:
+            logging.error(f"Error reading PID {self.pid} via {self.backend.name}: {e}")
+            return empty_frame(self.vectors, self.freq)
+        return self.load(df, start, end)
+
+    def load(self, df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+        """Keep the full history of this tracker's rows of a long VECTOR/REF_DATE/VALUE frame.
+
+        Returns ``view(start, end)`` of it. Backends already deliver typed
+        columns, so conversion only happens for frames that still hold
+        strings.
+        """
+        if df.empty:
+            self.data = empty_frame(self.vectors, self.freq)
+            self._blocks = {}
+            return self.data
+
+        with instr.span("coerce", tracker=type(self).__name__):
+            vector = df["VECTOR"]
+            if not vector.isin(self.vectors).all():
+                df = df[vector.isin(self.vectors)]
+
+            ref_date = df["REF_DATE"]
+            if not pd.api.types.is_datetime64_dtype(ref_date):
+                ref_date = pd.to_datetime(ref_date, errors="coerce")
+            value = df["VALUE"]
+            if value.dtype != "float64":
+                value = pd.to_numeric(value, errors="coerce").astype("float64")
+
+            keep = ref_date.notna().to_numpy() & value.notna().to_numpy()
+            out = pd.DataFrame(
+                {
+                    "VECTOR": pd.Categorical(df["VECTOR"].to_numpy()[keep], categories=self.vectors),
+                    "VALUE": value.to_numpy()[keep],
+                },
+                index=pd.DatetimeIndex(ref_date.to_numpy()[keep]).to_period(self.freq).rename("period"),
+            )
+            codes = out["VECTOR"].cat.codes.to_numpy()
+            order = np.lexsort((out.index.asi8, codes))
+            if (order != np.arange(len(order))).any():
+                out = out.iloc[order]
+                codes = codes[order]
+        # Row range of each vector's block in the sorted frame.
+        edges = np.searchsorted(codes, np.arange(len(self.vectors) + 1))
+        self._blocks = {v: (int(edges[i]), int(edges[i + 1])) for i, v in enumerate(self.vectors)
+                        if edges[i] < edges[i + 1]}
+        self.data = out
+        logging.info(f"{type(self).__name__} PID {self.pid}: {len(out)} rows")
+        return self.view(start, end)
+
+    def _positions(self, lo: int, hi: int, start, end) -> tuple[int, int]:
+        ordinals = self.data.index.asi8[lo:hi]
+        first = last = None
+        # A bound selects the period containing it, for timestamps and period strings alike.
+        if start is not None:
+            first = pd.Period(period_bound(start, self.freq, "start"), freq=self.freq)
+        if end is not None:
+            last = pd.Period(period_bound(end, self.freq, "end"), freq=self.freq)
+        a = lo if first is None else lo + int(np.searchsorted(ordinals, first.ordinal, "left"))
+        b = hi if last is None else lo + int(np.searchsorted(ordinals, last.ordinal, "right"))
+        return a, max(a, b)
+
+    def view(self, start=None, end=None) -> pd.DataFrame:
+        """The loaded rows of the periods from ``start`` to ``end``, inclusive.
+
+        Bounds are timestamps or period strings like ``"2020Q1"``; either
+        selects the whole period containing it, as ``data_layer.load_aligned`` does.
+
+        With one vector this is a positional slice of ``data``, not a copy.
+        """
+        if self.data is None:
+            return empty_frame(self.vectors, self.freq)
+        if start is None and end is None:
+            return self.data
+        slices = [self._positions(lo, hi, start, end) for lo, hi in self._blocks.values()]
+        if len(slices) == 1:
+            return self.data.iloc[slices[0][0]:slices[0][1]]
+        return self.data.iloc[np.concatenate([np.arange(a, b) for a, b in slices])] if slices else self.data
@@ -0,0 +1,129 @@
+"""Client for Statistics Canada's Web Data Service (vector-level REST API).
+
+Fetches a handful of series by vector ID instead of downloading whole table
+ZIPs. Responses are normalised to the same long VECTOR/REF_DATE/VALUE frame
+the table backends produce, plus the RELEASE_TIME of each data point.
+
+Recording real responses for the local mock server:
+
+    python -m scraper.wds record v1230995999 v1230998193 --out data/fixtures/wds
+"""
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from scraper import instrumentation as instr
+from scraper.http_session import get_session, host_slot
+
+WDS_BASE_URL = os.environ.get("STATCAN_WDS_URL", "https://www150.statcan.gc.ca/t1/wds/rest")
+WDS_COLUMNS = ["VECTOR", "REF_DATE", "VALUE", "RELEASE_TIME"]
+# 50 years of monthly data: enough for the full history of any series we track.
+FULL_HISTORY_PERIODS = 600
+
+
+class WDSError(RuntimeError):
+    pass
+
+
+def vector_id(vector: str) -> int:
+    return int(vector.strip().lower().lstrip("v"))
+
+
+def parse_vector_responses(payload: list[dict]) -> pd.DataFrame:
+    """Flatten WDS ``[{"status": ..., "object": {...}}]`` responses into a long frame."""
+    if not isinstance(payload, list):
+        raise WDSError(f"Unexpected WDS payload: {str(payload)[:200]}")
+    rows = []
+    for item in payload:
+        obj = item.get("object")
+        if item.get("status") != "SUCCESS" or not isinstance(obj, dict):
+            logging.warning(f"WDS request failed: {str(item)[:200]}")
+            continue
+        vector = f"v{obj['vectorId']}"
+        for point in obj.get("vectorDataPoint", []):
+            rows.append((vector, point.get("refPer"), point.get("value"), point.get("releaseTime")))
+
+    df = pd.DataFrame(rows, columns=WDS_COLUMNS)
+    df["REF_DATE"] = pd.to_datetime(df["REF_DATE"], errors="coerce")
+    df["VALUE"] = pd.to_numeric(df["VALUE"], errors="coerce")
+    df["RELEASE_TIME"] = pd.to_datetime(df["RELEASE_TIME"], errors="coerce")
+    return df.sort_values(["VECTOR", "REF_DATE"], ignore_index=True)
+
+
+class WDSClient:
+    def __init__(self, base_url: str = WDS_BASE_URL, timeout: int = 30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method: str, endpoint: str, **kwargs) -> list[dict]:
+        url = f"{self.base_url}/{endpoint}"
+        logging.info(f"WDS {method} {url}")
+        with instr.span("download", source="wds"), host_slot(url):
+            resp = get_session().request(method, url, timeout=self.timeout, **kwargs)
+        resp.raise_for_status()
+        instr.count("bytes_downloaded", len(resp.content), source="wds")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise WDSError(f"Invalid JSON from {endpoint}: {e}") from e
+
+    def latest_periods(self, vectors: list[str], latest_n: int) -> pd.DataFrame:
+        """``getDataFromVectorsAndLatestNPeriods``: the last ``latest_n`` periods of each vector."""
+        body = [{"vectorId": vector_id(v), "latestN": latest_n} for v in vectors]
+        return parse_vector_responses(self._call("POST", "getDataFromVectorsAndLatestNPeriods", json=body))
+
+    def reference_period_range(self, vectors: list[str], start: pd.Timestamp,
+                               end: pd.Timestamp) -> pd.DataFrame:
+        """``getDataFromVectorByReferencePeriodRange``: points whose reference period is in [start, end]."""
+        params = {
+            "vectorIds": ",".join(f'"{vector_id(v)}"' for v in vectors),
+            "startRefPeriod": pd.Timestamp(start).strftime("%Y-%m-%d"),
+            "endReferencePeriod": pd.Timestamp(end).strftime("%Y-%m-%d"),
+        }
+        return parse_vector_responses(self._call("GET", "getDataFromVectorByReferencePeriodRange", params=params))
+
+    def released_between(self, vectors: list[str], start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """``getBulkVectorDataByRange``: points (new or revised) released in [start, end]."""
+        body = {
+            "vectorIds": [str(vector_id(v)) for v in vectors],
+            "startDataPointReleaseDate": pd.Timestamp(start).strftime("%Y-%m-%dT%H:%M"),
+            "endDataPointReleaseDate": pd.Timestamp(end).strftime("%Y-%m-%dT%H:%M"),
+        }
+        return parse_vector_responses(self._call("POST", "getBulkVectorDataByRange", json=body))
+
+
+def record_vectors(vectors: list[str], out_dir: Path | str, latest_n: int = FULL_HISTORY_PERIODS,
+                   client: WDSClient | None = None) -> list[Path]:
+    """Save raw WDS responses as ``<out_dir>/<vectorId>.json`` for the mock server."""
+    client = client or WDSClient()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    body = [{"vectorId": vector_id(v), "latestN": latest_n} for v in vectors]
+    paths = []
+    for item in client._call("POST", "getDataFromVectorsAndLatestNPeriods", json=body):
+        if item.get("status") == "SUCCESS":
+            path = out_dir / f"{item['object']['vectorId']}.json"
+            path.write_text(json.dumps(item, indent=1))
+            paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record WDS vector responses for offline replay.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("vectors", nargs="+")
+    rec.add_argument("--out", default="data/fixtures/wds")
+    rec.add_argument("--latest-n", type=int, default=FULL_HISTORY_PERIODS)
+    args = parser.parse_args()
+    try:
+        for p in record_vectors(args.vectors, args.out, args.latest_n):
+            print(p)
+    except requests.RequestException as e:
+        raise SystemExit(f"Recording failed: {e}")
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.fixtures import TABLES, make_dashboard_fixtures
+from scraper import table_cache, table_store
+from scraper.mock_statcan import MockStatCanServer
+
+IPPI_PID, (IPPI_VECTORS, _) = "1810026501", TABLES["1810026501"]
+RMPI_PID = "1810026801"
+BCPI_PID = "1810028901"
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir(tmp_path_factory):
+    """Small synthetic table ZIPs plus recorded-style WDS JSON for the dashboard vectors."""
+    path = tmp_path_factory.mktemp("fixtures")
+    make_dashboard_fixtures(path, n_filler=20, periods=36)
+    return path
+
+
+@pytest.fixture
+def server(fixtures_dir):
+    with MockStatCanServer(fixtures_dir) as server:
+        yield server
+
+
+@pytest.fixture
+def cache(tmp_path, server, monkeypatch):
+    """A table cache and store in ``tmp_path`` reading from the mock, installed as the defaults."""
+    cache = table_cache.TableCache(tmp_path / "cache", base_url=server.base_url)
+    monkeypatch.setattr(table_cache, "_default_cache", cache)
+    monkeypatch.setattr(table_store, "_default_store", table_store.TableStore(tmp_path / "store", cache=cache))
+    return cache
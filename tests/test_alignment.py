@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alignment import align
+
+
+def _monthly(start: str, periods: int) -> pd.Series:
+    return pd.Series(np.arange(1, periods + 1, dtype="float64"),
+                     index=pd.period_range(start, periods=periods, freq="M"))
+
+
+def test_monthly_to_quarterly_averages_complete_quarters():
+    # January 2020 to April 2021: 2021Q2 only has April.
+    wide = align({"m": _monthly("2020-01", 16)}, freq="Q")
+    assert list(wide.index.astype(str)) == ["2020Q1", "2020Q2", "2020Q3", "2020Q4", "2021Q1"]
+    assert list(wide["m"]) == [2.0, 5.0, 8.0, 11.0, 14.0]
+
+
+def test_partial_quarters_are_kept_on_request():
+    wide = align({"m": _monthly("2020-02", 6)}, freq="Q", partial=True, agg="last")
+    assert wide["m"].to_dict() == {pd.Period("2020Q1"): 2.0, pd.Period("2020Q2"): 5.0, pd.Period("2020Q3"): 6.0}
+
+
+@pytest.mark.parametrize("index", [
+    pd.period_range("2020Q1", periods=3, freq="Q"),
+    pd.date_range("2020-01-01", periods=3, freq="QS"),   # BCPI REF_DATEs
+])
+def test_quarterly_lands_on_the_first_month(index):
+    quarterly = pd.Series([10.0, 13.0, 16.0], index=index)
+    wide = align({"q": quarterly, "m": _monthly("2020-01", 9)}, freq="M")
+    assert wide.loc[pd.Period("2020-01"), "q"] == 10.0
+    assert wide.loc[pd.Period("2020-04"), "q"] == 13.0
+    assert wide["q"].isna().sum() == 6
+
+
+def test_interpolation_fills_between_observations_only():
+    quarterly = pd.Series([10.0, 13.0, 16.0], index=pd.period_range("2020Q1", periods=3, freq="Q"))
+    wide = align({"q": quarterly, "m": _monthly("2019-12", 10)}, freq="M", interpolate=True)
+    assert list(wide.loc["2020-01":"2020-07", "q"]) == [10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0]
+    # Before the first and after the last observation stays NaN.
+    assert np.isnan(wide.loc[pd.Period("2019-12"), "q"]) and np.isnan(wide.loc[pd.Period("2020-09"), "q"])
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import (PRE_TARIFF, analyze, correlation_table, cross_correlations, lead_lag_summary,
+                       rolling_correlations)
+
+
+def _pandas_rolling_corr(x: pd.Series, y: pd.Series, window: int) -> np.ndarray:
+    # pandas reports rounding noise over a constant window as +-inf; that is NaN here.
+    out = x.rolling(window).corr(y).to_numpy()
+    return np.where(np.isfinite(out), out, np.nan)
+
+
+@pytest.fixture
+def wide():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-01", periods=150, freq="MS")
+    a = rng.normal(size=150).cumsum() + 100
+    b = np.roll(a, 2) + rng.normal(scale=0.5, size=150)
+    c = np.r_[np.full(40, 7.0), rng.normal(size=110)]      # constant stretch
+    frame = pd.DataFrame({"a": a, "b": b, "c": c}, index=index)
+    frame.iloc[60:63, 1] = np.nan
+    return frame
+
+
+def test_rolling_correlations_match_pandas(wide):
+    windows = [3, 6, 12]
+    out = rolling_correlations(wide["a"], wide["b"], windows)
+    for i, w in enumerate(windows):
+        expected = _pandas_rolling_corr(wide["a"], wide["b"], w)
+        np.testing.assert_allclose(out[i], expected, rtol=0, atol=1e-9, equal_nan=True)
+
+
+def test_constant_windows_give_nan(wide):
+    out = rolling_correlations(wide["a"], wide["c"], [6])[0]
+    expected = _pandas_rolling_corr(wide["a"], wide["c"], 6)
+    assert np.isnan(out[:40]).all()
+    np.testing.assert_allclose(out, expected, rtol=0, atol=1e-9, equal_nan=True)
+
+
+def test_correlation_table_is_symmetric_and_matches_pandas(wide):
+    table = correlation_table(wide, windows=[4, 9])
+    assert set(table) == {(a, b) for a in wide for b in wide if a != b}
+    assert table[("a", "c")] is table[("c", "a")]
+    expected = _pandas_rolling_corr(wide["b"], wide["c"], 9)
+    np.testing.assert_allclose(table[("b", "c")][9].to_numpy(), expected, rtol=0, atol=1e-9, equal_nan=True)
+
+
+def test_quarterly_baseline_covers_one_year():
+    index = pd.date_range("2020-01-01", "2025-10-01", freq="QS")
+    wide = pd.DataFrame({"bcpi": np.arange(len(index), dtype="float64")}, index=index)
+    phases = analyze(wide, periods_per_year=4)["phases"]
+    assert phases.loc[("bcpi", PRE_TARIFF), "observations"] == 4
+    # The baseline is the mean of 2024Q1-2024Q4, the four quarters before the tariffs.
+    assert phases.loc[("bcpi", PRE_TARIFF), "mean"] == wide.loc["2024"].mean().iloc[0]
+
+
+def _brute_xcorr(a: np.ndarray, b: np.ndarray, lag: int) -> float:
+    # a(t) against b(t + lag) over the periods both exist.
+    x, y = (a[:len(a) - lag], b[lag:]) if lag >= 0 else (a[-lag:], b[:len(b) + lag])
+    both = ~np.isnan(x) & ~np.isnan(y)
+    return np.corrcoef(x[both], y[both])[0, 1]
+
+
+def test_cross_correlations_match_brute_force(wide):
+    frame = wide[["a", "b"]].copy()
+    frame.iloc[:5, 0] = np.nan       # leading NaNs, plus the interior gap in b
+    xcorr = cross_correlations(frame, max_lag=6)
+    for lag in range(-6, 7):
+        expected = _brute_xcorr(frame["a"].to_numpy(), frame["b"].to_numpy(), lag)
+        assert xcorr.loc[("a", "b"), lag] == pytest.approx(expected, abs=1e-9)
+        assert xcorr.loc[("b", "a"), -lag] == pytest.approx(expected, abs=1e-9)
+    # b is a lagged by two periods; the gap in b does not shift the peak.
+    assert lead_lag_summary(xcorr).loc[("a", "b"), "best_lag"] == 2
+
+
+def test_cross_correlations_constant_overlap_is_nan():
+    flat = np.r_[np.full(20, 5.0), [6.0, 7.0, 9.0]]
+    noisy = np.random.default_rng(1).normal(size=23)
+    xcorr = cross_correlations(pd.DataFrame({"flat": flat, "noisy": noisy}), max_lag=4)
+    # From lag -3 the overlap of ``flat`` ends before its last three values, so it is constant.
+    assert xcorr.loc[("noisy", "flat"), [-4, -3]].isna().all()
+    assert xcorr.loc[("flat", "noisy"), [3, 4]].isna().all()
+    assert xcorr.loc[("noisy", "flat"), [-2, -1, 1, 2]].notna().all()
+    assert xcorr.loc[("noisy", "flat"), 0] == pytest.approx(np.corrcoef(noisy, flat)[0, 1], abs=1e-9)
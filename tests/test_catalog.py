@@ -0,0 +1,20 @@
+import json
+
+from scraper.catalog import CATALOG_FORMAT, VectorCatalog
+from tests.conftest import BCPI_PID, IPPI_PID
+
+
+def test_catalog_records_each_vectors_frequency(tmp_path, cache):
+    catalog = VectorCatalog(tmp_path / "catalog")
+    assert set(catalog.ensure(IPPI_PID).frame["frequency"]) == {"monthly"}
+    assert set(catalog.ensure(BCPI_PID).frame["frequency"]) == {"quarterly"}
+
+
+def test_catalog_of_an_older_format_is_rebuilt(tmp_path, cache):
+    catalog = VectorCatalog(tmp_path / "catalog")
+    catalog.ensure(IPPI_PID)
+    # A catalog built before the format was recorded, for the same table release.
+    meta = catalog._meta_path(IPPI_PID)
+    meta.write_text(json.dumps({"pid": IPPI_PID, "source_version": catalog.version(IPPI_PID)}))
+    catalog.ensure(IPPI_PID)
+    assert json.loads(meta.read_text())["format"] == CATALOG_FORMAT
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts import downsample, lttb
+
+
+@pytest.fixture
+def wide():
+    rng = np.random.default_rng(0)
+    index = pd.period_range("1990-01", periods=1000, freq="M")
+    return pd.DataFrame({"a": rng.normal(size=1000).cumsum(), "b": rng.normal(size=1000).cumsum(),
+                         "c": np.sin(np.arange(1000) / 40)}, index=index)
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 150, 999])
+def test_lttb_returns_threshold_points_with_both_ends(wide, threshold):
+    picked = lttb(wide["a"].to_numpy(), threshold)
+    assert len(picked) == threshold
+    assert picked[0] == 0 and picked[-1] == len(wide) - 1
+    assert (np.diff(picked) > 0).all()
+
+
+def test_lttb_keeps_a_spike():
+    y = np.zeros(500)
+    y[317] = 50.0
+    assert 317 in lttb(y, 20)
+
+
+def test_lttb_short_input_is_kept_whole():
+    assert list(lttb([1.0, 2.0, 3.0], 10)) == [0, 1, 2]
+
+
+def test_downsample_single_column_hits_the_budget(wide):
+    out = downsample(wide[["a"]], max_points=200)
+    assert len(out) == 200
+    assert out.index[0] == wide.index[0] and out.index[-1] == wide.index[-1]
+
+
+def test_downsample_splits_the_budget_per_column(wide):
+    out = downsample(wide, max_points=300)
+    # Each column picks 100 rows; the union is at most the budget.
+    assert len(out) <= 300
+    for column in wide.columns:
+        assert set(wide.index[lttb(wide[column].to_numpy(), 100)]) <= set(out.index)
+
+
+def test_downsample_keeps_requested_rows_and_small_frames(wide):
+    out = downsample(wide, max_points=90, keep=[500])
+    assert wide.index[500] in out.index
+    small = wide.iloc[:50]
+    assert downsample(small, max_points=90) is small
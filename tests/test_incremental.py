@@ -0,0 +1,102 @@
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_table_zip
+from scraper.backends import TableBackend
+from scraper.incremental import IncrementalUpdater
+from scraper.series_store import SeriesStore
+from scraper.snapshot_store import SnapshotStore
+from tests.conftest import IPPI_PID, IPPI_VECTORS
+
+VECTOR = IPPI_VECTORS[0]
+IPPI_ZIP = ("GET", "/n1/tbl/csv/18100265-eng.zip")
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    """An IPPI table of its own, so a test can publish a revision by rewriting it."""
+    make_table_zip(tmp_path / "fixtures", IPPI_PID, IPPI_VECTORS, n_filler=5, periods=36)
+    return tmp_path / "fixtures"
+
+
+@pytest.fixture
+def updater(tmp_path, cache):
+    backend = TableBackend()
+    fetch = backend.fetch
+    backend.starts = []
+
+    def recording_fetch(pid, vectors, start=None, end=None):
+        backend.starts.append(start)
+        return fetch(pid, vectors, start=start, end=end)
+
+    backend.fetch = recording_fetch
+    return IncrementalUpdater(SeriesStore(tmp_path / "series"), backend, revision_months=6,
+                              snapshots=SnapshotStore(tmp_path / "snapshots"))
+
+
+def _publish(cache, fixtures_dir, ref_date: str, delta: float) -> None:
+    """Revise ``VECTOR`` at ``ref_date`` in the served ZIP and expire the cached copy."""
+    path = next(fixtures_dir.glob("*-eng.zip"))
+    with zipfile.ZipFile(path) as z:
+        names = z.namelist()
+        csv_name = next(n for n in names if "MetaData" not in n)
+        df = pd.read_csv(z.open(csv_name), dtype=str, keep_default_na=False)
+        meta = z.read(next(n for n in names if "MetaData" in n))
+    row = (df["VECTOR"] == VECTOR) & (df["REF_DATE"] == ref_date)
+    df.loc[row, "VALUE"] = str(round(float(df.loc[row, "VALUE"].iloc[0]) + delta, 1))
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr(csv_name, buffer.getvalue())
+        z.writestr(next(n for n in names if "MetaData" in n), meta)
+    _expire(cache)
+
+
+def _expire(cache) -> None:
+    meta_path = cache.root / IPPI_PID / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta["expires_at"] = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+    meta_path.write_text(json.dumps(meta))
+
+
+def test_first_refresh_loads_the_full_history(updater):
+    summary = updater.refresh([(IPPI_PID, VECTOR)])[IPPI_PID]
+
+    assert (summary["inserted"], summary["revised"], summary["fetched"]) == (36, 0, 36)
+    assert updater.backend.starts == [None]
+    state = json.loads((updater.store.root / "state.json").read_text())[VECTOR]
+    assert state["pid"] == IPPI_PID
+    assert state["last_ref_date"] == "2017-12-01T00:00:00"
+    assert state["source_version"] == updater.backend.version(IPPI_PID)
+
+
+def test_unchanged_table_is_skipped(updater, cache, server):
+    updater.refresh([(IPPI_PID, VECTOR)])
+    _expire(cache)
+    summary = updater.refresh([(IPPI_PID, VECTOR)])[IPPI_PID]
+
+    assert server.requests[IPPI_ZIP] == 2  # the second one a 304
+    assert (summary["skipped"], summary["fetched"]) == (1, 0)
+    assert updater.backend.starts == [None]
+    assert updater.changes.empty
+
+
+def test_revision_inside_the_window_is_counted_as_revised(updater, cache, fixtures_dir):
+    updater.refresh([(IPPI_PID, VECTOR)])
+    old_version = updater.backend.version(IPPI_PID)
+    _publish(cache, fixtures_dir, "2017-10", delta=1.0)
+    summary = updater.refresh([(IPPI_PID, VECTOR)])[IPPI_PID]
+
+    # Only the six months before the last stored period onwards are re-read.
+    assert updater.backend.starts == [None, pd.Timestamp("2017-06-01")]
+    assert summary["fetched"] == 7
+    assert (summary["inserted"], summary["revised"]) == (0, 1)
+    assert list(updater.changes["REF_DATE"]) == [pd.Timestamp("2017-10-01")]
+    state = updater.store.state()[VECTOR]
+    assert state["source_version"] == updater.backend.version(IPPI_PID) != old_version
+    assert len(updater.snapshots.releases(VECTOR)) == 2
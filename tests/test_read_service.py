@@ -0,0 +1,52 @@
+import gzip
+import json
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from scraper.read_service import SeriesReadServer, SeriesReadService
+from scraper.registry import load_registry
+from scraper.series_store import SeriesStore
+
+
+@pytest.fixture
+def service(tmp_path):
+    store = SeriesStore(tmp_path / "series")
+    for s in load_registry():
+        freq = "QS" if s.frequency == "quarterly" else "MS"
+        ref_dates = pd.date_range("2020-01-01", periods=60, freq=freq)
+        store.upsert(pd.DataFrame({"VECTOR": s.vector, "REF_DATE": ref_dates, "VALUE": range(len(ref_dates))}))
+    return SeriesReadService(store)
+
+
+@pytest.fixture
+def url(service):
+    with SeriesReadServer(port=0, service=service) as server:
+        yield server.url
+
+
+def _get(url: str, headers: dict | None = None):
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+        return response.headers, response.read()
+
+
+def test_equivalent_bounds_share_an_etag(url):
+    a, body = _get(f"{url}/series/ippi?start=2020-01&end=2021-06")
+    b, _ = _get(f"{url}/series/ippi?start=2020-01-15&end=2021-06-30")
+    assert a["ETag"] == b["ETag"]
+    assert len(json.loads(body)) == 18
+
+
+def test_etag_depends_on_the_encoding(url):
+    plain, body = _get(f"{url}/series?format=json")
+    zipped, zbody = _get(f"{url}/series?format=json", {"Accept-Encoding": "gzip"})
+    assert zipped["Content-Encoding"] == "gzip" and "Content-Encoding" not in plain
+    assert plain["ETag"] != zipped["ETag"]
+    assert gzip.decompress(zbody) == body
+
+
+def test_bad_dates_are_rejected(url):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(f"{url}/series/ippi?start=not-a-date")
+    assert e.value.code == 400
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from scraper.snapshot_store import SnapshotStore
+
+JAN, FEB = pd.Timestamp("2025-01-20 08:30"), pd.Timestamp("2025-02-20 08:30")
+
+
+def _frame(values: list[float], vector: str = "v1") -> pd.DataFrame:
+    return pd.DataFrame({
+        "VECTOR": vector,
+        "REF_DATE": pd.date_range("2024-01-01", periods=len(values), freq="MS"),
+        "VALUE": values,
+    })
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots")
+    store.record(_frame([1.0, 2.0, 3.0]), release=JAN)
+    # February revises March 2024 and adds April.
+    store.record(_frame([1.0, 2.0, 3.5, 4.0]), release=FEB)
+    return store
+
+
+def test_recording_unchanged_data_writes_no_part(snapshots):
+    assert snapshots.record(_frame([1.0, 2.0, 3.5, 4.0]), release="2025-03-20") == {}
+    assert snapshots.releases("v1") == [JAN, FEB]
+
+
+def test_second_release_holds_only_new_and_revised_rows(snapshots):
+    history = snapshots.history("v1")
+    assert list(history.loc[history["RELEASE"] == FEB, "VALUE"]) == [3.5, 4.0]
+    assert snapshots.revisions("v1")["revisions"].to_dict() == {pd.Timestamp("2024-03-01"): 1}
+
+
+def test_as_of_returns_values_before_a_later_revision(snapshots):
+    before = snapshots.as_of(["v1"], release=FEB - pd.Timedelta(days=1))
+    assert list(before["VALUE"]) == [1.0, 2.0, 3.0]
+    latest = snapshots.as_of(["V1"])
+    assert list(latest["VALUE"]) == [1.0, 2.0, 3.5, 4.0]
+    assert list(latest["RELEASE"]) == [JAN, JAN, FEB, FEB]
+
+
+def test_diff_reports_exactly_the_revised_periods(snapshots):
+    diff = snapshots.diff("v1", JAN, FEB)
+    assert list(diff.index) == [pd.Timestamp("2024-03-01"), pd.Timestamp("2024-04-01")]
+    assert diff.loc["2024-03-01", "change"] == 0.5
+    assert pd.isna(diff.loc["2024-04-01", "before"])
+    assert snapshots.diff("v1", FEB).empty
@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+from benchmarks import startup
+
+# Time budgets are for a developer laptop; raise this on slower CI machines.
+# The deferred-module rules apply whatever the scale.
+BUDGET_SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", 1.0))
+
+
+@pytest.mark.parametrize("page", startup.PAGES)
+def test_page_imports_within_budget(page):
+    assert startup.violations(page, startup.measure(page, repeat=3), BUDGET_SCALE) == []
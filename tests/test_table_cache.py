@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scraper.table_cache import RELEASE_TZ, TableCache, next_release
+from tests.conftest import BCPI_PID, IPPI_PID, RMPI_PID
+
+IPPI_ZIP = ("GET", "/n1/tbl/csv/18100265-eng.zip")
+
+
+def _set_meta(cache: TableCache, pid: str, **fields) -> None:
+    path = cache.root / pid / "meta.json"
+    path.write_text(json.dumps({**json.loads(path.read_text()), **fields}))
+
+
+def test_fresh_entry_is_served_without_a_request(cache, server):
+    first = cache.get(IPPI_PID)
+    assert cache.get(IPPI_PID) == first
+    assert server.requests[IPPI_ZIP] == 1
+
+
+def test_stale_entry_is_revalidated_with_a_304(cache, server):
+    path = cache.get(IPPI_PID)
+    meta = cache.meta(IPPI_PID)
+    inode = path.stat().st_ino  # a download replaces the file
+
+    assert cache.get(IPPI_PID, force=True) == path
+
+    assert server.requests[IPPI_ZIP] == 2
+    assert path.stat().st_ino == inode  # not downloaded again
+    revalidated = cache.meta(IPPI_PID)
+    assert revalidated["version"] == meta["version"]
+    assert revalidated["checked_at"] > meta["checked_at"]
+
+
+def test_entry_expires_at_the_next_release(cache, server):
+    cache.get(IPPI_PID)
+    meta = cache.meta(IPPI_PID)
+    assert meta["expires_at"] == next_release(datetime.fromisoformat(meta["fetched_at"])).isoformat()
+
+    _set_meta(cache, IPPI_PID, expires_at=(datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat())
+    cache.get(IPPI_PID)
+
+    assert server.requests[IPPI_ZIP] == 2
+    assert datetime.fromisoformat(cache.meta(IPPI_PID)["expires_at"]) > datetime.now(timezone.utc)
+
+
+@pytest.mark.parametrize("now, expected", [
+    (datetime(2025, 3, 4, 8, 0), datetime(2025, 3, 4, 8, 30)),    # Tuesday before the release
+    (datetime(2025, 3, 4, 8, 30), datetime(2025, 3, 5, 8, 30)),   # at the release: the next one
+    (datetime(2025, 3, 7, 9, 0), datetime(2025, 3, 10, 8, 30)),   # Friday after it: Monday
+    (datetime(2025, 3, 8, 12, 0), datetime(2025, 3, 10, 8, 30)),  # Saturday
+])
+def test_next_release(now, expected):
+    assert next_release(now.replace(tzinfo=RELEASE_TZ)) == expected.replace(tzinfo=RELEASE_TZ)
+
+
+def test_hit_neither_rewrites_metadata_nor_evicts(cache, server, monkeypatch):
+    cache.get(IPPI_PID)
+    meta_path = cache.root / IPPI_PID / "meta.json"
+    written = meta_path.stat().st_mtime_ns
+    monkeypatch.setattr(cache, "evict", lambda keep=None: pytest.fail("evict on a cache hit"))
+
+    cache.get(IPPI_PID)
+
+    assert meta_path.stat().st_mtime_ns == written
+    assert server.requests[IPPI_ZIP] == 1
+
+
+def test_least_recently_used_tables_are_evicted(cache, server):
+    for pid in (IPPI_PID, RMPI_PID):
+        cache.get(pid)
+    cache.get(IPPI_PID)  # a hit: RMPI is now the least recently used
+    sizes = {pid: cache.meta(pid)["size"] for pid in (IPPI_PID, RMPI_PID)}
+
+    cache.max_bytes = sum(sizes.values())  # room for two tables
+    cache.get(BCPI_PID)
+
+    assert cache.meta(RMPI_PID) is None
+    assert not (cache.root / RMPI_PID).exists()
+    assert cache.meta(IPPI_PID) is not None
+    assert cache.meta(BCPI_PID) is not None
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scraper.bcpi_scraper import BCPITracker
+from scraper.statcan_scraper import IndexTracker
+from scraper.tracker import SeriesTracker
+from tests.conftest import BCPI_PID, IPPI_PID, IPPI_VECTORS
+
+
+def _long(vectors: list[str], start: str = "2020-01-01", periods: int = 24, freq: str = "MS") -> pd.DataFrame:
+    dates = pd.date_range(start, periods=periods, freq=freq)
+    return pd.DataFrame({
+        "VECTOR": np.repeat(vectors, periods),
+        "REF_DATE": np.tile(dates, len(vectors)),
+        "VALUE": np.arange(len(vectors) * periods, dtype="float64"),
+    })
+
+
+@pytest.fixture
+def monthly():
+    tracker = SeriesTracker("1", ["v1"], backend="table")
+    tracker.load(_long(["v1"]))
+    return tracker
+
+
+def test_bounds_are_inclusive_and_select_the_containing_period(monthly):
+    view = monthly.view("2020-03", "2020-05")
+    assert list(view.index.astype(str)) == ["2020-03", "2020-04", "2020-05"]
+    # Mid-month timestamps select their whole month.
+    assert monthly.view(pd.Timestamp("2020-03-15"), pd.Timestamp("2020-05-02")).equals(view)
+    assert len(monthly.view("2020Q2", "2020Q2")) == 3
+
+
+def test_bounds_outside_the_data(monthly):
+    assert len(monthly.view("2019-01", "2030-12")) == 24
+    assert monthly.view("2025-01", None).empty
+    assert monthly.view(None, "2019-12").empty
+    assert monthly.view("2020-06", "2020-02").empty
+    assert list(monthly.view(None, "2020-02").index.astype(str)) == ["2020-01", "2020-02"]
+
+
+def test_single_vector_view_is_a_slice(monthly):
+    view = monthly.view("2020-03", "2020-05")
+    assert np.shares_memory(view["VALUE"].to_numpy(), monthly.data["VALUE"].to_numpy())
+
+
+def test_multi_vector_view_keeps_vector_order():
+    tracker = SeriesTracker("1", ["v2", "v1"], backend="table")
+    # Loaded out of order; the frame is sorted by the tracker's vector order, then period.
+    tracker.load(_long(["v1", "v2"]).sample(frac=1, random_state=0))
+    view = tracker.view("2020-11", "2021-02")
+    assert list(view["VECTOR"]) == ["v2"] * 4 + ["v1"] * 4
+    assert list(view.index.astype(str)) == ["2020-11", "2020-12", "2021-01", "2021-02"] * 2
+    assert tracker.view("2030-01", None).empty
+
+
+def test_load_builds_the_canonical_frame():
+    tracker = BCPITracker("1", ["V1", "v2"], backend="table")
+    raw = _long(["v1", "v2"], periods=8, freq="QS").astype(str)  # strings, as from a CSV
+    raw.loc[3, "VALUE"] = ".."
+    frame = tracker.load(raw)
+    assert frame["VECTOR"].dtype == "category"
+    assert list(frame["VECTOR"].cat.categories) == ["v1", "v2"]
+    assert frame["VALUE"].dtype == "float64"
+    assert frame.index.name == "period" and frame.index.dtype == pd.PeriodDtype("Q")
+    assert len(frame) == 15  # the unparseable value is dropped
+
+
+def test_fetch_returns_the_canonical_frame(cache):
+    frame = IndexTracker(IPPI_PID, IPPI_VECTORS[0].upper(), backend="table").fetch_data("2016-01", "2016-12")
+    assert list(frame.columns) == ["VECTOR", "VALUE"]
+    assert isinstance(frame.index, pd.PeriodIndex) and frame.index.freqstr == "M"
+    assert list(frame["VECTOR"].cat.categories) == [IPPI_VECTORS[0]]
+    assert frame["VALUE"].dtype == "float64" and len(frame) == 12
+
+    bcpi = BCPITracker(BCPI_PID, ["v1617908010"], backend="table").fetch_data()
+    assert bcpi.index.freqstr == "Q-DEC" and bcpi.index.is_monotonic_increasing
@@ -0,0 +1,74 @@
+import json
+
+import pandas as pd
+import pytest
+
+from scraper.backends import FallbackBackend, TableBackend, WDSBackend
+from scraper.wds import WDSClient
+from tests.conftest import IPPI_PID, IPPI_VECTORS
+
+VECTOR = IPPI_VECTORS[0]
+# In the table ZIP but not recorded for WDS.
+FILLER = "v900000000"
+
+
+@pytest.fixture
+def client(server):
+    return WDSClient(server.wds_url)
+
+
+@pytest.fixture
+def points(fixtures_dir):
+    item = json.loads((fixtures_dir / "wds" / f"{VECTOR[1:]}.json").read_text())
+    return pd.DataFrame(item["object"]["vectorDataPoint"])
+
+
+def test_latest_periods(client, points, server):
+    df = client.latest_periods([VECTOR], latest_n=3)
+
+    assert list(df.columns) == ["VECTOR", "REF_DATE", "VALUE", "RELEASE_TIME"]
+    assert (df["VECTOR"] == VECTOR).all()
+    assert list(df["REF_DATE"]) == list(pd.to_datetime(points["refPer"].iloc[-3:]))
+    assert list(df["VALUE"]) == list(points["value"].iloc[-3:])
+    assert server.requests[("POST", "/t1/wds/rest/getDataFromVectorsAndLatestNPeriods")] == 1
+
+
+def test_latest_periods_skips_unknown_vectors(client):
+    assert client.latest_periods(["v1"], latest_n=3).empty
+
+
+def test_reference_period_range(client, points):
+    df = client.reference_period_range([VECTOR], pd.Timestamp("2016-03-01"), pd.Timestamp("2016-08-01"))
+
+    assert list(df["REF_DATE"]) == list(pd.date_range("2016-03-01", "2016-08-01", freq="MS"))
+    expected = points.set_index(pd.to_datetime(points["refPer"]))["value"]
+    assert list(df["VALUE"]) == list(expected.loc["2016-03-01":"2016-08-01"])
+
+
+def test_released_between(client, points):
+    # Fixture points are released on the 20th of the month after their reference period.
+    df = client.released_between([VECTOR], pd.Timestamp("2016-05-01"), pd.Timestamp("2016-07-01"))
+
+    assert list(df["REF_DATE"]) == [pd.Timestamp("2016-04-01"), pd.Timestamp("2016-05-01")]
+    assert (df["RELEASE_TIME"] >= pd.Timestamp("2016-05-01")).all()
+    assert (df["RELEASE_TIME"] <= pd.Timestamp("2016-07-01")).all()
+
+
+def test_auto_backend_falls_back_to_the_table_for_missing_vectors(client, cache, server):
+    backend = FallbackBackend(WDSBackend(client), TableBackend())
+
+    df = backend.fetch(IPPI_PID, [VECTOR, FILLER])
+
+    assert set(df["VECTOR"]) == {VECTOR, FILLER}
+    assert len(df[df["VECTOR"] == FILLER]) == 36
+    # The table ZIP was downloaded once, for the vector WDS did not have.
+    assert server.requests[("GET", "/n1/tbl/csv/18100265-eng.zip")] == 1
+
+
+def test_auto_backend_falls_back_to_the_table_on_errors(cache, server):
+    backend = FallbackBackend(WDSBackend(WDSClient(server.wds_url + "/missing")), TableBackend())
+
+    df = backend.fetch(IPPI_PID, [VECTOR], start=pd.Timestamp("2016-01-01"), end=pd.Timestamp("2016-12-01"))
+
+    assert list(df["REF_DATE"]) == list(pd.date_range("2016-01-01", "2016-12-01", freq="MS"))
+    assert server.requests[("GET", "/n1/tbl/csv/18100265-eng.zip")] == 1